@@ -1,11 +1,13 @@
 import streamlit as st
-import pandas as pd
 import mysql.connector
 from datetime import datetime
 import time
 import re
-import os
+import uuid
 from dotenv import load_dotenv
+from db_pool import db_cursor
+from item_responses import save_responses
+from item_bank import load_item_bank, UNKNOWN_CHOICE
 
 # Set page config at the very beginning
 st.set_page_config(page_title="AI 역량 평가", page_icon=":brain:", layout="wide")
@@ -13,12 +15,6 @@ st.set_page_config(page_title="AI 역량 평가", page_icon=":brain:", layout="w
 # Load environment variables
 load_dotenv()
 
-# Database connection parameters
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_DATABASE = os.getenv("DB_DATABASE")
-
 # CSS를 사용하여 버튼 스타일 조정
 st.markdown("""
 <style>
@@ -34,9 +30,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load questions
-@st.cache_data
+# 문항 은행은 프로세스에서 한 번만 만들고 모든 세션이 함께 사용 (다시 실행될 때는 번호로 꺼내기만 함)
+@st.cache_resource
 def load_questions():
-    return pd.read_csv('ai_test_update.csv')
+    return load_item_bank()
 
 questions = load_questions()
 
@@ -46,47 +43,27 @@ def is_valid_email(email):
     return re.match(pattern, email) is not None
 
 # Function to save data to MySQL
-def save_to_database(data):
+def save_to_database(data, answers, times):
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_DATABASE
-        )
-        cursor = connection.cursor()
-
         query = """
         INSERT INTO ai_assessment_results 
-        (name, email, date, total_time, q1, q2, q3, q4, q5, q6, q7, q8, q9, q10,
-        q11, q12, q13, q14, q15, q16, q17, q18, q19, q20,
-        q21, q22, q23, q24, q25, q26, q27, q28, q29, q30,
-        q31, q32, q33, q34, q35, q36, q37, q38, q39, q40,
-        t1, t2, t3, t4, t5, t6, t7, t8, t9, t10,
-        t11, t12, t13, t14, t15, t16, t17, t18, t19, t20,
-        t21, t22, t23, t24, t25, t26, t27, t28, t29, t30,
-        t31, t32, t33, t34, t35, t36, t37, t38, t39, t40)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s)
+        (name, email, date, total_time, submission_token)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
         """
-        
-        query_with_data = query % tuple(data.values())
-        print(query_with_data)  # 출력
 
-        cursor.execute(query, tuple(data.values()))
-        connection.commit()
+        # 풀에서 빌린 연결로 저장하고 블록이 끝나면 커밋
+        # 같은 submission_token으로 이미 저장된 경우 새로 추가하지 않고 기존 id를 반환
+        # 문항별 응답과 시간은 같은 트랜잭션에서 item_responses에 한 행씩 저장
+        with db_cursor() as cursor:
+            cursor.execute(query, tuple(data.values()))
+            result_id = cursor.lastrowid
+            save_responses(cursor, "ai_assessment_results", result_id, answers, times)
         
-        return True
+        return result_id
     except mysql.connector.Error as error:
         st.error(f"Failed to save results to database: {error}")
-        return False
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        return None
 
 # 유효한 값인지 검사하는 함수 추가
 def is_valid_answer(answer_index):
@@ -167,16 +144,15 @@ elif st.session_state.state == 'test':
     st.progress(progress)
 
     if st.session_state.question_number < len(questions):
-        question = questions.iloc[st.session_state.question_number]
-        current_question_number = st.session_state.question_number + 1
+        question = questions[st.session_state.question_number]
+        current_question_number = question.number
         st.write(f"문항 {current_question_number}/40")
-        st.markdown(question['Problem'], unsafe_allow_html=True)
+        st.markdown(question.problem, unsafe_allow_html=True)
         
-        if pd.notna(question['Figure']):
-            st.image(f"images/{question['Figure']}")
+        if question.figure is not None:
+            st.image(question.figure)
         
-        choices = [choice.strip() for choice in question['Choice'].split('\n') if choice.strip()]
-        choices.append("⑤ 모르겠음")
+        choices = question.choices
         
         # 현재 문제의 시작 시간 기록
         if f"start_time_q{current_question_number}" not in st.session_state.question_start_times:
@@ -204,7 +180,7 @@ elif st.session_state.state == 'test':
                     st.warning("답을 선택해주세요.")
                 else:
                     # 사용자의 답이 유효한 값인지 확인
-                    selected_answer_index = choices.index(answer) + 1 if answer != "⑤ 모르겠음" else 0
+                    selected_answer_index = choices.index(answer) + 1 if answer != UNKNOWN_CHOICE else 0
                     
                     print('selected answer:', selected_answer_index)
                     
@@ -232,23 +208,28 @@ elif st.session_state.state == 'test':
 
 elif st.session_state.state == 'finished':
     st.write("수고하셨습니다. 모든 문제를 완료하셨습니다.")
-    total_time = time.time() - st.session_state.start_time
+    # 다시 실행될 때마다 저장되지 않도록 종료 시각과 제출 토큰은 처음 한 번만 정함
+    if 'total_time' not in st.session_state:
+        st.session_state.total_time = time.time() - st.session_state.start_time
+        st.session_state.submission_token = uuid.uuid4().hex
+    total_time = st.session_state.total_time
     st.write(f"총 소요 시간: {int(total_time // 60)}분 {int(total_time % 60)}초")
     
-    # Prepare data for database
-    data = {
-        'name': st.session_state.name,
-        'email': st.session_state.email,
-        'date': datetime.now(),
-        'total_time': round(total_time, 2)
-    }
-    for i in range(1, 41):
-        data[f'q{i}'] = st.session_state.answers.get(f'q{i}', -1)
-        
-    for i in range(1, 41):
-        data[f't{i}'] = round(st.session_state.times.get(f't{i}', -1), 2)
+    # 아직 저장하지 않은 경우에만 저장하고, 이후에는 저장된 id를 사용
+    if not st.session_state.get('result_id'):
+        # Prepare data for database
+        data = {
+            'name': st.session_state.name,
+            'email': st.session_state.email,
+            'date': datetime.now(),
+            'total_time': round(total_time, 2),
+            'submission_token': st.session_state.submission_token
+        }
+        answers = [st.session_state.answers.get(f'q{i}', -1) for i in range(1, 41)]
+        times = [round(st.session_state.times.get(f't{i}', -1), 2) for i in range(1, 41)]
+        st.session_state.result_id = save_to_database(data, answers, times)
     
-    if save_to_database(data):
+    if st.session_state.result_id:
         st.success("결과가 성공적으로 저장되었습니다.")
     else:
         st.error("결과 저장에 실패했습니다. 관리자에게 문의해주세요.")
@@ -0,0 +1,99 @@
+import argparse
+import statistics
+import time
+from streamlit.testing.v1 import AppTest
+
+# 대화 기록 출력의 다시 실행(rerun) 비용 측정
+# 10/50/100턴 대화를 기존 방식(메시지마다 다시 분리해서 출력)과 메모이제이션 방식(chat_render)으로 출력하고
+# 페이지를 다시 실행하는 시간과 출력 요소 수를 비교
+# inquiry: Markdown만 출력 (inquiry.py, advice.py), thermo: LaTeX 수식 구분 (thermo.py, thermo_up.py)
+SCRIPT = '''
+import re
+import streamlit as st
+from chat_render import render_history, latex_segments
+
+def process_text(text):
+    # 기존 thermo.py 방식
+    pattern = r'(\\$\\$.*?\\$\\$|\\$.*?\\$|\\\\\\[.*?\\\\\\]|\\\\\\(.*?\\\\\\))'
+    parts = re.split(pattern, text)
+    for part in parts:
+        part = part.strip()
+        if re.match(r'^\\$\\$.*\\$\\$$', part):
+            st.latex(part.strip('$$'))
+        elif re.match(r'^\\$.*\\$$', part):
+            st.latex(part.strip('$'))
+        elif re.match(r'^\\\\\\[.*\\\\\\]$', part):
+            st.latex(part.strip('\\\\[').strip('\\\\]'))
+        elif re.match(r'^\\\\\\(.*\\\\\\)$', part):
+            st.latex(part.strip('\\\\(').strip('\\\\)'))
+        else:
+            st.markdown(part)
+
+messages = st.session_state.messages
+if st.session_state.mode == "legacy":
+    for message in messages:
+        role = message["role"]
+        content = message["content"]
+        timestamp = message.get("timestamp", "")
+        if role in ("user", "assistant"):
+            st.markdown(f"**{'You' if role == 'user' else 'AI'}** ({timestamp}):")
+            if st.session_state.style == "thermo":
+                process_text(content)
+            else:
+                st.markdown(content)
+else:
+    if st.session_state.style == "thermo":
+        render_history(messages, latex_segments)
+    else:
+        render_history(messages)
+'''
+
+USER_TEXT = "일정한 압력에서 기체의 부피가 $V_1$에서 $V_2$로 늘어날 때 기체가 한 일은 $W = P(V_2 - V_1)$ 아닌가요? 계산 과정을 확인해 주세요."
+ASSISTANT_TEXT = (
+    "좋은 질문입니다. 등압 과정에서 기체가 한 일은 다음과 같습니다.\n\n"
+    "$$W = \\int_{V_1}^{V_2} P\\,dV = P(V_2 - V_1)$$\n\n"
+    "이상 기체라면 상태 방정식 \\( PV = nRT \\)를 이용해 다음처럼 쓸 수도 있습니다.\n\n"
+    "\\[ W = nR(T_2 - T_1) \\]\n\n"
+    "1. 먼저 처음과 나중 상태의 온도를 구하세요.\n"
+    "2. 내부 에너지 변화 $\\Delta U = \\frac{3}{2} nR\\Delta T$와 비교해 보세요.\n"
+    "3. 열역학 제1법칙 $Q = \\Delta U + W$로 흡수한 열을 구할 수 있습니다.\n"
+)
+
+def make_history(turns):
+    messages = [{"role": "system", "content": "이것은 일반물리학 열역학 분야 학습용 챗봇이야."}]
+    for turn in range(turns):
+        timestamp = f"2024-09-01 10:{turn // 60:02d}:{turn % 60:02d}"
+        messages.append({"role": "user", "content": f"{turn + 1}. {USER_TEXT}", "timestamp": timestamp})
+        messages.append({"role": "assistant", "content": f"{turn + 1}. {ASSISTANT_TEXT}", "timestamp": timestamp})
+    return messages
+
+def measure(style, mode, turns, repeat):
+    at = AppTest.from_string(SCRIPT, default_timeout=60)
+    at.session_state.messages = make_history(turns)
+    at.session_state.style = style
+    at.session_state.mode = mode
+    at.run()  # 첫 실행 (메모이제이션 방식은 여기서 모든 메시지를 변환)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    elements = len(at.markdown) + len(at.latex)
+    return statistics.median(timings), elements
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대화 기록 출력 다시 실행 비용 벤치마크")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'style':<8}{'turns':>6}{'legacy ms':>12}{'memo ms':>10}{'speedup':>9}{'legacy el':>11}{'memo el':>9}")
+    for style in ("inquiry", "thermo"):
+        for turns in args.turns:
+            legacy, legacy_elements = measure(style, "legacy", turns, args.repeat)
+            memo, memo_elements = measure(style, "memo", turns, args.repeat)
+            print(f"{style:<8}{turns:>6}{legacy:>12.1f}{memo:>10.1f}{legacy / memo:>8.2f}x"
+                  f"{legacy_elements:>11}{memo_elements:>9}")
@@ -0,0 +1,82 @@
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import db_pool
+from db_pool import ConnectionPool, connect
+
+# 쓰기 한 번마다 새로 연결하는 기존 방식과 연결 풀을 사용하는 방식의 UPDATE 지연 시간 비교
+# .env의 MySQL에 bench_db_pool 테이블을 만들어 사용하고 끝나면 삭제
+TABLE = "bench_db_pool"
+
+def setup():
+    connection = connect()
+    cursor = connection.cursor()
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (id INT PRIMARY KEY, value TEXT)")
+    cursor.execute(f"REPLACE INTO {TABLE} (id, value) VALUES (1, '')")
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+def teardown():
+    connection = connect()
+    cursor = connection.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+def per_call_write(value):
+    # 기존 방식: 쓰기마다 연결(TCP + 인증)을 새로 만들고 닫음
+    connection = connect()
+    cursor = connection.cursor()
+    cursor.execute(f"UPDATE {TABLE} SET value = %s WHERE id = 1", (value,))
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+def pooled_write(value):
+    with db_pool.db_cursor() as cursor:
+        cursor.execute(f"UPDATE {TABLE} SET value = %s WHERE id = 1", (value,))
+
+def measure(write, repeat, threads):
+    def timed(i):
+        start = time.perf_counter()
+        write(f"value {i}")
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(timed, range(repeat)))
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} mean {statistics.mean(timings):7.2f} ms | median {statistics.median(timings):7.2f} ms | p95 {p95:7.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MySQL 연결 풀 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1, help="동시에 쓰는 스레드 수")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--ping-interval", type=float, default=db_pool.DB_POOL_PING_INTERVAL,
+                        help="이 시간(초)보다 오래 쉰 연결만 확인 (0이면 항상)")
+    args = parser.parse_args()
+
+    setup()
+    db_pool._pool = ConnectionPool(size=args.pool_size, ping_interval=args.ping_interval)
+    try:
+        # 워밍업
+        per_call_write("warmup")
+        pooled_write("warmup")
+
+        per_call = measure(per_call_write, args.repeat, args.threads)
+        pooled = measure(pooled_write, args.repeat, args.threads)
+
+        print(f"{args.repeat} writes, {args.threads} threads, pool size {args.pool_size}, ping interval {args.ping_interval}s")
+        report("per-call", per_call)
+        report("pooled", pooled)
+        print(f"speedup    {statistics.mean(per_call) / statistics.mean(pooled):.2f}x")
+    finally:
+        db_pool._pool.close()
+        teardown()
@@ -0,0 +1,112 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import pandas as pd
+from PIL import Image
+
+from item_bank import load_item_bank, domains
+
+# ai_test.py 문항 화면의 다시 실행 비용 측정
+# 1) 문항 준비: 기존 방식(DataFrame 행 조회, 선택지 분리, 그림 파일 읽기)과 문항 은행에서 꺼내는 방식 비교
+# 2) 페이지 실행: AppTest로 문항 화면 전체를 다시 실행하는 시간
+# --synthetic을 주면 임시 폴더에 40문항 CSV와 그림을 만들어 사용
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_test.py")
+
+def make_synthetic(directory, figure_every=3, figure_size=800):
+    """40문항 CSV와 figure_every 문항마다 PNG 그림 생성"""
+    os.makedirs(os.path.join(directory, "images"), exist_ok=True)
+    rows = []
+    for number in range(1, 41):
+        figure = None
+        if number % figure_every == 0:
+            figure = f"q{number}.png"
+            Image.new("RGB", (figure_size, figure_size // 2), (number * 6, 120, 200)).save(
+                os.path.join(directory, "images", figure))
+        rows.append({
+            "No": number,
+            "Domain": domains[(number - 1) // 10],
+            "Problem": f"<b>문항 {number}</b> 다음 중 인공지능에 대한 설명으로 옳은 것은?",
+            "Choice": "\n".join(f"{mark} 선택지 {number}-{i}" for i, mark in enumerate("①②③④", start=1)),
+            "Figure": figure,
+            "Answer": (number % 4) + 1,
+        })
+    pd.DataFrame(rows).to_csv(os.path.join(directory, "ai_test_update.csv"), index=False)
+
+def legacy_prepare(questions, index):
+    # 기존 방식: 다시 실행될 때마다 행을 조회하고 선택지를 나누고 그림 파일을 읽음
+    question = questions.iloc[index]
+    choices = [choice.strip() for choice in question['Choice'].split('\n') if choice.strip()]
+    choices.append("⑤ 모르겠음")
+    figure = None
+    if pd.notna(question['Figure']):
+        with open(f"images/{question['Figure']}", "rb") as f:
+            figure = f.read()
+    return question['Problem'], choices, figure
+
+def bank_prepare(bank, index):
+    item = bank[index]
+    return item.problem, item.choices, item.figure
+
+def measure(prepare, source, repeat):
+    timings = []
+    for _ in range(repeat):
+        for index in range(len(source)):
+            start = time.perf_counter()
+            prepare(source, index)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+def measure_page(repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state.state = 'test'
+    at.session_state.start_time = time.time()
+    at.session_state.answers = {}
+    at.session_state.times = {}
+    at.session_state.question_start_times = {}
+    at.session_state.question_number = 0
+    at.run()
+
+    timings = []
+    for _ in range(repeat):
+        for index in range(40):
+            at.session_state.question_number = index
+            start = time.perf_counter()
+            at.run()
+            timings.append((time.perf_counter() - start) * 1000)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+    return timings
+
+def report(label, timings, unit):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<14} mean {statistics.mean(timings):9.2f} {unit} | median {statistics.median(timings):9.2f} {unit} | p95 {p95:9.2f} {unit}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ai_test.py 문항 은행 벤치마크")
+    parser.add_argument("--repeat", type=int, default=50, help="40문항을 반복해서 준비하는 횟수")
+    parser.add_argument("--page-repeat", type=int, default=2, help="40문항 화면 전체를 다시 실행하는 횟수 (0이면 생략)")
+    parser.add_argument("--synthetic", action="store_true", help="임시로 만든 문항과 그림 사용")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        directory = tempfile.mkdtemp(prefix="item-bank-")
+        make_synthetic(directory)
+        os.chdir(directory)
+
+    start = time.perf_counter()
+    bank = load_item_bank()
+    print(f"item bank built in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({len(bank)} items, {sum(len(item.figure or b'') for item in bank) / 1024:.0f} KB of figures)")
+
+    questions = pd.read_csv("ai_test_update.csv")
+    report("legacy prepare", measure(legacy_prepare, questions, args.repeat), "us")
+    report("bank prepare", measure(bank_prepare, bank, args.repeat), "us")
+
+    if args.page_repeat:
+        report("page rerun", measure_page(args.page_repeat, args.timeout), "ms")
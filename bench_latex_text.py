@@ -0,0 +1,109 @@
+import argparse
+import glob
+import re
+import statistics
+import time
+import pandas as pd
+
+from latex_text import segment
+
+# LaTeX 수식 구분 벤치마크
+# 실제 문항(problem*.xlsx), 역량 기준(general_que*.xlsx), 대화 답변 예시를 모아서
+# 기존 두 방식(thermo.py의 process_text, thermal_init.py의 display_text_and_latex)과
+# 공통 토크나이저(latex_text.segment)의 분리 시간과 찾은 수식 수를 비교
+# 닫히지 않은 기호가 많은 입력으로 입력 길이에 따른 시간도 확인
+ANSWER_TEXTS = [
+    # test.py에 있던 예시 문항
+    "질량 m인 물체가 스프링에 연결되어 있을 때, 변위에 비례하는 복원력이 작용하며, 이 때 운동 방정식은 다음과 같이 주어진다:\n"
+    "\\[\n\\frac{d^2x}{dt^2} = -kx\n\\]\n이 미분 방정식을 풀고, 그 해가 물리적으로 무엇을 의미하는지 설명하시오.",
+    "이상 기체의 압력이 다음과 같이 주어진다:\n\\( P(V) = \\frac{nRT}{V} \\)\n"
+    "기체가 부피 $( V_1 $)에서 $ (V_2 $)로 변화할 때 수행하는 일을 구하고 풀이 과정을 설명하시오.",
+    # 학습자 답변과 챗봇 답변 예시
+    "운동 방정식 $\\ddot{x} = -kx$의 해는 $x(t) = A\\cos(\\sqrt{k}t + \\phi)$이고, 물체가 평형점을 중심으로 단순 조화 운동을 한다는 뜻입니다.",
+    "일은 $W = \\int_{V_1}^{V_2} P\\,dV = nRT\\ln\\frac{V_2}{V_1}$ 입니다. 등온 과정이므로 $\\Delta U = 0$이고 $Q = W$입니다.",
+    "좋은 질문입니다. 등압 과정에서 기체가 한 일은 다음과 같습니다.\n\n"
+    "$$W = \\int_{V_1}^{V_2} P\\,dV = P(V_2 - V_1)$$\n\n"
+    "이상 기체라면 상태 방정식 \\( PV = nRT \\)를 이용해 다음처럼 쓸 수도 있습니다.\n\n"
+    "\\[ W = nR(T_2 - T_1) \\]\n\n"
+    "1. 먼저 처음과 나중 상태의 온도를 구하세요.\n"
+    "2. 내부 에너지 변화 $\\Delta U = \\frac{3}{2} nR\\Delta T$와 비교해 보세요.\n"
+    "3. 열역학 제1법칙 $Q = \\Delta U + W$로 흡수한 열을 구할 수 있습니다.\n",
+    "고유값은 $\\det(A - \\lambda I) = 0$에서 $\\lambda = \\frac{5 \\pm \\sqrt{5}}{2}$이고, 실험 비용은 \\$30 정도입니다.",
+]
+
+def load_corpus():
+    texts = []
+    for path in sorted(glob.glob("problem*.xlsx")):
+        texts += pd.read_excel(path)["Problem"].dropna().astype(str).tolist()
+    for path in sorted(glob.glob("general_que*.xlsx")):
+        frame = pd.read_excel(path)
+        texts += frame["content"].dropna().astype(str).tolist() + frame["performance"].dropna().astype(str).tolist()
+    return texts + ANSWER_TEXTS
+
+def legacy_thermo(text):
+    # 기존 thermo.py process_text의 분리 부분 (출력 대신 세그먼트 목록 반환)
+    segments = []
+    for part in re.split(r'(\$\$.*?\$\$|\$.*?\$|\\\[.*?\\\]|\\\(.*?\\\))', text):
+        part = part.strip()
+        if re.match(r'^\$\$.*\$\$$', part):
+            segments.append(("latex", part.strip('$$')))
+        elif re.match(r'^\$.*\$$', part):
+            segments.append(("latex", part.strip('$')))
+        elif re.match(r'^\\\[.*\\\]$', part):
+            segments.append(("latex", part.strip('\\[').strip('\\]')))
+        elif re.match(r'^\\\(.*\\\)$', part):
+            segments.append(("latex", part.strip('\\(').strip('\\)')))
+        else:
+            segments.append(("text", part))
+    return segments
+
+def legacy_thermal_init(text):
+    # 기존 thermal_init.py display_text_and_latex의 분리 부분 (\[ \], \( \)만 수식으로 구분)
+    pattern = r'(\\\[.*?\\\]|\\\(.*?\\\))'
+    segments = []
+    for part in re.split(pattern, text, flags=re.DOTALL):
+        if re.fullmatch(pattern, part, flags=re.DOTALL):
+            segments.append(("latex", part[2:-2].strip()))
+        else:
+            segments.append(("text", part))
+    return segments
+
+def uncached(text):
+    return segment.__wrapped__(text)
+
+def measure(split, texts, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            split(text)
+        timings.append((time.perf_counter() - start) * 1_000_000 / len(texts))
+    return statistics.median(timings)
+
+def math_count(split, texts):
+    return sum(1 for text in texts for kind, _ in split(text) if kind != "text")
+
+def pathological(size):
+    # 닫히지 않은 \( 가 줄바꿈 없이 이어지는 입력 (지연 일치 정규식은 여는 기호마다 끝까지 다시 탐색)
+    return "\\( x " * size
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LaTeX 수식 구분 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    args = parser.parse_args()
+
+    texts = load_corpus()
+    print(f"corpus: {len(texts)} texts, {sum(map(len, texts))} chars")
+    splits = [("legacy thermo", legacy_thermo), ("legacy init", legacy_thermal_init),
+              ("segment", uncached), ("segment cached", segment)]
+    print(f"{'splitter':<16}{'us/text':>10}{'math':>7}")
+    for label, split in splits:
+        print(f"{label:<16}{measure(split, texts, args.repeat):>10.2f}{math_count(split, texts):>7}")
+
+    print(f"\n{'unclosed':>9}{'legacy thermo ms':>18}{'segment ms':>12}")
+    for size in args.sizes:
+        text = pathological(size)
+        legacy = measure(legacy_thermo, [text], 3) / 1000
+        new = measure(uncached, [text], 3) / 1000
+        print(f"{size:>9}{legacy:>18.2f}{new:>12.3f}")
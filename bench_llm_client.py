@@ -0,0 +1,61 @@
+import argparse
+import statistics
+import time
+from openai import OpenAI
+
+import mock_llm_server
+from llm_client import create_client
+
+# 공유 클라이언트와 호출마다 클라이언트를 새로 만드는 방식의 대화 1턴 지연 시간 비교
+MESSAGES = [
+    {"role": "system", "content": "너는 물리 분야 탐구를 위한 튜터의 역할을 수행해 줘."},
+    {"role": "user", "content": "학습을 시작하겠습니다."},
+]
+
+def per_call_turn(url):
+    # 기존 방식: 매 요청마다 새로운 클라이언트(연결 풀) 생성
+    client = OpenAI(api_key="mock", base_url=url)
+    response = client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+    return response.choices[0].message.content
+
+def shared_turn(client):
+    response = client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+    return response.choices[0].message.content
+
+def measure(turn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        turn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} mean {statistics.mean(timings):7.2f} ms | median {statistics.median(timings):7.2f} ms | p95 {p95:7.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI 클라이언트 재사용 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="모의 서버 응답 지연 시간(초)")
+    args = parser.parse_args()
+
+    server = mock_llm_server.start_server(latency=args.latency)
+    url = mock_llm_server.base_url(server)
+    shared = create_client(api_key="mock", base_url=url)
+
+    # 워밍업
+    per_call_turn(url)
+    shared_turn(shared)
+
+    per_call = measure(lambda: per_call_turn(url), args.repeat)
+    pooled = measure(lambda: shared_turn(shared), args.repeat)
+
+    print(f"{args.repeat} turns against {url}")
+    report("per-call", per_call)
+    report("shared", pooled)
+    print(f"speedup    {statistics.mean(per_call) / statistics.mean(pooled):.2f}x")
+
+    shared.close()
+    server.shutdown()
@@ -0,0 +1,32 @@
+from functools import lru_cache
+import streamlit as st
+from latex_text import segment, to_markdown
+
+# 대화 기록 출력
+# 다시 실행될 때마다 모든 메시지를 다시 변환하지 않도록, 메시지별 출력 내용(세그먼트)을 메모이제이션
+# 메시지마다 Markdown 하나로 변환해서 출력 요소 수도 줄임
+# 키는 (역할, 시각, 내용)이며 내용 문자열의 해시는 파이썬이 문자열 객체에 저장해 두므로
+# 세션에 남아 있는 이전 메시지는 해시를 다시 계산하지 않고 캐시에서 바로 꺼냄 (새 메시지만 변환)
+ROLE_LABELS = {"user": "You", "assistant": "AI"}  # system 메시지는 출력하지 않음
+
+RENDER_CACHE_SIZE = 4096
+
+def markdown_segments(text):
+    """텍스트 전체를 Markdown 하나로 출력"""
+    return (("text", text),)
+
+# LaTeX 수식과 일반 텍스트 구분 (latex_text.segment, 입력 문자열별로 캐시됨)
+latex_segments = segment
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def message_markdown(role, timestamp, content, segmenter):
+    """메시지 하나의 출력 내용 (역할/시각 표시와 내용을 Markdown 하나로 변환)"""
+    header = f"**{ROLE_LABELS[role]}** ({timestamp}):"
+    return f"{header}\n\n{to_markdown(segmenter(content))}"
+
+def render_history(messages, segmenter=markdown_segments):
+    """대화 기록 출력 (segmenter: 메시지 내용을 세그먼트로 바꾸는 함수). 메시지마다 요소 하나만 출력"""
+    for message in messages:
+        if message["role"] not in ROLE_LABELS:
+            continue
+        st.markdown(message_markdown(message["role"], message.get("timestamp", ""), message["content"], segmenter))
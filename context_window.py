@@ -0,0 +1,96 @@
+import math
+import os
+from dotenv import load_dotenv
+from llm_client import create_chat_completion
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 글자 수로 토큰 수를 추정
+    tiktoken = None
+
+# .env 파일을 로드
+load_dotenv()
+
+# 대화 문맥 설정 (환경 변수로 조정 가능)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "8000"))  # 요청 한 번에 보낼 최대 토큰 수
+CONTEXT_KEEP_RECENT = int(os.getenv("CONTEXT_KEEP_RECENT", "10"))  # 요약하지 않고 그대로 보낼 최근 메시지 수
+CONTEXT_SUMMARY_MODEL = os.getenv("CONTEXT_SUMMARY_MODEL", "gpt-4o-mini")
+
+# 메시지 하나에 붙는 역할/구분자 토큰
+MESSAGE_OVERHEAD = 4
+
+summary_prompt = (
+    "다음은 튜터와 학습자의 대화 중 오래된 부분이야."
+    "이전 요약이 있다면 그 내용과 합쳐서, 학습자가 제시한 답변과 생각, 튜터가 준 피드백, 아직 해결되지 않은 문제가 드러나도록 한글로 간결하게 요약해 줘."
+)
+
+_encoding = None
+
+def count_tokens(text):
+    """문자열의 토큰 수 계산"""
+    global _encoding
+
+    if tiktoken is not None and _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model("gpt-4o")
+        except Exception:
+            _encoding = False  # 인코딩을 불러올 수 없으면 추정값 사용
+
+    if _encoding:
+        return len(_encoding.encode(text))
+    # 한글은 대략 한 글자에 한 토큰, 영문은 네 글자에 한 토큰 정도
+    return math.ceil(sum(1 if ord(ch) > 127 else 0.25 for ch in text))
+
+def count_message_tokens(message):
+    return count_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD
+
+def new_context_state():
+    """대화별 요약 상태 (summary: 누적 요약, folded: 요약에 포함된 메시지 수)"""
+    return {"summary": "", "folded": 0}
+
+def summarize_messages(summary, messages):
+    """이전 요약과 새로 밀려난 메시지를 합쳐 새로운 요약 생성"""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    query = summary_prompt + "\n"
+    if summary:
+        query += f"이전 요약: {summary}\n"
+    query += f"대화:\n{transcript}"
+
+    response = create_chat_completion(
+        app="context_summary",
+        model=CONTEXT_SUMMARY_MODEL,
+        messages=[{"role": "user", "content": query}],
+    )
+    return response.choices[0].message.content
+
+def build_context(messages, state, budget=None, keep_recent=None):
+    """
+    API로 보낼 메시지 목록 생성.
+    시스템 프롬프트와 최근 메시지는 그대로 두고, 예산을 넘으면 오래된 메시지를 요약으로 대체.
+    원본 messages는 변경하지 않으므로 전체 대화는 그대로 DB에 저장할 수 있음.
+    """
+    budget = CONTEXT_TOKEN_BUDGET if budget is None else budget
+    keep_recent = CONTEXT_KEEP_RECENT if keep_recent is None else keep_recent
+
+    system = [m for m in messages if m["role"] == "system"]
+    turns = [m for m in messages if m["role"] != "system"]
+
+    total = sum(count_message_tokens(m) for m in system + turns[state["folded"]:])
+    if state["summary"]:
+        total += count_tokens(state["summary"]) + MESSAGE_OVERHEAD
+
+    cut = len(turns) - keep_recent
+    if total > budget and cut > state["folded"]:
+        try:
+            state["summary"] = summarize_messages(state["summary"], turns[state["folded"]:cut])
+            state["folded"] = cut
+        except Exception as e:
+            # 요약에 실패하면 이번 요청은 전체 대화를 그대로 보냄
+            print(f"Failed to summarize conversation: {e}")
+
+    context = [{"role": m["role"], "content": m["content"]} for m in system]
+    if state["summary"]:
+        context.append({"role": "system", "content": f"지금까지의 대화 요약: {state['summary']}"})
+    context += [{"role": m["role"], "content": m["content"]} for m in turns[state["folded"]:]]
+
+    return context
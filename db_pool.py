@@ -0,0 +1,144 @@
+import os
+import queue
+import threading
+import time
+import mysql.connector
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+# .env 파일을 로드
+load_dotenv()
+
+# 연결 풀 설정 (환경 변수로 조정 가능)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # 프로세스에서 유지할 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 빈 연결을 기다리는 최대 시간(초)
+DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "5"))  # 이 시간(초)보다 오래 쉰 연결은 꺼내기 전에 확인 (0이면 항상, 확인할 때마다 왕복 1회 추가)
+
+def connect():
+    """풀을 거치지 않는 새 연결"""
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_DATABASE")
+    )
+
+class ConnectionPool:
+    """
+    MySQL 연결 풀. 필요할 때 size개까지 연결을 만들고, 사용이 끝난 연결은 닫지 않고 재사용.
+    모든 연결이 사용 중이면 반환될 때까지 기다림.
+    """
+    def __init__(self, size=None, timeout=None, ping_interval=None):
+        self.size = size or DB_POOL_SIZE
+        self.timeout = DB_POOL_TIMEOUT if timeout is None else timeout
+        self.ping_interval = DB_POOL_PING_INTERVAL if ping_interval is None else ping_interval
+        self._idle = queue.LifoQueue()  # (연결, 반환 시각), 최근에 쓴 연결부터 재사용
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def checkout(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise mysql.connector.errors.PoolError(f"No free connection in the pool after {self.timeout}s")
+
+        try:
+            try:
+                connection, returned = self._idle.get_nowait()
+            except queue.Empty:
+                return connect()
+
+            # 오래 쉰 연결은 끊겼을 수 있으므로 확인하고 필요하면 다시 연결
+            if time.monotonic() - returned >= self.ping_interval:
+                connection.ping(reconnect=True, attempts=2, delay=0)
+            return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, connection, broken=False):
+        try:
+            if broken:
+                try:
+                    connection.close()
+                except mysql.connector.Error:
+                    pass
+            else:
+                self._idle.put((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """쉬고 있는 연결을 모두 닫음"""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """프로세스 전체에서 공유하는 연결 풀 반환 (최초 호출 시 생성)"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+
+    return _pool
+
+@contextmanager
+def db_connection():
+    """with db_connection() as conn: 형태로 풀에서 연결을 빌려 쓰고 자동으로 반환"""
+    pool = get_pool()
+    connection = pool.checkout()
+    broken = False
+    try:
+        yield connection
+    except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+        # 연결 자체에 문제가 생긴 경우 풀에 돌려놓지 않고 닫음
+        broken = True
+        raise
+    finally:
+        if not broken and connection.in_transaction:
+            try:
+                # 커밋되지 않은 변경은 다음 사용자에게 넘기지 않음
+                connection.rollback()
+            except mysql.connector.Error:
+                broken = True
+        pool.checkin(connection, broken)
+
+@contextmanager
+def db_cursor(dictionary=False):
+    """with db_cursor() as cursor: 블록이 정상 종료되면 커밋, 예외가 발생하면 롤백"""
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=dictionary)
+        try:
+            yield cursor
+            connection.commit()
+        finally:
+            cursor.close()
+
+def update_columns(table, record_id, fields, allowed, cursor=None):
+    """
+    fields({열 이름: 값})를 UPDATE 한 번, 커밋 한 번으로 저장.
+    열 이름은 쿼리에 그대로 들어가므로 allowed에 있는 열만 허용.
+    cursor를 넘기면 그 커서(트랜잭션)에서 실행하고 커밋은 호출한 쪽에 맡김.
+    """
+    if not fields:
+        return
+    unknown = set(fields) - set(allowed)
+    if unknown:
+        raise ValueError(f"Columns not allowed for {table}: {', '.join(sorted(unknown))}")
+
+    assignments = ", ".join(f"{column} = %s" for column in fields)
+    query = f"UPDATE {table} SET {assignments} WHERE id = %s"
+    if cursor is not None:
+        cursor.execute(query, (*fields.values(), record_id))
+        return
+    with db_cursor() as cursor:
+        cursor.execute(query, (*fields.values(), record_id))
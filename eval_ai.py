@@ -1,7 +1,6 @@
 import os
 import openai
 import json
-import mysql.connector
 import markdown
 import smtplib
 import streamlit as st
@@ -10,8 +9,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import io
 import matplotlib.font_manager as fm
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from openai import OpenAI
+from llm_client import create_chat_completion
+from db_pool import db_connection, db_cursor
+from item_responses import save_scores as save_item_scores
+from item_bank import load_item_bank, domains
+from learner_list import select_learner
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
@@ -73,33 +77,26 @@ tools = [
 dict_name = {"literacy": "인공지능 소양", "understanding": "인공지능 이해", "data": "데이터의 이해", "application": "인공지능의 활용", "overall": "종합 평가"}
 
 
-# Load the ai_test_update.csv file
-questions_df = pd.read_csv('ai_test_update.csv')
+# 문항 은행은 프로세스에서 한 번만 읽음 (ai_test.py와 같은 CSV, 채점에는 그림이 필요 없으므로 읽지 않음)
+@st.cache_resource
+def load_questions():
+    return load_item_bank(image_dir=None)
 
-# Connect to the MySQL database
-db = mysql.connector.connect(
-    host=os.getenv("DB_HOST"),
-    user=os.getenv("DB_USER"),
-    passwd=os.getenv("DB_PASSWORD"),
-    database=os.getenv("DB_DATABASE")
-)
+item_bank = load_questions()
+questions_df = item_bank.table
+
+# 전체 평가 시 동시에 평가할 학습자 수
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", "8"))
 
 # Function to validate password
 def validate_password(password):
     return password == stored_password
 
-# Function to get user list from the database
-def get_user_list():
-    cursor = db.cursor(dictionary=True)
-    cursor.execute("SELECT id, name, email, date FROM ai_assessment_results")
-    users = cursor.fetchall()
-    return users
-
 # Function to get user's responses from the database
 def get_user_responses(id):
-    cursor = db.cursor(dictionary=True)
-    cursor.execute(f"SELECT * FROM ai_assessment_results WHERE id = {id}")
-    user_data = cursor.fetchone()
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT * FROM ai_assessment_results_wide WHERE id = %s", (id,))
+        user_data = cursor.fetchone()
     return user_data
 
 def create_score_chart(scores):
@@ -158,52 +155,67 @@ def create_score_chart(scores):
     return img_buffer
 
 
+# 채점 결과에서 제외하고 피드백 생성에 사용할 열
+drop_columns = ['No', 'CVR_1', 'CVR_2', 'CVR_3', 'CVR_4', 'CVR_5', 'CVR_6',
+                'Difficult_1', 'Difficult_2', 'Difficult_3', 'Difficult_4', 'Difficult_5', 'Difficult_6',
+                'Problem', 'Choice', 'Figure']
+
+# 채점에 사용할 정답과 문항별 영역은 문항 은행에서 가져옴
+answer_key = item_bank.answer_key
+domain_index = pd.Categorical.from_codes(item_bank.domain_index, categories=list(domains))
+
+# 정답/오답/무응답 수를 저장하는 쿼리 (문항별 점수는 item_responses에 저장)
+save_counts_query = (
+    "UPDATE ai_assessment_results SET "
+    "correct_count = %s, incorrect_count = %s, unknown_count = %s WHERE id = %s"
+)
+
+# 학습자 응답을 정답과 비교해 채점 (화면 출력 없음)
+def score_user(user_data):
+    user_answers = np.array([user_data[f'q{i}'] for i in range(1, 41)])  # Using q1 to q40
+    correct = user_answers == answer_key
+
+    results = questions_df.copy()
+    results['User_Answer'] = user_answers
+    results['Correct'] = correct
+    results['Time_Taken'] = [user_data[f't{i}'] for i in range(1, 41)]  # Using t1 to t40 for time
+
+    # a1~a40: 정답 1, 오답 0, 응답하지 않음(-1) -1
+    scores = np.where(correct, 1, np.where(user_answers != -1, 0, -1))
+
+    # Calculate counts
+    correct_count = int(correct.sum())
+    unknown_count = int((user_answers == 0).sum())
+    incorrect_count = 40 - correct_count - unknown_count
+
+    # Calculate scores by domain
+    domain_scores = pd.Series(correct).groupby(domain_index, observed=False).mean().to_dict()
+
+    return results, scores, (correct_count, incorrect_count, unknown_count), domain_scores
+
+# 채점 결과(문항별 점수, 정답/오답/무응답 수)를 한 트랜잭션으로 저장
+def save_scores(connection, id, scores, counts):
+    cursor = connection.cursor()
+    cursor.execute(save_counts_query, (*counts, id))
+    save_item_scores(cursor, "ai_assessment_results", id, scores.tolist())
+    connection.commit()
+    cursor.close()
+
 # Function to display user data with calculated scores and update MySQL
 def display_user_data(id):
     user_data = get_user_responses(id)
     if user_data:
-        results = questions_df.copy()
-        user_answers = [user_data[f'q{i}'] for i in range(1, 41)]  # Using q1 to q40
-        results['User_Answer'] = user_answers
-        results['Correct'] = results['Answer'] == results['User_Answer']
-        results['Time_Taken'] = [user_data[f't{i}'] for i in range(1, 41)]  # Using t1 to t40 for time
-
-        # Calculate counts
-        correct_count = int(results['Correct'].sum())
-        unknown_count = int((results['User_Answer'] == 0).sum())
-        incorrect_count = 40 - correct_count - unknown_count
-
-        # Update a1~a40 in the database
-        cursor = db.cursor()
-        for i in range(1, 41):
-            correct_value = 1 if results['Correct'][i-1] else (0 if user_data[f'q{i}'] != -1 else -1)
-            cursor.execute(f"UPDATE ai_assessment_results SET a{i} = %s WHERE id = %s", (correct_value, id))
-
-        # Update the counts in the database
-        update_query = """
-        UPDATE ai_assessment_results
-        SET correct_count = %s, incorrect_count = %s, unknown_count = %s
-        WHERE id = %s
-        """
-        cursor.execute(update_query, (correct_count, incorrect_count, unknown_count, id))
-        db.commit()
-
-        # Calculate scores by domain
-        domain_scores = {
-            '인공지능 소양': results[results['Domain'] == '인공지능 소양']['Correct'].mean(),
-            '인공지능 이해': results[results['Domain'] == '인공지능 이해']['Correct'].mean(),
-            '데이터의 이해': results[results['Domain'] == '데이터의 이해']['Correct'].mean(),
-            '인공지능의 활용': results[results['Domain'] == '인공지능의 활용']['Correct'].mean()
-        }
+        results, scores, counts, domain_scores = score_user(user_data)
+        with db_connection() as connection:
+            save_scores(connection, id, scores, counts)
+        correct_count, incorrect_count, unknown_count = counts
 
         # Create and save the chart
         chart_buffer = create_score_chart(domain_scores)
 
         # Store the results and chart in session state
         st.session_state.results = results
-        st.session_state.results_filtered = results.drop(columns=['No', 'CVR_1', 'CVR_2', 'CVR_3', 'CVR_4', 'CVR_5', 'CVR_6',
-                                                                  'Difficult_1', 'Difficult_2', 'Difficult_3', 'Difficult_4', 'Difficult_5', 'Difficult_6',
-                                                                  'Problem', 'Choice', 'Figure'])
+        st.session_state.results_filtered = results.drop(columns=drop_columns)
         st.session_state.chart_buffer = chart_buffer
         
         # Display the scores and chart
@@ -221,6 +233,54 @@ def display_user_data(id):
 
 # ... (evaluation_prompt and tools remain unchanged)
 
+# 채점 결과를 GPT-4 API로 보내 영역별 피드백 생성 (화면 출력 없음)
+def generate_feedback(results):
+    dict_data = results.to_dict()
+    dict_as_str = json.dumps(dict_data, indent=4)  # indent=4로 읽기 쉽게 포맷팅
+    query = evaluation_prompt + dict_as_str
+    
+    messages = [] 
+    messages.append({"role": "system", "content": "You are the expert of AI competence. Don't make assumptions about what values to plug into functions."})
+    messages.append({"role": "user", "content": query})
+    resp = create_chat_completion(
+        app="eval_ai",
+        model="gpt-4o",
+        messages=messages,
+        tools=tools
+    )
+    
+    all_feedback = {}
+    
+    if hasattr(resp.choices[0].message, 'tool_calls'):
+        for tool_call in resp.choices[0].message.tool_calls:
+            if tool_call.function.name == 'get_feedback':
+                feedback = json.loads(tool_call.function.arguments)
+                all_feedback.update(feedback)
+    else:
+        all_feedback = json.loads(resp.choices[0].message.tool_calls[0].function.arguments)
+
+    return all_feedback
+
+# 영역별 피드백을 DB에 저장
+def save_feedback(connection, id, all_feedback):
+    update_query = """
+    UPDATE ai_assessment_results
+    SET ai_literacy_feedback = %s, ai_understanding_feedback = %s,
+        data_understanding_feedback = %s, ai_application_feedback = %s, overall_feedback = %s
+    WHERE id = %s
+    """
+    
+    cursor = connection.cursor()
+    cursor.execute(update_query, (
+        all_feedback.get('literacy', ''),
+        all_feedback.get('understanding', ''),
+        all_feedback.get('data', ''),
+        all_feedback.get('application', ''),
+        all_feedback.get('overall', ''),
+        id
+    ))
+    connection.commit()
+
 # Function to evaluate the user responses and send to GPT-4 API
 def evaluate_user(id):
     user_data = get_user_responses(id)
@@ -233,29 +293,7 @@ def evaluate_user(id):
             st.error("사용자 응답 데이터가 없습니다.")
             return
 
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        dict_data = results.to_dict()
-        dict_as_str = json.dumps(dict_data, indent=4)  # indent=4로 읽기 쉽게 포맷팅
-        query = evaluation_prompt + dict_as_str
-        
-        messages = [] 
-        messages.append({"role": "system", "content": "You are the expert of AI competence. Don't make assumptions about what values to plug into functions."})
-        messages.append({"role": "user", "content": query})
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            tools=tools
-        )
-        
-        all_feedback = {}
-        
-        if hasattr(resp.choices[0].message, 'tool_calls'):
-            for tool_call in resp.choices[0].message.tool_calls:
-                if tool_call.function.name == 'get_feedback':
-                    feedback = json.loads(tool_call.function.arguments)
-                    all_feedback.update(feedback)
-        else:
-            all_feedback = json.loads(resp.choices[0].message.tool_calls[0].function.arguments)
+        all_feedback = generate_feedback(results)
 
         # Display GPT-4 feedback
         st.write("### AI 기반 평가 피드백 ")
@@ -271,23 +309,63 @@ def evaluate_user(id):
         st.markdown(markdown_text)
 
         # MySQL 업데이트 (각 피드백을 DB에 저장)
-        update_query = """
-        UPDATE ai_assessment_results
-        SET ai_literacy_feedback = %s, ai_understanding_feedback = %s,
-            data_understanding_feedback = %s, ai_application_feedback = %s, overall_feedback = %s
-        WHERE id = %s
-        """
-        
-        cursor = db.cursor()
-        cursor.execute(update_query, (
-            all_feedback.get('literacy', ''),
-            all_feedback.get('understanding', ''),
-            all_feedback.get('data', ''),
-            all_feedback.get('application', ''),
-            all_feedback.get('overall', ''),
-            id
-        ))
-        db.commit()
+        with db_connection() as connection:
+            save_feedback(connection, id, all_feedback)
+        count_pending_users.clear()
+
+# 피드백이 아직 없는 학습자 조건 (sql/add_learner_list_indexes.sql의 overall_feedback 인덱스 사용)
+pending_condition = "overall_feedback IS NULL OR overall_feedback = ''"
+
+# 버튼에 표시할 미평가 학습자 수 (다시 실행될 때마다 조회하지 않도록 캐시, 평가 후에는 캐시를 비움)
+@st.cache_data(ttl=60, show_spinner=False)
+def count_pending_users():
+    with db_cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM ai_assessment_results WHERE {pending_condition}")
+        return cursor.fetchone()[0]
+
+# 피드백이 아직 없는 학습자 목록 (전체 평가 버튼을 눌렀을 때만 조회)
+def get_pending_users():
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(f"SELECT id, name FROM ai_assessment_results WHERE {pending_condition} ORDER BY id")
+        users = cursor.fetchall()
+    return users
+
+# 학습자 한 명을 채점하고 피드백까지 생성해 저장 (작업 스레드에서 실행되므로 풀에서 연결을 빌려 사용)
+def evaluate_pending_user(id):
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM ai_assessment_results_wide WHERE id = %s", (id,))
+        user_data = cursor.fetchone()
+        cursor.close()
+
+        results, scores, counts, domain_scores = score_user(user_data)
+        save_scores(connection, id, scores, counts)
+
+    # LLM 응답을 기다리는 동안에는 연결을 풀에 돌려놓음
+    # 피드백까지 저장되어야 완료된 것으로 보므로, 중단되면 다음 실행에서 이 학습자부터 다시 평가
+    all_feedback = generate_feedback(results.drop(columns=drop_columns))
+    with db_connection() as connection:
+        save_feedback(connection, id, all_feedback)
+
+# 피드백이 없는 모든 학습자를 동시에 평가하면서 진행 상황 표시
+def evaluate_pending_users(users):
+    progress = st.progress(0.0, text=f"0/{len(users)}명 평가 완료")
+    done = 0
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=EVAL_WORKERS) as executor:
+        futures = {executor.submit(evaluate_pending_user, user['id']): user for user in users}
+        for future in as_completed(futures):
+            user = futures[future]
+            try:
+                future.result()
+                done += 1
+            except Exception as e:
+                failed.append(user)
+                print(f"Failed to evaluate user {user['id']}: {e}")
+            progress.progress((done + len(failed)) / len(users), text=f"{done}/{len(users)}명 평가 완료")
+
+    return done, failed
 
 # 이메일로 평가 결과 전송 함수
 def send_email(recipient_email, name, subject, body, chart_buffer):
@@ -337,16 +415,25 @@ password = st.text_input("비밀번호를 입력한 뒤, 엔터를 누르세요.
 if password:
     if validate_password(password):
         st.success("비밀번호가 일치합니다.")
+
+        # 피드백이 없는 학습자를 한꺼번에 평가
+        pending_count = count_pending_users()
+        if pending_count and st.button(f"미평가 학습자 전체 평가하기 ({pending_count}명)"):
+            done, failed = evaluate_pending_users(get_pending_users())
+            count_pending_users.clear()
+            st.success(f"{done}명의 평가가 완료되었습니다.")
+            if failed:
+                st.error(f"{len(failed)}명의 평가에 실패했습니다. 다시 실행하면 실패한 학습자부터 평가합니다: "
+                         + ", ".join(user['name'] for user in failed))
         
-        # Fetch and display users
-        users = get_user_list()
-        user_names = [f"{user['name']} ({user['email']} / {user['date']})" for user in users]
-        selected_user = st.selectbox("평가할 학습자 선택:", user_names)
+        # 학습자 목록은 페이지 단위로 조회 (이름/이메일/날짜로 검색)
+        selected_user = select_learner("ai_assessment_results", "평가할 학습자 선택:",
+                                       lambda user: f"{user['name']} ({user['email']} / {user['date']})", key="users")
         
         if selected_user:
-            selected_id = users[user_names.index(selected_user)]['id']
-            selected_email = users[user_names.index(selected_user)]['email']
-            selected_name = users[user_names.index(selected_user)]['name']
+            selected_id = selected_user['id']
+            selected_email = selected_user['email']
+            selected_name = selected_user['name']
             
             # Button to display user data
             if st.button("사용자 응답 및 정답 확인") or st.session_state.get('results_filtered') is not None:
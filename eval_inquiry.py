@@ -1,5 +1,7 @@
 import streamlit as st
-import mysql.connector
+from db_pool import db_cursor
+from message_store import load_transcript
+from learner_list import select_learner
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -10,34 +12,20 @@ st.set_page_config(layout="wide")
 # Load the .env file
 load_dotenv()
 
-# Database connection setup
-def init_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_DATABASE")
-    )
-
-# Function to fetch student data from the database
-# 시간을 오름차순으로 정렬하여 가져오기
-def fetch_students():
-    conn = init_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT id, name, email, date FROM inquiry_talk ORDER BY date ASC")
-    students = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return students
+# 단계(탭) 이름
+stages = ["탐구 질문", "가설", "배경이론", "준비물 및 탐구과정"]
 
 # Function to fetch conversation and advice data for a specific student
-def fetch_student_data(student_id):
-    conn = init_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT conversation1, conversation2, conversation3, conversation4, advice1, advice2, advice3, advice4 FROM inquiry_talk WHERE id = %s", (student_id,))
-    data = cursor.fetchone()
-    cursor.close()
-    conn.close()
+# 탭을 열 때 해당 단계의 열(conversationN, adviceN)만 가져오고, (학생 id, 단계)별로 잠시 캐시
+@st.cache_data(ttl=120, show_spinner=False)
+def fetch_stage_data(student_id, stage):
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(f"SELECT conversation{stage} AS conversation, advice{stage} AS advice FROM inquiry_talk WHERE id = %s", (student_id,))
+        data = cursor.fetchone()
+
+    # 아직 '다음'을 누르지 않은 단계는 conversationN이 비어 있으므로 메시지 테이블에서 대화 텍스트를 만듦
+    if data and not data["conversation"]:
+        data["conversation"] = load_transcript("inquiry_talk", student_id, stage)
     return data
 
 # Main page
@@ -50,49 +38,30 @@ def overall_page():
         st.warning("올바른 비밀번호를 입력하세요.")
         return
     
-    # Fetch and display student selection dropdown (sorted by date in ascending order)
-    students = fetch_students()
-    if not students:
-        st.warning("등록된 학생 정보가 없습니다.")
+    # 학생 목록은 시간 오름차순으로 페이지 단위로 조회 (이름/이메일/날짜로 검색)
+    selected_student = select_learner("inquiry_talk", "학생을 선택하세요",
+                                      lambda s: f"{s['name']} ({s['email']}) - {s['date']}", key="students")
+    if not selected_student:
+        st.warning("조건에 맞는 학생 정보가 없습니다.")
         return
 
-    # Create the options for the combo box sorted by date (ascending)
-    student_options = [f"{s['name']} ({s['email']}) - {s['date']}" for s in students]
-    selected_student = st.selectbox("학생을 선택하세요", student_options)
-
     # Get the selected student's ID
-    student_id = students[student_options.index(selected_student)]["id"]
-
-    # Fetch the selected student's data
-    student_data = fetch_student_data(student_id)
-
-    if student_data:
-        # Display the data in tabs
-        tabs = st.tabs(["탐구 질문", "가설", "배경이론", "준비물 및 탐구과정"])
-
-        with tabs[0]:
-            st.header("탐구 질문 대화 기록")
-            st.markdown(student_data["conversation1"])
-            st.header("탐구 질문 피드백")
-            st.markdown(student_data["advice1"])
-
-        with tabs[1]:
-            st.header("가설 대화 기록")
-            st.markdown(student_data["conversation2"])
-            st.header("가설 피드백")
-            st.markdown(student_data["advice2"])
-
-        with tabs[2]:
-            st.header("배경이론 대화 기록")
-            st.markdown(student_data["conversation3"])
-            st.header("배경이론 피드백")
-            st.markdown(student_data["advice3"])
-
-        with tabs[3]:
-            st.header("준비물 및 탐구과정 대화 기록")
-            st.markdown(student_data["conversation4"])
-            st.header("준비물 및 탐구과정 피드백")
-            st.markdown(student_data["advice4"])
+    student_id = selected_student["id"]
+
+    # 선택한 탭의 내용만 조회해서 표시 (탭을 바꾸면 다시 실행되며, 닫힌 탭은 건너뜀)
+    tabs = st.tabs(stages, key="stage_tab", on_change="rerun")
+    for stage, (title, tab) in enumerate(zip(stages, tabs), start=1):
+        if not tab.open:
+            continue
+        with tab:
+            stage_data = fetch_stage_data(student_id, stage)
+            if not stage_data:
+                st.warning("학생 정보를 찾을 수 없습니다.")
+                continue
+            st.header(f"{title} 대화 기록")
+            st.markdown(stage_data["conversation"])
+            st.header(f"{title} 피드백")
+            st.markdown(stage_data["advice"])
 
 # Streamlit app execution
 if __name__ == "__main__":
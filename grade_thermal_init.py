@@ -0,0 +1,114 @@
+import argparse
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from db_pool import db_cursor
+from llm_client import configure_limiter, limiter_report
+from thermal_grading import evaluate_student_data, save_results
+
+# thermal_init 제출 중 아직 채점되지 않은(total_score가 NULL인) 응답을 한꺼번에 채점하는 스크립트
+# 채점된 결과는 batch-size 단위로 커밋하므로 중간에 중단되어도 다시 실행하면 남은 응답부터 이어서 채점
+#
+# 사용 예: python grade_thermal_init.py --workers 4 --rate 30
+
+load_dotenv()
+
+def fetch_pending(limit=None):
+    """채점되지 않은 응답을 id 순서로 조회"""
+    query = "SELECT * FROM thermal_init_wide WHERE total_score IS NULL ORDER BY id"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(query)
+        rows = cursor.fetchall()
+    return rows
+
+def write_results(results):
+    """채점 결과 여러 건을 한 트랜잭션으로 저장"""
+    with db_cursor() as cursor:
+        for result in results:
+            save_results(cursor, *result)
+
+def grade(student_data, questions):
+    total_score, total_feedback, correct, feed = evaluate_student_data(student_data, questions)
+    return (student_data['id'], total_score, total_feedback, correct, feed)
+
+def grade_pending(workers=4, rate=0.0, batch_size=10, limit=None):
+    questions = pd.read_excel('problem.xlsx')
+    rows = fetch_pending(limit)
+    print(f"{len(rows)} submissions to grade")
+
+    # 분당 요청 수는 llm_client의 공유 제한기로 조절
+    if rate:
+        configure_limiter(rpm=rate)
+
+    results = []  # 채점했지만 아직 저장하지 않은 결과
+    graded = failed = 0
+    error = None
+    start = time.perf_counter()
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {executor.submit(grade, row, questions): row['id'] for row in rows}
+    remaining = set(futures)
+    try:
+        for future in as_completed(futures):
+            remaining.discard(future)
+            student_id = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # 실패한 응답은 total_score가 NULL로 남아 다음 실행에서 다시 채점됨
+                failed += 1
+                print(f"Failed to grade submission {student_id}: {e}")
+                continue
+
+            if len(results) >= batch_size:
+                # 저장에 실패한 배치는 다시 저장하지 않음 (롤백되어 total_score가 NULL로 남으므로 다음 실행에서 다시 채점)
+                batch, results = results, []
+                write_results(batch)
+                graded += len(batch)
+                print(f"{graded}/{len(rows)} graded ({time.perf_counter() - start:.1f}s)")
+    except BaseException as e:
+        # 중단(Ctrl+C)되거나 저장에 실패하면 아직 시작하지 않은 채점은 취소 (결과를 버릴 LLM 요청을 보내지 않음)
+        # 이미 진행 중인 채점은 끝날 때까지 기다린 뒤 결과를 함께 저장
+        error = e
+        print("Stopping; cancelling submissions not yet started")
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future in remaining:
+            if not future.done() or future.cancelled():
+                continue
+            if future.exception() is None:
+                results.append(future.result())
+            else:
+                failed += 1
+                print(f"Failed to grade submission {futures[future]}: {future.exception()}")
+        raise
+    finally:
+        # 중단되더라도 이미 채점했지만 저장하지 않은 결과는 저장
+        executor.shutdown(wait=True)
+        if results:
+            try:
+                write_results(results)
+                graded += len(results)
+            except Exception as e:
+                print(f"Failed to save {len(results)} graded submissions: {e}")
+                # 중단된 원인이 있으면 그 예외를 그대로 전달
+                if error is None:
+                    raise
+        if error is not None:
+            print(f"graded {graded}, failed {failed} before stopping")
+
+    print(f"graded {graded}, failed {failed} in {time.perf_counter() - start:.1f}s")
+    wait = limiter_report()
+    print(f"average queue wait {wait['avg_wait']:.2f}s, max {wait['max_wait']:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채점되지 않은 thermal_init 응답 일괄 채점")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 채점할 응답 수")
+    parser.add_argument("--rate", type=float, default=0.0, help="분당 최대 LLM 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--batch-size", type=int, default=10, help="한 번에 업데이트할 결과 수")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 채점할 최대 응답 수")
+    args = parser.parse_args()
+
+    grade_pending(args.workers, args.rate, args.batch_size, args.limit)
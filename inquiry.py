@@ -1,5 +1,9 @@
 import streamlit as st
-import mysql.connector
+from db_pool import db_cursor, update_columns
+from message_store import new_session_id, append_messages, format_transcript
+from item_responses import save_responses
+from write_behind import queued_cursor, flush_writes
+from chat_render import render_history
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -7,7 +11,9 @@ import requests
 import re
 import json
 import time
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from llm_client import create_chat_completion, stream_chat_completion, LimiterBusy
+from context_window import build_context, new_context_state
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -37,48 +43,78 @@ def contains_heading(text, headings):
             return True
     return False
 
-# MySQL 연결 설정
-def init_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv('DB_PASSWORD'),
-        database=os.getenv('DB_DATABASE')
-    )
+# inquiry_talk에서 대화 중에 업데이트하는 열
+# (설문 응답 feedback1~26은 item_responses에 저장)
+inquiry_fields = ([f"conversation{i}" for i in range(1, 5)]
+                  + [f"advice{i}" for i in range(1, 5)])
+
+# 여러 열을 한 번의 UPDATE로 저장
+# 쓰기 큐(write_behind)에 넣고 바로 반환하며, 커밋은 작업 스레드에서 진행
+def update_fields(record_id, fields):
+    with queued_cursor() as cursor:
+        update_columns("inquiry_talk", record_id, fields, inquiry_fields, cursor=cursor)
 
 # MySQL 업데이트 함수
+def update_record(fields):
+    if 'record_id' not in st.session_state:
+        st.error("레코드가 생성되지 않았습니다. 먼저 레코드를 생성하세요.")
+        return False
+
+    # id 값을 기준으로 레코드를 업데이트
+    update_fields(st.session_state.record_id, fields)
+    return True
+
 def update_table(field, value):
+    return update_record({field: value})
+
+# 설문 응답을 item_responses에 문항별로 한 번에 저장
+def save_survey(feedbacks):
     if 'record_id' not in st.session_state:
         st.error("레코드가 생성되지 않았습니다. 먼저 레코드를 생성하세요.")
-        return
+        return False
 
-    conn = init_connection()
-    cursor = conn.cursor()
+    with queued_cursor() as cursor:
+        save_responses(cursor, "inquiry_talk", st.session_state.record_id, feedbacks)
 
-    # id 값을 기준으로 레코드를 업데이트
-    query = f"UPDATE inquiry_talk SET {field} = %s WHERE id = %s"
-    cursor.execute(query, (value, st.session_state.record_id))
+    # 마지막 제출이므로 세션의 쓰기가 모두 반영될 때까지 기다림
+    flushed, failed = flush_writes()
+    if failed:
+        st.error(f"MySQL 오류가 발생했습니다: {failed[-1][1]}")
+        return False
+    if not flushed:
+        print("Write queue not flushed yet; pending writes stay in the outbox")
+    return True
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+# 이번 턴에 새로 생긴 메시지만 conversation_messages에 추가 (전체 대화는 단계가 끝날 때 한 번만 저장)
+def save_new_messages(step):
+    if 'record_id' not in st.session_state:
+        return
+    if 'message_session' not in st.session_state:
+        st.session_state.message_session = new_session_id()
+
+    key = f"saved_messages {step}"
+    try:
+        with queued_cursor() as cursor:
+            saved = append_messages(
+                st.session_state.message_session, "inquiry_talk", st.session_state.record_id,
+                step + 1, st.session_state["messages"], st.session_state.get(key, 0), cursor=cursor
+            )
+        st.session_state[key] = saved
+    except Exception as e:
+        # 저장하지 못한 메시지는 다음 턴에 함께 저장
+        print(f"Failed to save messages: {e}")
 
 # 파일 업로드 이후 MySQL에 저장하는 함수
 def save_initial_inquiry_data():
-    conn = init_connection()
-    cursor = conn.cursor()
     query = '''INSERT INTO inquiry_talk (student_number, name, email, date, topic, problem, hypothesis, theory, apparatus, process)
                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'''
-    cursor.execute(query, (
-        st.session_state.student_number, st.session_state.name, st.session_state.email, datetime.now(),
-        st.session_state.topic, st.session_state.problem, st.session_state.hypothesis,
-        st.session_state.theory, st.session_state.apparatus, st.session_state.process
-    ))
-    conn.commit()
-    st.session_state.record_id = cursor.lastrowid
-    
-    cursor.close()
-    conn.close()
+    with db_cursor() as cursor:
+        cursor.execute(query, (
+            st.session_state.student_number, st.session_state.name, st.session_state.email, datetime.now(),
+            st.session_state.topic, st.session_state.problem, st.session_state.hypothesis,
+            st.session_state.theory, st.session_state.apparatus, st.session_state.process
+        ))
+        st.session_state.record_id = cursor.lastrowid
 
 # 단계별 페이지 정의
 # 단계별 페이지 함수 정의
@@ -173,33 +209,120 @@ initial_prompt = [
         "학습자가 설계한 탐구 주제 및 관련 설명은 다음과 같아.")
 ]
                   
+# 단계별 시스템 프롬프트
+# 프롬프트 캐시는 앞부분이 바이트 단위로 같을 때만 적용되므로 모든 학생에게 같은 지침을 맨 앞에,
+# 같은 주제끼리 공유되는 문제 설명을 그 다음에, 학생별 내용은 마지막에 배치
+def build_system_prompt(step):
+    prompt = initial_prompt[step]
+    prompt += f"탐구 주제: {st.session_state.topic}\n"
+    prompt += f"설명: {probs[st.session_state.topic]}\n"
+    prompt += f"탐구 문제: {st.session_state.problem}\n"
+    prompt += f"가설: {st.session_state.hypothesis}\n"
+    prompt += f"배경이론: {st.session_state.theory}\n"
+    prompt += f"준비물: {st.session_state.apparatus}\n"
+    prompt += f"탐구 과정: {st.session_state.process}"
+    return prompt
+
+# 다음 단계 첫 응답(인사)을 미리 생성하는 작업 스레드 수 (모든 세션 공유)
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "8"))
+# 진행 중인 미리 생성 작업을 기다리는 최대 시간(초). 넘으면 버리고 스트리밍으로 새로 요청
+PREFETCH_WAIT = float(os.getenv("PREFETCH_WAIT", "5"))
+
+# 모든 세션이 공유하는 첫 응답 미리 생성 작업 풀
+@st.cache_resource
+def get_prefetch_executor():
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+# 시스템 프롬프트만 보내서 단계의 첫 응답 생성 (세션 상태에 접근하지 않으므로 작업 스레드에서 호출 가능)
+def request_opening(system_prompt):
+    context = build_context([{"role": "system", "content": system_prompt}], new_context_state())
+    # 대화 중인 학생의 요청을 기다리게 하지 않도록 제한값에 여유가 있을 때만 보냄 (없으면 LimiterBusy)
+    response = create_chat_completion(
+        app="inquiry",
+        model="gpt-4o",
+        messages=context,
+        low_priority=True,
+    )
+    return response.choices[0].message.content
+
+# 현재 단계를 진행하는 동안 다음 단계의 첫 응답을 백그라운드에서 생성
+# 단계마다 한 번만 요청 (다시 실행될 때마다 새로 보내지 않고, 이미 꺼내 쓰거나 실패한 단계도 다시 보내지 않음)
+# 작업은 시스템 프롬프트와 함께 저장하고, 꺼낼 때 프롬프트가 달라졌으면 사용하지 않음
+def prefetch_opening(step):
+    if step >= len(initial_prompt):
+        return
+    if "opening_jobs" not in st.session_state:
+        st.session_state.opening_jobs = {}
+        st.session_state.opening_requested = set()
+    if step in st.session_state.opening_requested:
+        return
+    st.session_state.opening_requested.add(step)
+    system_prompt = build_system_prompt(step)
+    st.session_state.opening_jobs[step] = (system_prompt, get_prefetch_executor().submit(request_opening, system_prompt))
+
+# 미리 생성한 첫 응답 꺼내기 (같은 프롬프트로 만든 응답이 없거나 실패했으면 None)
+# 다른 세션의 작업에 밀려 아직 시작하지 못했으면 취소하고 None (스트리밍으로 새로 요청)
+# 이미 생성 중이면 PREFETCH_WAIT초까지만 기다림
+def take_opening(step, system_prompt):
+    job = st.session_state.get("opening_jobs", {}).pop(step, None)
+    if job is None:
+        return None
+    if job[1].cancel() or job[0] != system_prompt:
+        return None
+    try:
+        return job[1].result(timeout=PREFETCH_WAIT)
+    except LimiterBusy:
+        return None  # 대화 요청이 많아 미리 생성하지 않음
+    except Exception as e:
+        print(f"Failed to prefetch opening of step {step}: {e!r}")
+        return None
+
 # 챗봇 응답 함수
-def get_response(step, prompt):
+# container(st.empty())를 전달하면 응답 토큰을 도착하는 대로 해당 영역에 출력
+# 단계의 첫 응답은 미리 생성된 것이 있으면 API를 호출하지 않고 그대로 사용
+def get_response(step, prompt, container=None):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
+    answer = None
+
     if prompt == "":
-        prompt = initial_prompt[step]
-        prompt += f"탐구 주제: {st.session_state.topic}\n"
-        prompt += f"설명: {probs[st.session_state.topic]}\n"
-        prompt += f"탐구 문제: {st.session_state.problem}\n"
-        prompt += f"가설: {st.session_state.hypothesis}\n"
-        prompt += f"배경이론: {st.session_state.theory}\n"
-        prompt += f"준비물: {st.session_state.apparatus}\n"
-        prompt += f"탐구 과정: {st.session_state.process}"
+        prompt = build_system_prompt(step)
         st.session_state["messages"].append({"role": "system", "content": prompt, "timestamp": timestamp})
+        # 새 단계가 시작되면 대화 요약도 새로 시작
+        st.session_state["context"] = new_context_state()
+        answer = take_opening(step, prompt)
     else:
         st.session_state["messages"].append({"role": "user", "content": prompt, "timestamp": timestamp})
-    
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=st.session_state["messages"],
-    )
-    
-    answer = response.choices[0].message.content
+
+    if answer is not None:
+        print("Using prefetched opening.")
+    else:
+        # 토큰 예산을 넘으면 오래된 대화는 요약해서 전송 (전체 대화는 messages에 그대로 유지)
+        if "context" not in st.session_state:
+            st.session_state["context"] = new_context_state()
+        context = build_context(st.session_state["messages"], st.session_state["context"])
+
+        if container is not None:
+            # 스트리밍 모드: 전체 응답을 기다리지 않고 토큰 단위로 출력
+            with container.container():
+                if st.session_state["messages"][-1]["role"] == "user":
+                    st.markdown(f"**You** ({timestamp}):")
+                    st.markdown(prompt)
+                st.markdown("**AI**:")
+                answer = st.write_stream(stream_chat_completion(context, app="inquiry"))
+            # 완성된 응답은 대화 기록으로 다시 출력되므로 스트리밍 영역은 비움
+            container.empty()
+        else:
+            response = create_chat_completion(
+                app="inquiry",
+                model="gpt-4o",
+                messages=context,
+            )
+            answer = response.choices[0].message.content
+
     print(f"from server: {answer}")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     st.session_state["messages"].append({"role": "assistant", "content": answer, "timestamp": timestamp})    
+    save_new_messages(step)
 
     return answer
 
@@ -207,20 +330,16 @@ def inquiry_problem_page():
     st.title("탐구 문제")
     if st.session_state.messages == []:
         print("Calling first")
-        get_response(0, "")
+        get_response(0, "", container=st.empty())
 
-    # 대화 기록 출력
-    for message in st.session_state["messages"]:
-        role = message["role"]
-        content = message["content"]
-        timestamp = message.get("timestamp", "")
+    # 이 단계를 진행하는 동안 다음 단계의 첫 응답을 미리 생성
+    prefetch_opening(1)
 
-        if role == "user":
-            st.markdown(f"**You** ({timestamp}):")
-            st.markdown(content)
-        elif role == "assistant":
-            st.markdown(f"**AI** ({timestamp}):")
-            st.markdown(content)
+    # 대화 기록 출력 (이전 메시지의 변환 결과는 캐시에서 재사용)
+    render_history(st.session_state["messages"])
+
+    # 새 응답이 스트리밍되는 영역
+    stream_area = st.empty()
 
     # 사용자 입력 처리
     with st.form(key="chat_form", clear_on_submit=True):
@@ -229,36 +348,33 @@ def inquiry_problem_page():
 
         if submit and user_input:
             # 사용자 입력 처리 및 응답 생성
-            get_response(0, user_input)
+            get_response(0, user_input, container=stream_area)
             # 리렌더링
             st.rerun()
 
     if st.button("다음"):
         # 대화 내용 저장
-        conversation = "\n".join([f"{msg['role']} ({msg.get('timestamp', 'N/A')}): {msg['content']}" for msg in st.session_state["messages"]])
+        conversation = format_transcript(st.session_state["messages"])
         update_table("conversation1", conversation)
         st.session_state.step = "hypothesis"
         st.session_state.all.append(st.session_state["messages"])
+        start_feedback_job(0, st.session_state["messages"])
         st.session_state["messages"] = []
         st.rerun()
         
 def inquiry_hypothesis_page():
     st.title("탐구 가설")
     if not st.session_state['messages']:
-        get_response(1, "")
+        get_response(1, "", container=st.empty())
 
-    # 대화 기록 출력
-    for message in st.session_state["messages"]:
-        role = message["role"]
-        content = message["content"]
-        timestamp = message.get("timestamp", "")
+    # 이 단계를 진행하는 동안 다음 단계의 첫 응답을 미리 생성
+    prefetch_opening(2)
 
-        if role == "user":
-            st.markdown(f"**You** ({timestamp}):")
-            st.markdown(content)
-        elif role == "assistant":
-            st.markdown(f"**AI** ({timestamp}):")
-            st.markdown(content)
+    # 대화 기록 출력 (이전 메시지의 변환 결과는 캐시에서 재사용)
+    render_history(st.session_state["messages"])
+
+    # 새 응답이 스트리밍되는 영역
+    stream_area = st.empty()
 
     # 사용자 입력 처리
     with st.form(key="chat_form", clear_on_submit=True):
@@ -267,36 +383,33 @@ def inquiry_hypothesis_page():
 
         if submit and user_input:
             # 사용자 입력 처리 및 응답 생성
-            get_response(1, user_input)
+            get_response(1, user_input, container=stream_area)
             # 리렌더링
             st.rerun()
 
     if st.button("다음"):
         # 대화 내용 저장
-        conversation = "\n".join([f"{msg['role']} ({msg.get('timestamp', 'N/A')}): {msg['content']}" for msg in st.session_state["messages"]])
+        conversation = format_transcript(st.session_state["messages"])
         update_table("conversation2", conversation)
         st.session_state.step = "theory"
         st.session_state.all.append(st.session_state["messages"])
+        start_feedback_job(1, st.session_state["messages"])
         st.session_state["messages"] = []
         st.rerun()
     
 def inquiry_theory_page():
     st.title("배경 이론")
     if st.session_state.messages == []:
-        get_response(2, "")
+        get_response(2, "", container=st.empty())
 
-    # 대화 기록 출력
-    for message in st.session_state["messages"]:
-        role = message["role"]
-        content = message["content"]
-        timestamp = message.get("timestamp", "")
+    # 이 단계를 진행하는 동안 다음 단계의 첫 응답을 미리 생성
+    prefetch_opening(3)
 
-        if role == "user":
-            st.markdown(f"**You** ({timestamp}):")
-            st.markdown(content)
-        elif role == "assistant":
-            st.markdown(f"**AI** ({timestamp}):")
-            st.markdown(content)
+    # 대화 기록 출력 (이전 메시지의 변환 결과는 캐시에서 재사용)
+    render_history(st.session_state["messages"])
+
+    # 새 응답이 스트리밍되는 영역
+    stream_area = st.empty()
 
     # 사용자 입력 처리
     with st.form(key="chat_form", clear_on_submit=True):
@@ -305,36 +418,30 @@ def inquiry_theory_page():
 
         if submit and user_input:
             # 사용자 입력 처리 및 응답 생성
-            get_response(2, user_input)
+            get_response(2, user_input, container=stream_area)
             # 리렌더링
             st.rerun()
 
     if st.button("다음"):
         # 대화 내용 저장
-        conversation = "\n".join([f"{msg['role']} ({msg.get('timestamp', 'N/A')}): {msg['content']}" for msg in st.session_state["messages"]])
+        conversation = format_transcript(st.session_state["messages"])
         update_table("conversation3", conversation)
         st.session_state.step = "process"
         st.session_state.all.append(st.session_state["messages"])
+        start_feedback_job(2, st.session_state["messages"])
         st.session_state["messages"] = []
         st.rerun()
 
 def inquiry_process_page():
     st.title("탐구 과정 및 절차")
     if st.session_state.messages == []:
-        get_response(3, "")
+        get_response(3, "", container=st.empty())
 
-    # 대화 기록 출력
-    for message in st.session_state["messages"]:
-        role = message["role"]
-        content = message["content"]
-        timestamp = message.get("timestamp", "")
+    # 대화 기록 출력 (이전 메시지의 변환 결과는 캐시에서 재사용)
+    render_history(st.session_state["messages"])
 
-        if role == "user":
-            st.markdown(f"**You** ({timestamp}):")
-            st.markdown(content)
-        elif role == "assistant":
-            st.markdown(f"**AI** ({timestamp}):")
-            st.markdown(content)
+    # 새 응답이 스트리밍되는 영역
+    stream_area = st.empty()
 
     # 사용자 입력 처리
     with st.form(key="chat_form", clear_on_submit=True):
@@ -343,16 +450,17 @@ def inquiry_process_page():
 
         if submit and user_input:
             # 사용자 입력 처리 및 응답 생성
-            get_response(3, user_input)
+            get_response(3, user_input, container=stream_area)
             # 리렌더링
             st.rerun()
 
     if st.button("다음"):
         # 대화 내용 저장
-        conversation = "\n".join([f"{msg['role']} ({msg.get('timestamp', 'N/A')}): {msg['content']}" for msg in st.session_state["messages"]])
+        conversation = format_transcript(st.session_state["messages"])
         update_table("conversation4", conversation)
         st.session_state.step = "overall"
         st.session_state.all.append(st.session_state["messages"])
+        start_feedback_job(3, st.session_state["messages"])
         st.session_state["messages"] = []
         st.rerun()    
 
@@ -388,36 +496,81 @@ tools = [
     }
 ]
 
-def get_feedback(index):
-    try:
-        message = [{"role": "system", "content": "너는 물리 분야 탐구를 위한 튜터야."}]
-        con_en = ['problem', 'hypothesis', 'theory', 'process']
-        con_kr = ['질문', '가설', '이론', '과정']
-        
-        prompt = "다음은 학습자가 작성한 탐구 내용에 대한 피드백에 관한 대화 기록이야:\n"
-        prompt += f"이에 대해 {con_kr[index]}에 대한 인공지능과 사용자의 대화 내용은 다음과 같아:\n"
-        prompt += f"{con_kr[index]}: {st.session_state.all[index]}\n"
-        prompt += f"이 내용을 토대로 {con_kr[index]}에 대한 검토 의견을 정리해서 제공해 줘. 한글로 대답해."
-        
-        message.append({"role": "user", "content": prompt})
-        
-        print("Calling feedback message.")
-        
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=message,
-        )
-        
-        print(response)
-        answer = response.choices[0].message.content
-        
-        return answer
+# 피드백 요청을 동시에 처리하는 작업 스레드 수 (모든 세션 공유)
+FEEDBACK_WORKERS = int(os.getenv("FEEDBACK_WORKERS", "8"))
 
-    except Exception as e:
-        st.error(f"AI 피드백을 불러오는 중 오류가 발생했습니다: {e}")
-        st.session_state.feedback = None  # 에러 발생 시 피드백 초기화
-        return None
+feedback_keys = ["sum_problem", "sum_hypothesis", "sum_theory", "sum_process"]
+feedback_titles = ["탐구 문제 피드백", "가설 피드백", "배경이론 피드백", "탐구 과정 피드백"]
+
+# 모든 세션이 공유하는 피드백 작업 풀 (동시 요청 수 제한)
+@st.cache_resource
+def get_feedback_executor():
+    return ThreadPoolExecutor(max_workers=FEEDBACK_WORKERS, thread_name_prefix="feedback")
+
+# 세션 상태에 접근하지 않으므로 작업 스레드에서 호출 가능
+def request_feedback(index, conversation):
+    message = [{"role": "system", "content": "너는 물리 분야 탐구를 위한 튜터야."}]
+    con_kr = ['질문', '가설', '이론', '과정']
+
+    prompt = "다음은 학습자가 작성한 탐구 내용에 대한 피드백에 관한 대화 기록이야:\n"
+    prompt += f"이에 대해 {con_kr[index]}에 대한 인공지능과 사용자의 대화 내용은 다음과 같아:\n"
+    prompt += f"{con_kr[index]}: {conversation}\n"
+    prompt += f"이 내용을 토대로 {con_kr[index]}에 대한 검토 의견을 정리해서 제공해 줘. 한글로 대답해."
+
+    message.append({"role": "user", "content": prompt})
+
+    print("Calling feedback message.")
+
+    response = create_chat_completion(
+        app="inquiry",
+        model="gpt-4o",
+        messages=message,
+    )
+
+    print(response)
+    return response.choices[0].message.content
+
+# 단계의 대화가 저장되면 다음 단계를 진행하는 동안 해당 단계의 피드백을 백그라운드에서 생성
+def start_feedback_job(index, conversation):
+    if "feedback_jobs" not in st.session_state:
+        st.session_state.feedback_jobs = {}
+    st.session_state.feedback_jobs[index] = get_feedback_executor().submit(request_feedback, index, conversation)
+
+# 4개 단계의 피드백을 모아서 완료되는 순서대로 container에 출력
+# 미리 시작된 작업은 결과만 읽고, 작업이 없거나 실패했거나 refresh=True이면 새로 요청
+def load_all_feedback(container, refresh=False):
+    conversations = st.session_state.all
+    jobs = st.session_state.get("feedback_jobs", {})
+
+    with container:
+        placeholders = [st.empty() for _ in feedback_keys]
+    for title, placeholder in zip(feedback_titles, placeholders):
+        placeholder.info(f"{title} 생성 중...")
+
+    futures = {}
+    for i in range(len(feedback_keys)):
+        future = jobs.get(i)
+        if refresh or future is None or (future.done() and future.exception() is not None):
+            start_feedback_job(i, conversations[i])
+            future = st.session_state.feedback_jobs[i]
+        futures[future] = i
+
+    for future in as_completed(futures):
+        i = futures[future]
+        try:
+            result = future.result()
+            placeholders[i].markdown(f"**{feedback_titles[i]}**\n\n{result}")
+        except Exception as e:
+            print(f"Feedback {i} failed: {e}")
+            result = None
+            placeholders[i].error(f"AI 피드백을 불러오는 중 오류가 발생했습니다: {e}")
+        st.session_state[feedback_keys[i]] = result
+
+    # 완성된 피드백은 요약 영역에 다시 출력되므로 진행 상황 표시는 비움
+    for placeholder in placeholders:
+        placeholder.empty()
+
+    st.session_state.summary = True
 
 # 이메일 전송 함수 (HTML 지원)
 def send_email(to_email, name, subject, body_markdown):
@@ -457,22 +610,13 @@ def send_email(to_email, name, subject, body_markdown):
         
 def overall_page():
     st.title("총평 및 피드백")
-    
+
+    # 피드백 생성 진행 상황을 보여주는 영역
+    progress_area = st.container()
+
     # 페이지가 로드될 때 자동으로 피드백 요청
     if "summary" not in st.session_state:
-        items = []
-        
-        for i in range(4):
-            result = get_feedback(i)
-            if result is None:
-                result = get_feedback(i)
-            items.append(result)
-        
-        st.session_state.sum_problem = items[0]
-        st.session_state.sum_hypothesis = items[1]
-        st.session_state.sum_theory = items[2]
-        st.session_state.sum_process = items[3]
-        st.session_state.summary = True   
+        load_all_feedback(progress_area)
 
     if st.session_state.summary:
         is_error = False
@@ -535,27 +679,17 @@ def overall_page():
 
         with col2:
             if st.button("새로 고침"):
-                items = []
-                
-                for i in range(4):
-                    result = get_feedback(i)
-                    if result is None:
-                        result = get_feedback(i)
-                    items.append(result)
-                
-                st.session_state.sum_problem = items[0]
-                st.session_state.sum_hypothesis = items[1]
-                st.session_state.sum_theory = items[2]
-                st.session_state.sum_process = items[3]
-                st.session_state.summary = True
+                load_all_feedback(progress_area, refresh=True)
                 st.rerun()
 
         with col3:
             if st.button("다음"):
-                update_table("advice1", st.session_state.sum_problem)
-                update_table("advice2", st.session_state.sum_hypothesis)
-                update_table("advice3", st.session_state.sum_theory)
-                update_table("advice4", st.session_state.sum_process)                
+                update_record({
+                    "advice1": st.session_state.sum_problem,
+                    "advice2": st.session_state.sum_hypothesis,
+                    "advice3": st.session_state.sum_theory,
+                    "advice4": st.session_state.sum_process,
+                })
 
                 st.session_state.step = "feedback"
                 st.rerun()
@@ -642,9 +776,9 @@ def feedback_page():
     feedbacks.append(st.text_area("26. 여러분들이 교사가 되었을 때, 학생들의 탐구 설계 활동에 인공지능을 활용한다면 어떤 방법으로 하면 좋을지, 그 방법과 그렇게 생각한 이유를 적어주세요."))
     
     if st.button("제출"):
-        for i in range(26):
-            update_table(f"feedback{i+1}", feedbacks[i])
-        st.success("피드백이 제출되었습니다.")
+        # 26개 문항을 한 번에 저장
+        if save_survey(feedbacks):
+            st.success("피드백이 제출되었습니다.")
 
 # 파일 업로드 후 데이터를 MySQL에 저장하는 페이지
 def upload_page():
@@ -0,0 +1,64 @@
+import os
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# AI 역량 평가(ai_test.py) 문항 은행
+# CSV를 프로세스에서 한 번만 읽어서 선택지 분리, 정답, 영역 번호, 그림 파일 내용을 미리 준비
+# 화면이 다시 실행될 때는 문항 번호로 꺼내 쓰기만 함
+QUESTIONS_CSV = "ai_test_update.csv"
+IMAGE_DIR = "images"
+
+# 선택지 마지막에 붙이는 무응답 항목 (응답 번호 0으로 저장)
+UNKNOWN_CHOICE = "⑤ 모르겠음"
+
+domains = ('인공지능 소양', '인공지능 이해', '데이터의 이해', '인공지능의 활용')
+
+# number: 문항 번호(1부터), choices: 선택지 튜플(무응답 포함), figure: 그림 파일 내용(bytes) 또는 None
+# domain_index: domains에서의 위치 (없는 영역이면 -1)
+Item = namedtuple("Item", ["number", "problem", "choices", "figure", "answer", "domain", "domain_index"])
+
+class ItemBank:
+    """읽기 전용 문항 모음. items[i]는 i+1번 문항, table은 CSV 원본 표 (채점 화면의 피드백 생성용, 복사해서 사용)"""
+    def __init__(self, items, table=None):
+        self.items = tuple(items)
+        self.table = table
+        self.answer_key = np.array([item.answer for item in self.items])
+        self.domain_index = np.array([item.domain_index for item in self.items])
+        # 여러 세션(스레드)이 함께 쓰므로 배열도 수정할 수 없도록 설정
+        self.answer_key.setflags(write=False)
+        self.domain_index.setflags(write=False)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+def parse_choices(text):
+    choices = [choice.strip() for choice in str(text).split('\n') if choice.strip()]
+    choices.append(UNKNOWN_CHOICE)
+    return tuple(choices)
+
+def read_figure(name, image_dir):
+    if image_dir is None or pd.isna(name):
+        return None
+    with open(os.path.join(image_dir, name), "rb") as f:
+        return f.read()
+
+def load_item_bank(path=QUESTIONS_CSV, image_dir=IMAGE_DIR):
+    """image_dir=None이면 그림 파일은 읽지 않음 (정답과 영역만 필요한 채점용)"""
+    questions = pd.read_csv(path)
+    items = []
+    for number, question in enumerate(questions.itertuples(index=False), start=1):
+        domain = question.Domain
+        items.append(Item(
+            number=number,
+            problem=question.Problem,
+            choices=parse_choices(question.Choice),
+            figure=read_figure(question.Figure, image_dir),
+            answer=int(question.Answer),
+            domain=domain,
+            domain_index=domains.index(domain) if domain in domains else -1,
+        ))
+    return ItemBank(items, questions)
@@ -0,0 +1,66 @@
+# 문항별 응답을 한 행씩 저장하는 long 형식 테이블 (item_responses)
+# ai_assessment_results(q1~q40/t1~t40/a1~a40), thermal_init(q1~q11/t1~t11/correct/feed),
+# inquiry_talk(feedback1~26 설문)의 넓은 열 대신 (assessment, record_id, item_id) 한 행에 응답, 시간, 점수를 저장
+# 기존 넓은 형식은 sql/create_item_responses.sql의 호환 뷰(*_wide, inquiry_talk_survey)로 조회
+# 새로 저장하는 기록은 기존 테이블의 q*/t*/a*, correct/feed, feedback* 열을 NULL로 남기므로
+# 문항별 응답을 읽는 코드는 기존 테이블 대신 반드시 호환 뷰나 item_responses를 조회해야 함
+ASSESSMENTS = {"ai_assessment_results": 40, "thermal_init": 11, "inquiry_talk": 26}
+
+# 응답과 시간 저장 (같은 문항을 다시 저장하면 덮어씀)
+save_responses_query = """
+INSERT INTO item_responses (assessment, record_id, item_id, answer, time_ms)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE answer = VALUES(answer), time_ms = VALUES(time_ms)
+"""
+
+# 채점 결과 저장 (문항별 점수와 피드백)
+save_scores_query = """
+INSERT INTO item_responses (assessment, record_id, item_id, score, feedback)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE score = VALUES(score), feedback = VALUES(feedback)
+"""
+
+# 기존 열을 옮길 때(migrate_item_responses.py) 사용: 비어 있는 값만 채우고 이미 저장된 값은 유지
+# (마이그레이션 전에 채점해서 점수만 있는 행에는 응답을 채우고, 새로 채점한 점수는 옛 값으로 덮어쓰지 않음)
+fill_responses_query = """
+INSERT INTO item_responses (assessment, record_id, item_id, answer, time_ms)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE answer = IFNULL(answer, VALUES(answer)), time_ms = IFNULL(time_ms, VALUES(time_ms))
+"""
+
+fill_scores_query = """
+INSERT INTO item_responses (assessment, record_id, item_id, score, feedback)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE score = IFNULL(score, VALUES(score)), feedback = IFNULL(feedback, VALUES(feedback))
+"""
+
+def to_ms(seconds):
+    """초 단위 응답 시간을 밀리초로 변환 (측정하지 않은 문항(-1 등)은 NULL)"""
+    if seconds is None or seconds < 0:
+        return None
+    return int(round(seconds * 1000))
+
+def response_rows(assessment, record_id, answers, times=None):
+    """answers[i], times[i]를 item_id i+1의 행으로 변환"""
+    times = times if times is not None else [None] * len(answers)
+    return [
+        (assessment, record_id, item_id, None if answer is None else str(answer), to_ms(seconds))
+        for item_id, (answer, seconds) in enumerate(zip(answers, times), start=1)
+    ]
+
+def save_responses(cursor, assessment, record_id, answers, times=None, fill=False):
+    """
+    문항별 응답을 한 번에 저장. 호출한 쪽의 커서를 사용하므로 기록(헤더) 행과 같은 트랜잭션에서 커밋됨.
+    executemany의 INSERT는 여러 행을 한 문장으로 보냄. fill=True이면 비어 있는 값만 채움
+    """
+    query = fill_responses_query if fill else save_responses_query
+    cursor.executemany(query, response_rows(assessment, record_id, answers, times))
+
+def save_scores(cursor, assessment, record_id, scores, feedback=None, fill=False):
+    """문항별 점수(와 피드백)를 한 번에 저장. fill=True이면 비어 있는 값만 채움"""
+    feedback = feedback if feedback is not None else [None] * len(scores)
+    rows = [
+        (assessment, record_id, item_id, score, item_feedback)
+        for item_id, (score, item_feedback) in enumerate(zip(scores, feedback), start=1)
+    ]
+    cursor.executemany(fill_scores_query if fill else save_scores_query, rows)
@@ -0,0 +1,83 @@
+import re
+from functools import lru_cache
+import streamlit as st
+
+# 문항, 답변, 대화 메시지에서 LaTeX 수식과 일반 텍스트를 구분하는 공통 토크나이저
+# $$ ... $$, \[ ... \]: 블록 수식 / $ ... $, \( ... \): 문장 안 수식 / \$: 글자 그대로의 달러 기호
+# 여는 기호를 찾은 뒤 닫는 기호를 str.find로 찾고, 닫는 기호가 더 이상 없는 종류는 다시 찾지 않으므로
+# 입력 길이에 비례하는 시간 안에 끝남 (닫히지 않은 기호가 많아도 느려지지 않음)
+SEGMENT_CACHE_SIZE = 4096
+
+openers = re.compile(r'\\\$|\$\$|\$|\\\[|\\\(')
+
+# 여는 기호: (닫는 기호, 종류)
+closers = {
+    "$$": ("$$", "display"),
+    "\\[": ("\\]", "display"),
+    "$": ("$", "inline"),
+    "\\(": ("\\)", "inline"),
+}
+
+def find_closer(text, closer, start):
+    """start부터 closer 위치를 찾음 (\\$처럼 이스케이프된 기호는 건너뜀)"""
+    end = text.find(closer, start)
+    while end > 0 and text[end - 1] == "\\" and closer[0] == "$":
+        end = text.find(closer, end + 1)
+    return end
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segment(text):
+    """
+    text를 ("text", 문자열) / ("inline", 수식) / ("display", 수식) 튜플로 나눔.
+    같은 문자열은 캐시된 결과를 그대로 반환.
+    """
+    segments = []
+    exhausted = set()  # 닫는 기호가 남아 있지 않은 여는 기호
+    pending = 0  # 아직 segments에 넣지 않은 일반 텍스트의 시작 위치
+    search = 0
+    while True:
+        match = openers.search(text, search)
+        if match is None:
+            break
+        opener = match.group()
+        search = match.end()
+        if opener == "\\$" or opener in exhausted:
+            continue
+
+        closer, kind = closers[opener]
+        end = find_closer(text, closer, match.end())
+        if end == -1:
+            exhausted.add(opener)
+            continue
+        body = text[match.end():end].strip()
+        if not body:
+            continue
+
+        if match.start() > pending:
+            segments.append(("text", text[pending:match.start()]))
+        segments.append((kind, body))
+        pending = search = end + len(closer)
+
+    if pending < len(text):
+        segments.append(("text", text[pending:]))
+    return tuple(segments)
+
+def to_markdown(segments):
+    """세그먼트를 st.markdown 한 번으로 출력할 수 있는 문자열로 합침 (수식은 Markdown의 $, $$ 수식으로 변환)"""
+    parts = []
+    for kind, body in segments:
+        if kind == "display":
+            parts.append(f"\n\n$$\n{body}\n$$\n\n")
+        elif kind == "inline":
+            parts.append(f"${body}$")
+        else:
+            parts.append(body)
+    return "".join(parts)
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def latex_markdown(text):
+    return to_markdown(segment(text))
+
+def render_text(text):
+    """LaTeX 수식이 섞인 텍스트 출력"""
+    st.markdown(latex_markdown(text))
@@ -0,0 +1,93 @@
+import streamlit as st
+from datetime import datetime, time as dt_time
+from db_pool import db_cursor
+
+# 관리자 화면(eval_ai, eval_inquiry)의 학습자 목록
+# 전체 행을 매번 가져오지 않고 (date, id) 순서의 키셋 페이지 단위로 조회
+# 이름/이메일은 앞부분 일치(LIKE 'x%')로 검색해서 sql/add_learner_list_indexes.sql의 인덱스를 사용
+# 조회 결과는 캐시하고, 테이블의 MAX(id)가 바뀌면(새 학습자 추가) 캐시 키가 달라져 다시 조회
+PAGE_SIZE = 50
+
+# 목록을 조회할 수 있는 테이블 (쿼리에 테이블 이름을 직접 넣으므로 이 목록으로 제한)
+LEARNER_TABLES = ("ai_assessment_results", "inquiry_talk")
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def latest_id(table):
+    """새 학습자가 추가되었는지 확인하는 값 (기본 키의 최댓값이므로 인덱스만 읽음)"""
+    with db_cursor() as cursor:
+        cursor.execute(f"SELECT MAX(id) FROM {table}")
+        return cursor.fetchone()[0]
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_page(table, latest, name="", email="", date_from=None, date_to=None, after=None, limit=PAGE_SIZE):
+    """
+    필터에 맞는 학습자를 (date, id) 순서로 after 다음부터 limit개 조회.
+    다음 페이지가 있는지 알기 위해 한 개를 더 가져옴. latest는 캐시 무효화용 키.
+    """
+    if table not in LEARNER_TABLES:
+        raise ValueError(f"Unknown learner table: {table}")
+
+    conditions, params = [], []
+    if name:
+        conditions.append("name LIKE %s")
+        params.append(escape_like(name) + "%")
+    if email:
+        conditions.append("email LIKE %s")
+        params.append(escape_like(email) + "%")
+    if date_from:
+        conditions.append("date >= %s")
+        params.append(datetime.combine(date_from, dt_time.min))
+    if date_to:
+        conditions.append("date <= %s")
+        params.append(datetime.combine(date_to, dt_time.max))
+    if after:
+        conditions.append("(date > %s OR (date = %s AND id > %s))")
+        params.extend((after[0], after[0], after[1]))
+
+    query = f"SELECT id, name, email, date FROM {table}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY date, id LIMIT %s"
+    params.append(limit + 1)
+
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+    return rows[:limit], len(rows) > limit
+
+def select_learner(table, label, format_learner, key):
+    """필터와 이전/다음 버튼이 있는 학습자 선택 상자. 선택한 학습자(id, name, email, date)를 반환"""
+    col_name, col_email, col_from, col_to = st.columns(4)
+    name = col_name.text_input("이름", key=f"{key}_name").strip()
+    email = col_email.text_input("이메일", key=f"{key}_email").strip()
+    date_from = col_from.date_input("시작일", value=None, key=f"{key}_from")
+    date_to = col_to.date_input("종료일", value=None, key=f"{key}_to")
+
+    # 필터가 바뀌면 첫 페이지부터 다시 조회
+    # 페이지마다 시작 위치(앞 페이지 마지막 학습자의 (date, id))를 쌓아 두고 이전 버튼에서 꺼냄
+    filters = (name, email, date_from, date_to)
+    pages_key = f"{key}_pages"
+    if st.session_state.get(f"{key}_filters") != filters:
+        st.session_state[f"{key}_filters"] = filters
+        st.session_state[pages_key] = [None]
+    pages = st.session_state[pages_key]
+
+    learners, has_next = fetch_page(table, latest_id(table), *filters, after=pages[-1])
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    if col_prev.button("이전", key=f"{key}_prev", disabled=len(pages) == 1):
+        pages.pop()
+        st.rerun()
+    col_page.write(f"{len(pages)} 페이지")
+    if col_next.button("다음", key=f"{key}_next", disabled=not has_next):
+        last = learners[-1]
+        pages.append((last["date"], last["id"]))
+        st.rerun()
+
+    if not learners:
+        return None
+    # 선택 상자는 페이지(옵션)가 바뀌면 새 위젯이 되어 첫 번째 학습자가 선택됨
+    index = st.selectbox(label, range(len(learners)), format_func=lambda i: format_learner(learners[i]))
+    return learners[index]
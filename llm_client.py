@@ -0,0 +1,348 @@
+import csv
+import os
+import random
+import threading
+import time
+import httpx
+import openai
+from datetime import datetime
+from dotenv import load_dotenv
+from openai import OpenAI
+
+# .env 파일을 로드
+load_dotenv()
+
+# 타임아웃 및 연결 풀 설정 (환경 변수로 조정 가능)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))  # 응답 대기 시간(초)
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))  # 연결 수립 시간(초)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))  # 최대 동시 연결 수
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))  # 유지할 keep-alive 연결 수
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))  # 유휴 연결 유지 시간(초)
+
+_client = None
+_client_lock = threading.Lock()
+
+def create_client(api_key=None, base_url=None, max_connections=None, max_keepalive=None, timeout=None):
+    """연결 풀을 갖는 새로운 OpenAI 클라이언트 생성"""
+    limits = httpx.Limits(
+        max_connections=max_connections or OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=max_keepalive or OPENAI_MAX_KEEPALIVE,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(timeout or OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+    http_client = httpx.Client(limits=limits, timeout=timeout)
+
+    return OpenAI(
+        api_key=api_key or os.getenv('OPENAI_API_KEY'),
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=0,  # 재시도는 create_chat_completion에서 처리
+        http_client=http_client,
+    )
+
+def get_client():
+    """프로세스 전체에서 공유하는 OpenAI 클라이언트 반환 (최초 호출 시 생성)"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+
+    return _client
+
+def close_client():
+    """공유 클라이언트의 연결 풀을 닫음"""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+# 동시 요청 수 및 분당 요청/토큰 수 제한 (프로세스 안의 모든 세션이 공유, 0이면 제한 없음)
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "0"))  # 분당 최대 요청 수
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "0"))  # 분당 최대 토큰 수
+OPENAI_EXPECTED_COMPLETION = int(os.getenv("OPENAI_EXPECTED_COMPLETION", "500"))  # 요청 전 예상하는 응답 토큰 수
+
+def estimate_tokens(messages, max_tokens=None):
+    """요청 전에 토큰 수를 대략 추정 (한글은 한 글자에 한 토큰, 영문은 네 글자에 한 토큰 정도)"""
+    text = "".join(str(m.get("content") or "") for m in messages or [])
+    prompt_tokens = int(sum(1 if ord(ch) > 127 else 0.25 for ch in text))
+    return prompt_tokens + (max_tokens or OPENAI_EXPECTED_COMPLETION)
+
+class RateLimiter:
+    """
+    동시 요청 수와 분당 요청/토큰 수를 제한하는 토큰 버킷.
+    먼저 기다리기 시작한 요청이 먼저 보내지도록 번호표 순서대로 처리.
+    """
+    def __init__(self, max_concurrency=0, rpm=0, tpm=0):
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._in_flight = 0
+        self.configure(max_concurrency, rpm, tpm)
+
+        # 대기 시간 통계
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def configure(self, max_concurrency=None, rpm=None, tpm=None):
+        with self._cond:
+            if max_concurrency is not None:
+                self.max_concurrency = max_concurrency
+            if rpm is not None:
+                self.rpm = rpm
+                self._requests = float(rpm)
+            if tpm is not None:
+                self.tpm = tpm
+                self._tokens = float(tpm)
+            self._updated = time.monotonic()
+            self._cond.notify_all()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _delay(self, tokens):
+        """버킷이 찰 때까지 기다려야 하는 시간(초)"""
+        delay = 0.0
+        if self.rpm and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60 / self.rpm)
+        if self.tpm and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60 / self.tpm)
+        return delay
+
+    def acquire(self, tokens=0):
+        """요청을 보낼 수 있을 때까지 기다린 뒤 기다린 시간(초)을 반환"""
+        start = time.monotonic()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            if self.tpm:
+                tokens = min(tokens, self.tpm)  # 한 번에 버킷보다 큰 요청도 언젠가는 보낼 수 있도록
+
+            while True:
+                if ticket == self._serving and (not self.max_concurrency or self._in_flight < self.max_concurrency):
+                    self._refill(time.monotonic())
+                    delay = self._delay(tokens)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+
+            self._take(tokens)
+            self._serving += 1
+            self._cond.notify_all()
+
+            wait = time.monotonic() - start
+            self._waits += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        return wait
+
+    def try_acquire(self, tokens=0):
+        """
+        기다리지 않고 바로 보낼 수 있을 때만 요청 한 건의 자리를 차지하고 True 반환 (미리 생성 같은 낮은 우선순위 요청용).
+        기다리는 요청이 있거나 동시 요청 수, 분당 요청/토큰 수에 여유가 없으면 False.
+        번호표를 받지 않으므로 대화 요청의 대기 순서에 끼어들지 않음
+        """
+        with self._cond:
+            if self._next_ticket != self._serving:
+                return False
+            if self.max_concurrency and self._in_flight >= self.max_concurrency:
+                return False
+            if self.tpm:
+                tokens = min(tokens, self.tpm)
+            self._refill(time.monotonic())
+            if self._delay(tokens) > 0:
+                return False
+            self._take(tokens)
+            return True
+
+    def _take(self, tokens):
+        if self.rpm:
+            self._requests -= 1
+        if self.tpm:
+            self._tokens -= tokens
+        self._in_flight += 1
+
+    def release(self, extra_tokens=0):
+        """요청이 끝나면 호출 (extra_tokens: 실제 사용 토큰 수와 예상값의 차이)"""
+        with self._cond:
+            self._in_flight -= 1
+            if self.tpm:
+                self._tokens -= extra_tokens
+            self._cond.notify_all()
+
+    def report(self):
+        """현재 대기/진행 중인 요청 수와 평균·최대 대기 시간"""
+        with self._cond:
+            return {
+                "queued": self._next_ticket - self._serving,
+                "in_flight": self._in_flight,
+                "requests": self._waits,
+                "avg_wait": self._wait_total / self._waits if self._waits else 0.0,
+                "max_wait": self._wait_max,
+            }
+
+limiter = RateLimiter(OPENAI_MAX_CONCURRENCY, OPENAI_RPM, OPENAI_TPM)
+
+def configure_limiter(max_concurrency=None, rpm=None, tpm=None):
+    """공유 제한값 변경 (None인 항목은 그대로 유지)"""
+    limiter.configure(max_concurrency, rpm, tpm)
+
+def limiter_report():
+    return limiter.report()
+
+# 재시도 설정 (429/5xx 등 일시적인 오류에 대해 지터를 준 지수 백오프로 재시도)
+OPENAI_RETRIES = int(os.getenv("OPENAI_RETRIES", "3"))
+OPENAI_BACKOFF = float(os.getenv("OPENAI_BACKOFF", "1.0"))  # 첫 재시도 최대 대기 시간(초)
+
+RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+class LimiterBusy(Exception):
+    """제한값에 여유가 없어 보내지 않은 낮은 우선순위 요청"""
+
+def retry_delay(error, attempt, backoff):
+    """Retry-After 헤더가 있으면 그 값을, 없으면 0 ~ backoff * 2^attempt 사이의 임의 시간"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return random.uniform(0, backoff * (2 ** attempt))
+
+def send_request(create, kwargs, retries, backoff, low_priority=False):
+    """
+    제한값 안에서 요청을 보내고 일시적인 오류는 재시도 (반환값: 응답, 예상 토큰 수)
+    low_priority: 기다리지 않고, 바로 보낼 여유가 없으면 LimiterBusy 발생
+    """
+    tokens = estimate_tokens(kwargs.get("messages"), kwargs.get("max_tokens"))
+
+    for attempt in range(retries + 1):
+        if low_priority:
+            if not limiter.try_acquire(tokens):
+                raise LimiterBusy("OpenAI limiter is busy; low-priority request skipped")
+        else:
+            wait = limiter.acquire(tokens)
+            if wait > 1:
+                print(f"OpenAI request queued for {wait:.1f}s ({limiter.report()['queued']} still waiting)")
+        try:
+            return create(**kwargs), tokens
+        except RETRYABLE_ERRORS as e:
+            limiter.release()
+            if attempt == retries:
+                raise
+            delay = retry_delay(e, attempt, backoff)
+            print(f"OpenAI request failed ({e}), retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+        except Exception:
+            limiter.release()
+            raise
+
+def used_tokens(usage, tokens):
+    return usage.total_tokens - tokens if usage is not None else 0
+
+def create_chat_completion(retries=None, backoff=None, client=None, app="default", low_priority=False, **kwargs):
+    """
+    chat.completions.create 호출 (공유 제한값을 지키고, 일시적인 오류 발생 시 재시도)
+    low_priority=True이면 다른 요청을 기다리게 하지 않도록 여유가 있을 때만 보내고, 없으면 LimiterBusy 발생
+    """
+    client = client or get_client()
+    retries = OPENAI_RETRIES if retries is None else retries
+    backoff = OPENAI_BACKOFF if backoff is None else backoff
+
+    start = time.perf_counter()
+    response, tokens = send_request(client.chat.completions.create, kwargs, retries, backoff, low_priority)
+    limiter.release(used_tokens(response.usage, tokens))
+    record_usage(app, kwargs.get("model"), response.usage, time.perf_counter() - start)
+    return response
+
+def stream_chat_completion(messages, model="gpt-4o", client=None, app="default"):
+    """응답 토큰을 서버에서 도착하는 대로 하나씩 반환하는 제너레이터"""
+    client = client or get_client()
+    start = time.perf_counter()
+    kwargs = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
+        "stream_options": {"include_usage": True},  # 마지막 청크에 사용량 포함
+    }
+    # 첫 응답을 받기 전의 오류만 재시도 (이미 화면에 출력한 토큰은 되돌릴 수 없음)
+    stream, tokens = send_request(client.chat.completions.create, kwargs, OPENAI_RETRIES, OPENAI_BACKOFF)
+
+    usage = None
+    try:
+        for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        limiter.release(used_tokens(usage, tokens))
+
+    record_usage(app, model, usage, time.perf_counter() - start)
+
+# 프롬프트 캐시 사용량 기록 (LLM_USAGE_LOG에 CSV 경로를 지정하면 파일에도 기록)
+LLM_USAGE_LOG = os.getenv("LLM_USAGE_LOG", "")
+# 요청마다 [usage] 줄을 출력할지 여부 (기본: CSV 파일에 기록하지 않을 때만 출력)
+LLM_USAGE_PRINT = os.getenv("LLM_USAGE_PRINT", "0" if LLM_USAGE_LOG else "1") == "1"
+USAGE_COLUMNS = ["time", "app", "model", "prompt_tokens", "cached_tokens", "completion_tokens", "latency"]
+
+_usage = {}
+_usage_lock = threading.Lock()
+
+def record_usage(app, model, usage, latency):
+    """요청 한 건의 토큰 사용량과 캐시된 프롬프트 토큰 수(prompt_tokens_details.cached_tokens) 기록"""
+    if usage is None:
+        return
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+    row = [datetime.now().strftime("%Y-%m-%d %H:%M:%S"), app, model,
+           usage.prompt_tokens, cached_tokens, usage.completion_tokens, round(latency, 3)]
+
+    with _usage_lock:
+        stats = _usage.setdefault(app, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0,
+                                        "cached_calls": 0, "cached_latency": 0.0, "uncached_latency": 0.0})
+        stats["calls"] += 1
+        stats["prompt_tokens"] += usage.prompt_tokens
+        stats["cached_tokens"] += cached_tokens
+        if cached_tokens:
+            stats["cached_calls"] += 1
+            stats["cached_latency"] += latency
+        else:
+            stats["uncached_latency"] += latency
+
+        if LLM_USAGE_LOG:
+            is_new = not os.path.exists(LLM_USAGE_LOG)
+            with open(LLM_USAGE_LOG, "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if is_new:
+                    writer.writerow(USAGE_COLUMNS)
+                writer.writerow(row)
+
+    if LLM_USAGE_PRINT:
+        print(f"[usage] {app}: prompt {usage.prompt_tokens}, cached {cached_tokens}, latency {latency:.2f}s")
+
+def usage_report():
+    """앱별 호출 수, 캐시 적중률(캐시된 프롬프트 토큰 비율), 캐시 적중/미적중 평균 지연 시간"""
+    report = {}
+    with _usage_lock:
+        for app, stats in _usage.items():
+            uncached_calls = stats["calls"] - stats["cached_calls"]
+            report[app] = {
+                "calls": stats["calls"],
+                "hit_rate": stats["cached_tokens"] / stats["prompt_tokens"] if stats["prompt_tokens"] else 0.0,
+                "cached_latency": stats["cached_latency"] / stats["cached_calls"] if stats["cached_calls"] else None,
+                "uncached_latency": stats["uncached_latency"] / uncached_calls if uncached_calls else None,
+            }
+    return report
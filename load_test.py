@@ -0,0 +1,234 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+import mysql.connector
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from streamlit.testing.v1 import AppTest
+
+import mock_llm_server
+
+# 모의 LLM 서버를 띄우고 N명의 가상 학생이 inquiry.py 전체 흐름을 동시에 진행하는 부하 테스트
+# start → upload → 탐구 4단계 → overall → feedback 순서로 진행하며 페이지별 지연 시간을 측정
+# AppTest는 전역 상태(Runtime, 설정 등)를 사용하므로 학생마다 별도 프로세스에서 실행
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inquiry.py")
+
+# PDF 파싱(Upstage API) 대신 세션에 직접 넣는 탐구 계획서 내용
+PLAN = {
+    "problem": "자석 막대가 회전하는 강자성체 막대를 타고 올라가는 속도는 회전 속도에 따라 어떻게 달라지는가?",
+    "hypothesis": "회전 속도가 빠를수록 자석 막대가 올라가는 속도도 빨라질 것이다.",
+    "theory": "자석과 강자성체 사이의 마찰력과 자기력, 회전 운동에 의한 접촉점의 미끄러짐",
+    "apparatus": "네오디뮴 자석, 철 막대, 모터, 초시계, 자",
+    "process": "모터의 회전 속도를 바꾸어 가며 자석 막대가 10 cm 올라가는 데 걸리는 시간을 측정한다.",
+}
+
+STAGES = ["problem", "hypothesis", "theory", "process"]
+
+class LoadStats:
+    def __init__(self):
+        self.timings = {}
+        self.db_writes = {"INSERT": 0, "UPDATE": 0}
+        self.errors = []
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def record(self, page, seconds):
+        with self._lock:
+            self.timings.setdefault(page, []).append(seconds)
+
+    def count_write(self, query):
+        verb = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        if verb in self.db_writes:
+            with self._lock:
+                self.db_writes[verb] += 1
+
+    def fail(self, student, error):
+        with self._lock:
+            self.errors.append(f"student {student}: {error}")
+
+    def finish(self):
+        with self._lock:
+            self.completed += 1
+
+    def merge(self, other):
+        """다른 프로세스에서 수집한 결과(to_dict)를 합침"""
+        for page, values in other["timings"].items():
+            self.timings.setdefault(page, []).extend(values)
+        for verb, count in other["db_writes"].items():
+            self.db_writes[verb] += count
+        self.errors += other["errors"]
+        self.completed += other["completed"]
+
+    def to_dict(self):
+        # AppTest가 __main__을 바꾸므로 프로세스 간에는 클래스 대신 dict로 전달
+        return {"timings": self.timings, "db_writes": self.db_writes,
+                "errors": self.errors, "completed": self.completed}
+
+def percentile(values, p):
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, int(round(p / 100 * len(values))) - 1))
+    return values[index]
+
+def install_fake_db(stats):
+    """MySQL 없이 실행할 때 사용하는 메모리 내 가짜 DB (쓰기 횟수만 기록)"""
+    next_id = iter(range(1, 10 ** 9))
+    id_lock = threading.Lock()
+
+    class FakeCursor:
+        lastrowid = None
+
+        def execute(self, query, params=None):
+            stats.count_write(query)
+            with id_lock:
+                self.lastrowid = next(next_id)
+
+        def executemany(self, query, seq_params):
+            self.execute(query)
+
+        def fetchone(self):
+            return None
+
+        def fetchall(self):
+            return []
+
+        def close(self):
+            pass
+
+    class FakeConnection:
+        in_transaction = False
+
+        def cursor(self, *args, **kwargs):
+            return FakeCursor()
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+        def is_connected(self):
+            return True
+
+        def ping(self, *args, **kwargs):
+            pass
+
+        def close(self):
+            pass
+
+    mysql.connector.connect = lambda *args, **kwargs: FakeConnection()
+
+def install_write_counter(stats):
+    """실제 MySQL을 사용할 때 커서의 execute를 감싸서 쓰기 횟수 기록"""
+    from mysql.connector.cursor import MySQLCursor
+    cursor_classes = [MySQLCursor]
+    try:
+        from mysql.connector.cursor_cext import CMySQLCursor
+        cursor_classes.append(CMySQLCursor)
+    except ImportError:
+        pass
+
+    for cls in cursor_classes:
+        original = cls.execute
+
+        def execute(self, operation, params=None, *args, _original=original, **kwargs):
+            stats.count_write(operation)
+            return _original(self, operation, params, *args, **kwargs)
+
+        cls.execute = execute
+
+def find_button(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"'{label}' button not found on {at.session_state['step']} page")
+
+def timed_run(stats, page, action):
+    start = time.perf_counter()
+    at = action()
+    stats.record(page, time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+
+def run_student(number, turns, timeout, real_db):
+    """가상 학생 한 명이 처음부터 설문 제출까지 진행하고 측정 결과를 반환 (별도 프로세스에서 실행)"""
+    stats = LoadStats()
+    if real_db:
+        install_write_counter(stats)
+    else:
+        install_fake_db(stats)
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        timed_run(stats, "start", at.run)
+
+        at.text_input[0].input(f"2024{number:04d}")
+        at.text_input[1].input(f"student{number}")
+        at.text_input[2].input(f"student{number}@example.com")
+        timed_run(stats, "disclaimer", find_button(at, "확인").click().run)
+        timed_run(stats, "upload", find_button(at, "동의").click().run)
+
+        for key, value in PLAN.items():
+            at.session_state[key] = value
+
+        for stage in STAGES:
+            # 이전 단계의 "다음"을 누르면 새 단계의 첫 인사까지 생성됨
+            timed_run(stats, stage, find_button(at, "다음").click().run)
+            for turn in range(turns):
+                at.text_area(key="user_input").input(f"{stage} 단계 {turn + 1}번째 질문입니다.")
+                timed_run(stats, f"{stage} (turn)", find_button(at, "제출").click().run)
+
+        timed_run(stats, "overall", find_button(at, "다음").click().run)
+        timed_run(stats, "feedback", find_button(at, "다음").click().run)
+        timed_run(stats, "feedback (submit)", find_button(at, "제출").click().run)
+        stats.finish()
+    except Exception as e:
+        stats.fail(number, repr(e))
+    return stats.to_dict()
+
+def report(stats, server, elapsed, students):
+    print(f"{'page':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for page, values in stats.timings.items():
+        print(f"{page:<20}{len(values):>7}{percentile(values, 50) * 1000:>10.0f}"
+              f"{percentile(values, 95) * 1000:>10.0f}{percentile(values, 99) * 1000:>10.0f}")
+
+    pages = sum(len(values) for values in stats.timings.values())
+    print()
+    print(f"students completed: {stats.completed}/{students} in {elapsed:.1f}s")
+    print(f"throughput: {stats.completed / elapsed * 60:.1f} students/min, {pages / elapsed:.1f} page runs/s")
+    print(f"DB writes: {stats.db_writes['INSERT']} INSERT, {stats.db_writes['UPDATE']} UPDATE")
+    print(f"LLM requests: {server.requests} ({server.failures} injected failures)")
+    for error in stats.errors:
+        print(f"error - {error}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="inquiry.py 동시 접속 부하 테스트")
+    parser.add_argument("--students", type=int, default=10, help="동시에 진행할 가상 학생 수")
+    parser.add_argument("--turns", type=int, default=3, help="단계별 학생 메시지 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="모의 LLM의 첫 토큰 지연 시간(초)")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="모의 LLM의 초당 토큰 수")
+    parser.add_argument("--answer-tokens", type=int, default=100, help="모의 LLM 응답 길이(토큰 수)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="모의 LLM이 429/500을 반환할 비율")
+    parser.add_argument("--real-db", action="store_true", help="가짜 DB 대신 .env의 MySQL에 기록")
+    parser.add_argument("--timeout", type=float, default=300.0, help="페이지 실행 한 번의 최대 시간(초)")
+    args = parser.parse_args()
+
+    server = mock_llm_server.start_server(latency=args.latency, token_rate=args.token_rate,
+                                          failure_rate=args.failure_rate,
+                                          answer=mock_llm_server.make_answer(args.answer_tokens))
+    os.environ["OPENAI_BASE_URL"] = mock_llm_server.base_url(server)
+    os.environ["OPENAI_API_KEY"] = "mock"
+    # 쓰기 큐의 outbox는 실행마다 임시 폴더에 만듦
+    os.environ.setdefault("WRITE_OUTBOX_DIR", tempfile.mkdtemp(prefix="outbox-"))
+
+    stats = LoadStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.students) as executor:
+        futures = [executor.submit(run_student, number, args.turns, args.timeout, args.real_db)
+                   for number in range(args.students)]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+    elapsed = time.perf_counter() - start
+
+    report(stats, server, elapsed, args.students)
+    server.shutdown()
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime
+from db_pool import db_cursor
+
+# 대화 메시지를 한 줄씩 추가만 하는 저장소 (conversation_messages 테이블)
+# 매 턴마다 전체 대화를 다시 쓰지 않고 새로 생긴 메시지만 INSERT
+# record_table/record_id: 학습 기록이 있는 테이블과 그 id (예: inquiry_talk, paced_learning)
+# stage: 단계 또는 도메인 번호, seq: 세션 안에서 해당 단계의 메시지 순서
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+insert_query = """
+INSERT IGNORE INTO conversation_messages
+(session_id, record_table, record_id, stage, seq, role, content, created_at)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+def new_session_id():
+    """브라우저 세션마다 하나씩 사용하는 id (같은 기록을 이어서 학습해도 seq가 겹치지 않도록 구분)"""
+    return uuid.uuid4().hex
+
+def parse_timestamp(timestamp):
+    try:
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+def append_messages(session_id, record_table, record_id, stage, messages, saved=0, cursor=None):
+    """
+    messages 중 아직 저장하지 않은 메시지(saved번째 이후)만 추가하고, 저장된 메시지 수를 반환.
+    (session_id, stage, seq)가 UNIQUE이므로 같은 메시지를 다시 보내도 중복 저장되지 않음.
+    cursor를 넘기면 그 커서에서 실행 (write_behind.queued_cursor 등).
+    """
+    rows = [
+        (session_id, record_table, record_id, stage, seq,
+         message["role"], message["content"], parse_timestamp(message.get("timestamp")))
+        for seq, message in enumerate(messages[saved:], start=saved)
+    ]
+    if rows and cursor is not None:
+        cursor.executemany(insert_query, rows)
+    elif rows:
+        with db_cursor() as cursor:
+            cursor.executemany(insert_query, rows)
+    return len(messages)
+
+def format_transcript(messages):
+    """기존 conversation 열과 같은 형식의 전체 대화 텍스트"""
+    return "\n".join([f"{msg['role']} ({msg.get('timestamp', 'N/A')}): {msg['content']}" for msg in messages])
+
+def load_messages(record_table, record_id, stage):
+    """저장된 순서대로 메시지 목록을 불러옴"""
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(
+            "SELECT role, content, created_at FROM conversation_messages "
+            "WHERE record_table = %s AND record_id = %s AND stage = %s ORDER BY id",
+            (record_table, record_id, stage),
+        )
+        rows = cursor.fetchall()
+
+    messages = []
+    for row in rows:
+        message = {"role": row["role"], "content": row["content"]}
+        if row["created_at"] is not None:
+            message["timestamp"] = row["created_at"].strftime(TIMESTAMP_FORMAT)
+        messages.append(message)
+    return messages
+
+def load_transcript(record_table, record_id, stage):
+    """관리자 페이지용: 메시지 테이블에서 기존 형식의 대화 텍스트를 다시 만듦"""
+    return format_transcript(load_messages(record_table, record_id, stage))
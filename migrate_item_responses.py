@@ -0,0 +1,148 @@
+import argparse
+import time
+from dotenv import load_dotenv
+from db_pool import db_cursor
+from item_responses import ASSESSMENTS, save_responses, save_scores
+
+# 기존 넓은 형식 열(q1~q40, t1~t40, a1~a40 / q1~q11, t1~t11, correct, feed / feedback1~26)을
+# item_responses 테이블로 옮기는 스크립트
+# id 순서로 batch-size개씩 옮기고 배치마다 커밋하므로, 중단되면 다시 실행해서 남은 행부터 이어서 옮김
+# (이미 item_responses에 응답이 있는 기록은 건너뜀. 기존 열은 삭제하지 않음)
+# 마이그레이션 전에 채점되어 점수만 저장된(answer가 NULL인) 기록은 응답을 채우고, 새로 저장된 점수는 유지
+#
+# 사용 예: python migrate_item_responses.py --create-schema --verify
+
+load_dotenv()
+
+SCHEMA_FILE = "sql/create_item_responses.sql"
+
+# 테이블별로 옮길 열 (응답, 시간, 점수, 피드백)
+LEGACY_COLUMNS = {
+    "ai_assessment_results": {"answer": "q", "time": "t", "score": "a", "feedback": None},
+    "thermal_init": {"answer": "q", "time": "t", "score": "correct", "feedback": "feed"},
+    "inquiry_talk": {"answer": "feedback", "time": None, "score": None, "feedback": None},
+}
+
+def create_schema():
+    """item_responses 테이블과 호환 뷰 생성"""
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        statements = [s.strip() for s in f.read().split(";")]
+    with db_cursor() as cursor:
+        for statement in statements:
+            # 주석만 있는 부분은 건너뜀
+            if any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines()):
+                cursor.execute(statement)
+
+def legacy_values(row, prefix, count):
+    if prefix is None:
+        return None
+    return [row[f"{prefix}{i}"] for i in range(1, count + 1)]
+
+def fetch_batch(table, after_id, batch_size):
+    """
+    아직 옮기지 않았고 기존 열에 응답이 있는 기록을 id 순서로 조회
+    (채점 결과만 저장된 행은 응답을 옮긴 것으로 보지 않음)
+    """
+    columns = LEGACY_COLUMNS[table]
+    query = f"""
+    SELECT * FROM {table} r
+    WHERE r.id > %s AND r.{columns['answer']}1 IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM item_responses i
+                      WHERE i.assessment = %s AND i.record_id = r.id AND i.answer IS NOT NULL)
+    ORDER BY r.id LIMIT %s
+    """
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(query, (after_id, table, batch_size))
+        return cursor.fetchall()
+
+def migrate_table(table, batch_size=500):
+    count = ASSESSMENTS[table]
+    columns = LEGACY_COLUMNS[table]
+    after_id = 0
+    migrated = 0
+
+    while True:
+        rows = fetch_batch(table, after_id, batch_size)
+        if not rows:
+            break
+
+        # 한 배치를 하나의 트랜잭션으로 저장
+        with db_cursor() as cursor:
+            for row in rows:
+                answers = legacy_values(row, columns["answer"], count)
+                save_responses(cursor, table, row["id"], answers, legacy_values(row, columns["time"], count), fill=True)
+
+                scores = legacy_values(row, columns["score"], count)
+                if scores and any(score is not None for score in scores):
+                    save_scores(cursor, table, row["id"], scores, legacy_values(row, columns["feedback"], count), fill=True)
+
+        migrated += len(rows)
+        after_id = rows[-1]["id"]
+        print(f"{table}: {migrated} records migrated (last id {after_id})")
+
+    return migrated
+
+def same_value(legacy, migrated):
+    if legacy is None or migrated is None:
+        return legacy == migrated
+    try:
+        return abs(float(legacy) - float(migrated)) < 0.01
+    except (TypeError, ValueError):
+        return str(legacy) == str(migrated)
+
+def verify_table(table, view, batch_size=500):
+    """기존 열과 호환 뷰의 값을 비교해 다른 기록의 id 목록을 반환"""
+    count = ASSESSMENTS[table]
+    prefixes = [prefix for prefix in LEGACY_COLUMNS[table].values() if prefix]
+    names = [f"{prefix}{i}" for prefix in prefixes for i in range(1, count + 1)]
+    legacy_select = ", ".join(f"r.{name}" for name in names)
+    view_select = ", ".join(f"v.{name} AS new_{name}" for name in names)
+    query = f"""
+    SELECT r.id, {legacy_select}, {view_select}
+    FROM {table} r JOIN {view} v ON v.id = r.id
+    WHERE r.id > %s AND r.{prefixes[0]}1 IS NOT NULL
+    ORDER BY r.id LIMIT %s
+    """
+
+    mismatches = []
+    after_id = 0
+    while True:
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(query, (after_id, batch_size))
+            rows = cursor.fetchall()
+        if not rows:
+            break
+        for row in rows:
+            # 측정되지 않은 시간(-1)은 NULL로 옮기므로 뷰의 기본값과 비교
+            if any(not same_value(row[name], row[f"new_{name}"]) for name in names
+                   if not (name.startswith("t") and row[name] is not None and row[name] < 0)):
+                mismatches.append(row["id"])
+        after_id = rows[-1]["id"]
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="넓은 형식 응답 열을 item_responses 테이블로 옮기기")
+    parser.add_argument("--create-schema", action="store_true", help=f"{SCHEMA_FILE}의 테이블과 뷰를 먼저 생성")
+    parser.add_argument("--tables", nargs="+", choices=list(ASSESSMENTS), default=list(ASSESSMENTS))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--verify", action="store_true", help="옮긴 뒤 기존 열과 호환 뷰의 값을 비교")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        create_schema()
+        print("item_responses table and views created")
+
+    views = {"ai_assessment_results": "ai_assessment_results_wide",
+             "thermal_init": "thermal_init_wide",
+             "inquiry_talk": "inquiry_talk_survey"}
+
+    for table in args.tables:
+        start = time.perf_counter()
+        migrated = migrate_table(table, args.batch_size)
+        print(f"{table}: {migrated} records in {time.perf_counter() - start:.1f}s")
+
+        if args.verify:
+            mismatches = verify_table(table, views[table], args.batch_size)
+            print(f"{table}: {len(mismatches)} mismatched records")
+            for record_id in mismatches[:10]:
+                print(f"  mismatch: id {record_id}")
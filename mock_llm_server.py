@@ -0,0 +1,199 @@
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 로컬 테스트용 OpenAI 호환 서버 (chat.completions만 지원)
+# 응답 지연, 토큰 생성 속도, 오류 발생 비율을 조정해서 실제 gpt-4o 없이 부하 테스트에 사용
+DEFAULT_ANSWER = "안녕하세요. 반갑습니다. 탐구 질문 생성과 관련해 궁금한 점이 있나요?"
+
+# 한 토큰으로 취급할 글자 수
+CHARS_PER_TOKEN = 2
+
+def split_tokens(text):
+    return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+def make_answer(answer_tokens):
+    """기본 응답을 반복해서 answer_tokens 길이의 응답 생성 (0이면 기본 응답)"""
+    if answer_tokens <= 0:
+        return DEFAULT_ANSWER
+    text = DEFAULT_ANSWER
+    while len(text) < answer_tokens * CHARS_PER_TOKEN:
+        text += " " + DEFAULT_ANSWER
+    return text[:answer_tokens * CHARS_PER_TOKEN]
+
+def make_tool_arguments(parameters):
+    """function 스키마의 필수 항목을 채운 모의 인자 생성"""
+    arguments = {}
+    for name, spec in parameters.get("properties", {}).items():
+        if "enum" in spec:
+            arguments[name] = spec["enum"][0]
+        elif spec.get("type") == "integer":
+            arguments[name] = 0
+        else:
+            arguments[name] = f"{name}에 대한 모의 피드백입니다."
+    return arguments
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    # keep-alive 연결을 유지하기 위해 HTTP/1.1 사용
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # 요청마다 출력되는 로그는 생략
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunk(self, payload):
+        data = f"data: {payload}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def usage(self, prompt_tokens, completion_tokens):
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        server = self.server
+        server.count_request()
+
+        if server.latency > 0:
+            time.sleep(server.latency)
+
+        # 오류 주입 (429 또는 500)
+        if random.random() < server.failure_rate:
+            status = random.choice(server.failure_statuses)
+            server.count_failure()
+            self.send_json(status, {"error": {"message": "Injected failure", "type": "mock_error", "code": status}})
+            return
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in request.get("messages", [])) // CHARS_PER_TOKEN
+        model = request.get("model", "gpt-4o")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        tokens = split_tokens(server.answer)
+        delay = 1.0 / server.token_rate if server.token_rate > 0 else 0.0
+
+        if request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+            for i, token in enumerate(tokens):
+                delta = {"role": "assistant", "content": token} if i == 0 else {"content": token}
+                self.send_chunk(json.dumps({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}, ensure_ascii=False))
+                time.sleep(delay)
+            self.send_chunk(json.dumps({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+            if request.get("stream_options", {}).get("include_usage"):
+                self.send_chunk(json.dumps({**base, "choices": [], "usage": self.usage(prompt_tokens, len(tokens))}))
+            self.send_chunk("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        time.sleep(delay * len(tokens))
+
+        message = {"role": "assistant", "content": server.answer}
+        finish_reason = "stop"
+        if request.get("tools"):
+            # 함수 호출이 필요한 요청(평가 결과 생성)에는 첫 번째 함수를 호출하는 응답 반환
+            function = request["tools"][0]["function"]
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {
+                        "name": function["name"],
+                        "arguments": json.dumps(make_tool_arguments(function.get("parameters", {})), ensure_ascii=False),
+                    },
+                }],
+            }
+            finish_reason = "tool_calls"
+
+        self.send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": self.usage(prompt_tokens, len(tokens)),
+        })
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, token_rate=0.0, failure_rate=0.0,
+                 failure_statuses=(429, 500), answer=DEFAULT_ANSWER):
+        super().__init__(address, MockLLMHandler)
+        self.latency = latency  # 첫 토큰까지의 지연 시간(초)
+        self.token_rate = token_rate  # 초당 생성 토큰 수 (0이면 지연 없음)
+        self.failure_rate = failure_rate  # 오류를 반환할 요청 비율 (0~1)
+        self.failure_statuses = list(failure_statuses)
+        self.answer = answer
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_failure(self):
+        with self._lock:
+            self.failures += 1
+
+def start_server(host="127.0.0.1", port=0, latency=0.0, answer=DEFAULT_ANSWER,
+                 token_rate=0.0, failure_rate=0.0, failure_statuses=(429, 500)):
+    """백그라운드 스레드에서 모의 서버를 실행하고 서버 객체를 반환 (port=0이면 임의 포트)"""
+    server = MockLLMServer((host, port), latency=latency, token_rate=token_rate,
+                           failure_rate=failure_rate, failure_statuses=failure_statuses, answer=answer)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def base_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/v1"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI 호환 모의 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="첫 토큰까지의 지연 시간(초)")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="초당 생성 토큰 수 (0이면 지연 없음)")
+    parser.add_argument("--answer-tokens", type=int, default=0, help="응답 길이(토큰 수, 0이면 기본 응답)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="429/500 오류를 반환할 요청 비율 (0~1)")
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, args.latency, make_answer(args.answer_tokens),
+                          token_rate=args.token_rate, failure_rate=args.failure_rate)
+    print(f"Mock LLM server listening on {base_url(server)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,15 @@
+-- 관리자 화면 학습자 목록(learner_list.py)용 인덱스
+-- (date, id): 필터 없이 날짜 순으로 페이지를 넘길 때 키셋 조회
+-- (name, date, id), (email, date, id): 이름/이메일 앞부분 검색
+-- overall_feedback(1): eval_ai.py의 미평가 학습자(피드백이 NULL이거나 빈 문자열) 수와 목록 조회 (긴 문자열 열이므로 앞 1글자만 인덱스)
+
+ALTER TABLE ai_assessment_results
+    ADD INDEX idx_ai_assessment_results_date (date, id),
+    ADD INDEX idx_ai_assessment_results_name (name, date, id),
+    ADD INDEX idx_ai_assessment_results_email (email, date, id),
+    ADD INDEX idx_ai_assessment_results_pending (overall_feedback(1), id);
+
+ALTER TABLE inquiry_talk
+    ADD INDEX idx_inquiry_talk_date (date, id),
+    ADD INDEX idx_inquiry_talk_name (name, date, id),
+    ADD INDEX idx_inquiry_talk_email (email, date, id);
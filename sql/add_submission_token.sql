@@ -0,0 +1,12 @@
+-- 시험 제출 토큰
+-- 완료 화면이 다시 실행될 때마다 같은 시험이 새 행으로 저장되던 문제를 막기 위해
+-- 세션마다 하나의 토큰을 저장하고 UNIQUE 키로 한 번만 추가되도록 함
+-- (기존 행은 NULL로 남으며, UNIQUE 키는 NULL 중복을 허용함)
+
+ALTER TABLE thermal_init
+    ADD COLUMN submission_token CHAR(32) NULL,
+    ADD UNIQUE KEY uq_thermal_init_submission_token (submission_token);
+
+ALTER TABLE ai_assessment_results
+    ADD COLUMN submission_token CHAR(32) NULL,
+    ADD UNIQUE KEY uq_ai_assessment_results_submission_token (submission_token);
@@ -0,0 +1,61 @@
+-- '다음'을 누르지 않고 중단한 도메인의 domain_N_content 채우기 (thermo.py: paced_learning, thermo_up.py: mid_term)
+-- 앱은 '다음'을 누를 때와 이어서 학습할 때만 domain_N_content를 저장하므로, 다시 접속하지 않은 학습자의 기록은 이 스크립트로 채움
+-- conversation_transcripts 뷰(create_conversation_messages.sql)를 사용하므로 GROUP_CONCAT이 잘리지 않도록 먼저 세션 설정을 늘림
+-- 이미 내용이 있는 열은 바꾸지 않으므로 여러 번 실행해도 됨
+
+SET SESSION group_concat_max_len = 16777216;
+
+UPDATE paced_learning p
+JOIN conversation_transcripts t ON t.record_table = 'paced_learning' AND t.record_id = p.id AND t.stage = 1
+SET p.domain_1_content = t.conversation
+WHERE p.domain_1_done = 1 AND p.domain_1_content IS NULL;
+
+UPDATE paced_learning p
+JOIN conversation_transcripts t ON t.record_table = 'paced_learning' AND t.record_id = p.id AND t.stage = 2
+SET p.domain_2_content = t.conversation
+WHERE p.domain_2_done = 1 AND p.domain_2_content IS NULL;
+
+UPDATE paced_learning p
+JOIN conversation_transcripts t ON t.record_table = 'paced_learning' AND t.record_id = p.id AND t.stage = 3
+SET p.domain_3_content = t.conversation
+WHERE p.domain_3_done = 1 AND p.domain_3_content IS NULL;
+
+UPDATE paced_learning p
+JOIN conversation_transcripts t ON t.record_table = 'paced_learning' AND t.record_id = p.id AND t.stage = 4
+SET p.domain_4_content = t.conversation
+WHERE p.domain_4_done = 1 AND p.domain_4_content IS NULL;
+
+UPDATE paced_learning p
+JOIN conversation_transcripts t ON t.record_table = 'paced_learning' AND t.record_id = p.id AND t.stage = 5
+SET p.domain_5_content = t.conversation
+WHERE p.domain_5_done = 1 AND p.domain_5_content IS NULL;
+
+UPDATE paced_learning p
+JOIN conversation_transcripts t ON t.record_table = 'paced_learning' AND t.record_id = p.id AND t.stage = 6
+SET p.domain_6_content = t.conversation
+WHERE p.domain_6_done = 1 AND p.domain_6_content IS NULL;
+
+UPDATE mid_term m
+JOIN conversation_transcripts t ON t.record_table = 'mid_term' AND t.record_id = m.id AND t.stage = 1
+SET m.domain_1_content = t.conversation
+WHERE m.domain_1_done = 1 AND m.domain_1_content IS NULL;
+
+UPDATE mid_term m
+JOIN conversation_transcripts t ON t.record_table = 'mid_term' AND t.record_id = m.id AND t.stage = 2
+SET m.domain_2_content = t.conversation
+WHERE m.domain_2_done = 1 AND m.domain_2_content IS NULL;
+
+UPDATE mid_term m
+JOIN conversation_transcripts t ON t.record_table = 'mid_term' AND t.record_id = m.id AND t.stage = 3
+SET m.domain_3_content = t.conversation
+WHERE m.domain_3_done = 1 AND m.domain_3_content IS NULL;
+
+UPDATE mid_term m
+JOIN conversation_transcripts t ON t.record_table = 'mid_term' AND t.record_id = m.id AND t.stage = 4
+SET m.domain_4_content = t.conversation
+WHERE m.domain_4_done = 1 AND m.domain_4_content IS NULL;
+
+UPDATE mid_term m
+JOIN conversation_transcripts t ON t.record_table = 'mid_term' AND t.record_id = m.id AND t.stage = 5
+SET m.domain_5_content = t.conversation
+WHERE m.domain_5_done = 1 AND m.domain_5_content IS NULL;
@@ -0,0 +1,33 @@
+-- 대화 메시지 저장 테이블 (한 턴마다 새 메시지만 추가)
+-- record_table/record_id: inquiry_talk, paced_learning, mid_term 등 학습 기록의 테이블과 id
+-- stage: inquiry_talk은 1~4단계, paced_learning/mid_term은 도메인 번호
+
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    session_id CHAR(32) NOT NULL,
+    record_table VARCHAR(32) NOT NULL,
+    record_id INT NOT NULL,
+    stage INT NOT NULL,
+    seq INT NOT NULL,
+    role VARCHAR(16) NOT NULL,
+    content MEDIUMTEXT NOT NULL,
+    created_at DATETIME NULL,
+    UNIQUE KEY uq_conversation_messages_seq (session_id, stage, seq),
+    KEY idx_conversation_messages_record (record_table, record_id, stage, id)
+);
+
+-- 기존 conversationN / domain_N_content 열과 같은 형식의 대화 텍스트
+-- 주의: GROUP_CONCAT은 group_concat_max_len(기본 1024바이트)에서 경고 없이 잘림
+-- 이 뷰를 읽기 전에 세션 설정을 늘려야 함: SET SESSION group_concat_max_len = 16777216;
+-- (서버 전체에 적용하려면 my.cnf의 group_concat_max_len, 애플리케이션에서는 message_store.load_transcript 사용)
+CREATE OR REPLACE VIEW conversation_transcripts AS
+SELECT
+    record_table,
+    record_id,
+    stage,
+    GROUP_CONCAT(
+        CONCAT(role, ' (', IFNULL(DATE_FORMAT(created_at, '%Y-%m-%d %H:%i:%s'), 'N/A'), '): ', content)
+        ORDER BY id SEPARATOR '\n'
+    ) AS conversation
+FROM conversation_messages
+GROUP BY record_table, record_id, stage;
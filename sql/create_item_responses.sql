@@ -0,0 +1,266 @@
+-- 문항별 응답 long 형식 테이블
+-- assessment: 기록이 있는 테이블 (ai_assessment_results, thermal_init, inquiry_talk)
+-- record_id: 해당 테이블의 id, item_id: 문항 번호 (1부터)
+-- answer: 응답 (선택지 번호, 서술형 답, 설문 응답), time_ms: 문항 응답 시간(밀리초)
+-- score: 채점 결과 (ai_assessment_results의 a열, thermal_init의 correct열), feedback: 문항별 피드백 (thermal_init의 feed열)
+-- 기존 행은 migrate_item_responses.py로 옮김
+-- 주의: 새로 저장하는 기록은 기존 테이블의 문항별 열(ai_assessment_results의 q*/t*/a*,
+-- thermal_init의 q*/t*/correct*/feed*, inquiry_talk의 feedback*)을 NULL로 남김.
+-- 문항별 응답을 읽는 코드와 내보내기는 기존 테이블 대신 아래 호환 뷰(*_wide, inquiry_talk_survey)나 item_responses를 조회해야 함
+
+CREATE TABLE IF NOT EXISTS item_responses (
+    assessment VARCHAR(32) NOT NULL,
+    record_id INT NOT NULL,
+    item_id SMALLINT NOT NULL,
+    answer TEXT NULL,
+    time_ms INT NULL,
+    score FLOAT NULL,
+    feedback TEXT NULL,
+    PRIMARY KEY (assessment, record_id, item_id),
+    KEY idx_item_responses_item_score (assessment, item_id, score),
+    KEY idx_item_responses_item_time (assessment, item_id, time_ms)
+);
+
+-- 아래 뷰는 기존 넓은 형식(q1, t1, a1 ...)으로 조회하던 코드를 위한 호환 뷰
+-- 기록 행의 공통 열에 문항별 열을 붙여서 기존 테이블과 같은 열 이름으로 보여줌
+-- id로 한 건을 조회하면 MySQL 8.0.22 이상에서는 조건이 뷰 안으로 전달되어 해당 기록의 행만 읽음
+-- 문항별 통계는 뷰 대신 item_responses를 직접 조회 (예: 문항별 정답률)
+--   SELECT item_id, AVG(score = 1) FROM item_responses
+--   WHERE assessment = 'ai_assessment_results' GROUP BY item_id;
+
+-- AI 역량 평가: q(선택지 번호, 응답 없음 -1), t(초, 측정 안 됨 -1), a(정답 1, 오답 0, 무응답 -1)
+CREATE OR REPLACE VIEW ai_assessment_results_wide AS
+SELECT
+    r.id,
+    r.name,
+    r.email,
+    r.date,
+    r.total_time,
+    r.submission_token,
+    r.correct_count,
+    r.incorrect_count,
+    r.unknown_count,
+    r.ai_literacy_feedback,
+    r.ai_understanding_feedback,
+    r.data_understanding_feedback,
+    r.ai_application_feedback,
+    r.overall_feedback,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 1 THEN i.answer END) AS SIGNED), -1) AS q1,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 2 THEN i.answer END) AS SIGNED), -1) AS q2,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 3 THEN i.answer END) AS SIGNED), -1) AS q3,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 4 THEN i.answer END) AS SIGNED), -1) AS q4,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 5 THEN i.answer END) AS SIGNED), -1) AS q5,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 6 THEN i.answer END) AS SIGNED), -1) AS q6,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 7 THEN i.answer END) AS SIGNED), -1) AS q7,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 8 THEN i.answer END) AS SIGNED), -1) AS q8,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 9 THEN i.answer END) AS SIGNED), -1) AS q9,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 10 THEN i.answer END) AS SIGNED), -1) AS q10,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 11 THEN i.answer END) AS SIGNED), -1) AS q11,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 12 THEN i.answer END) AS SIGNED), -1) AS q12,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 13 THEN i.answer END) AS SIGNED), -1) AS q13,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 14 THEN i.answer END) AS SIGNED), -1) AS q14,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 15 THEN i.answer END) AS SIGNED), -1) AS q15,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 16 THEN i.answer END) AS SIGNED), -1) AS q16,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 17 THEN i.answer END) AS SIGNED), -1) AS q17,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 18 THEN i.answer END) AS SIGNED), -1) AS q18,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 19 THEN i.answer END) AS SIGNED), -1) AS q19,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 20 THEN i.answer END) AS SIGNED), -1) AS q20,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 21 THEN i.answer END) AS SIGNED), -1) AS q21,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 22 THEN i.answer END) AS SIGNED), -1) AS q22,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 23 THEN i.answer END) AS SIGNED), -1) AS q23,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 24 THEN i.answer END) AS SIGNED), -1) AS q24,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 25 THEN i.answer END) AS SIGNED), -1) AS q25,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 26 THEN i.answer END) AS SIGNED), -1) AS q26,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 27 THEN i.answer END) AS SIGNED), -1) AS q27,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 28 THEN i.answer END) AS SIGNED), -1) AS q28,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 29 THEN i.answer END) AS SIGNED), -1) AS q29,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 30 THEN i.answer END) AS SIGNED), -1) AS q30,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 31 THEN i.answer END) AS SIGNED), -1) AS q31,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 32 THEN i.answer END) AS SIGNED), -1) AS q32,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 33 THEN i.answer END) AS SIGNED), -1) AS q33,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 34 THEN i.answer END) AS SIGNED), -1) AS q34,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 35 THEN i.answer END) AS SIGNED), -1) AS q35,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 36 THEN i.answer END) AS SIGNED), -1) AS q36,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 37 THEN i.answer END) AS SIGNED), -1) AS q37,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 38 THEN i.answer END) AS SIGNED), -1) AS q38,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 39 THEN i.answer END) AS SIGNED), -1) AS q39,
+    IFNULL(CAST(MAX(CASE WHEN i.item_id = 40 THEN i.answer END) AS SIGNED), -1) AS q40,
+    IFNULL(MAX(CASE WHEN i.item_id = 1 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t1,
+    IFNULL(MAX(CASE WHEN i.item_id = 2 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t2,
+    IFNULL(MAX(CASE WHEN i.item_id = 3 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t3,
+    IFNULL(MAX(CASE WHEN i.item_id = 4 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t4,
+    IFNULL(MAX(CASE WHEN i.item_id = 5 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t5,
+    IFNULL(MAX(CASE WHEN i.item_id = 6 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t6,
+    IFNULL(MAX(CASE WHEN i.item_id = 7 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t7,
+    IFNULL(MAX(CASE WHEN i.item_id = 8 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t8,
+    IFNULL(MAX(CASE WHEN i.item_id = 9 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t9,
+    IFNULL(MAX(CASE WHEN i.item_id = 10 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t10,
+    IFNULL(MAX(CASE WHEN i.item_id = 11 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t11,
+    IFNULL(MAX(CASE WHEN i.item_id = 12 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t12,
+    IFNULL(MAX(CASE WHEN i.item_id = 13 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t13,
+    IFNULL(MAX(CASE WHEN i.item_id = 14 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t14,
+    IFNULL(MAX(CASE WHEN i.item_id = 15 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t15,
+    IFNULL(MAX(CASE WHEN i.item_id = 16 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t16,
+    IFNULL(MAX(CASE WHEN i.item_id = 17 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t17,
+    IFNULL(MAX(CASE WHEN i.item_id = 18 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t18,
+    IFNULL(MAX(CASE WHEN i.item_id = 19 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t19,
+    IFNULL(MAX(CASE WHEN i.item_id = 20 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t20,
+    IFNULL(MAX(CASE WHEN i.item_id = 21 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t21,
+    IFNULL(MAX(CASE WHEN i.item_id = 22 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t22,
+    IFNULL(MAX(CASE WHEN i.item_id = 23 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t23,
+    IFNULL(MAX(CASE WHEN i.item_id = 24 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t24,
+    IFNULL(MAX(CASE WHEN i.item_id = 25 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t25,
+    IFNULL(MAX(CASE WHEN i.item_id = 26 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t26,
+    IFNULL(MAX(CASE WHEN i.item_id = 27 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t27,
+    IFNULL(MAX(CASE WHEN i.item_id = 28 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t28,
+    IFNULL(MAX(CASE WHEN i.item_id = 29 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t29,
+    IFNULL(MAX(CASE WHEN i.item_id = 30 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t30,
+    IFNULL(MAX(CASE WHEN i.item_id = 31 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t31,
+    IFNULL(MAX(CASE WHEN i.item_id = 32 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t32,
+    IFNULL(MAX(CASE WHEN i.item_id = 33 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t33,
+    IFNULL(MAX(CASE WHEN i.item_id = 34 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t34,
+    IFNULL(MAX(CASE WHEN i.item_id = 35 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t35,
+    IFNULL(MAX(CASE WHEN i.item_id = 36 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t36,
+    IFNULL(MAX(CASE WHEN i.item_id = 37 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t37,
+    IFNULL(MAX(CASE WHEN i.item_id = 38 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t38,
+    IFNULL(MAX(CASE WHEN i.item_id = 39 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t39,
+    IFNULL(MAX(CASE WHEN i.item_id = 40 THEN ROUND(i.time_ms / 1000, 2) END), -1) AS t40,
+    CAST(MAX(CASE WHEN i.item_id = 1 THEN i.score END) AS SIGNED) AS a1,
+    CAST(MAX(CASE WHEN i.item_id = 2 THEN i.score END) AS SIGNED) AS a2,
+    CAST(MAX(CASE WHEN i.item_id = 3 THEN i.score END) AS SIGNED) AS a3,
+    CAST(MAX(CASE WHEN i.item_id = 4 THEN i.score END) AS SIGNED) AS a4,
+    CAST(MAX(CASE WHEN i.item_id = 5 THEN i.score END) AS SIGNED) AS a5,
+    CAST(MAX(CASE WHEN i.item_id = 6 THEN i.score END) AS SIGNED) AS a6,
+    CAST(MAX(CASE WHEN i.item_id = 7 THEN i.score END) AS SIGNED) AS a7,
+    CAST(MAX(CASE WHEN i.item_id = 8 THEN i.score END) AS SIGNED) AS a8,
+    CAST(MAX(CASE WHEN i.item_id = 9 THEN i.score END) AS SIGNED) AS a9,
+    CAST(MAX(CASE WHEN i.item_id = 10 THEN i.score END) AS SIGNED) AS a10,
+    CAST(MAX(CASE WHEN i.item_id = 11 THEN i.score END) AS SIGNED) AS a11,
+    CAST(MAX(CASE WHEN i.item_id = 12 THEN i.score END) AS SIGNED) AS a12,
+    CAST(MAX(CASE WHEN i.item_id = 13 THEN i.score END) AS SIGNED) AS a13,
+    CAST(MAX(CASE WHEN i.item_id = 14 THEN i.score END) AS SIGNED) AS a14,
+    CAST(MAX(CASE WHEN i.item_id = 15 THEN i.score END) AS SIGNED) AS a15,
+    CAST(MAX(CASE WHEN i.item_id = 16 THEN i.score END) AS SIGNED) AS a16,
+    CAST(MAX(CASE WHEN i.item_id = 17 THEN i.score END) AS SIGNED) AS a17,
+    CAST(MAX(CASE WHEN i.item_id = 18 THEN i.score END) AS SIGNED) AS a18,
+    CAST(MAX(CASE WHEN i.item_id = 19 THEN i.score END) AS SIGNED) AS a19,
+    CAST(MAX(CASE WHEN i.item_id = 20 THEN i.score END) AS SIGNED) AS a20,
+    CAST(MAX(CASE WHEN i.item_id = 21 THEN i.score END) AS SIGNED) AS a21,
+    CAST(MAX(CASE WHEN i.item_id = 22 THEN i.score END) AS SIGNED) AS a22,
+    CAST(MAX(CASE WHEN i.item_id = 23 THEN i.score END) AS SIGNED) AS a23,
+    CAST(MAX(CASE WHEN i.item_id = 24 THEN i.score END) AS SIGNED) AS a24,
+    CAST(MAX(CASE WHEN i.item_id = 25 THEN i.score END) AS SIGNED) AS a25,
+    CAST(MAX(CASE WHEN i.item_id = 26 THEN i.score END) AS SIGNED) AS a26,
+    CAST(MAX(CASE WHEN i.item_id = 27 THEN i.score END) AS SIGNED) AS a27,
+    CAST(MAX(CASE WHEN i.item_id = 28 THEN i.score END) AS SIGNED) AS a28,
+    CAST(MAX(CASE WHEN i.item_id = 29 THEN i.score END) AS SIGNED) AS a29,
+    CAST(MAX(CASE WHEN i.item_id = 30 THEN i.score END) AS SIGNED) AS a30,
+    CAST(MAX(CASE WHEN i.item_id = 31 THEN i.score END) AS SIGNED) AS a31,
+    CAST(MAX(CASE WHEN i.item_id = 32 THEN i.score END) AS SIGNED) AS a32,
+    CAST(MAX(CASE WHEN i.item_id = 33 THEN i.score END) AS SIGNED) AS a33,
+    CAST(MAX(CASE WHEN i.item_id = 34 THEN i.score END) AS SIGNED) AS a34,
+    CAST(MAX(CASE WHEN i.item_id = 35 THEN i.score END) AS SIGNED) AS a35,
+    CAST(MAX(CASE WHEN i.item_id = 36 THEN i.score END) AS SIGNED) AS a36,
+    CAST(MAX(CASE WHEN i.item_id = 37 THEN i.score END) AS SIGNED) AS a37,
+    CAST(MAX(CASE WHEN i.item_id = 38 THEN i.score END) AS SIGNED) AS a38,
+    CAST(MAX(CASE WHEN i.item_id = 39 THEN i.score END) AS SIGNED) AS a39,
+    CAST(MAX(CASE WHEN i.item_id = 40 THEN i.score END) AS SIGNED) AS a40
+FROM ai_assessment_results r
+LEFT JOIN item_responses i ON i.assessment = 'ai_assessment_results' AND i.record_id = r.id
+GROUP BY r.id;
+
+-- 열물리학 역량 평가: q(서술형 답), t(초), correct(문항 점수), feed(문항 피드백)
+CREATE OR REPLACE VIEW thermal_init_wide AS
+SELECT
+    r.id,
+    r.name,
+    r.email,
+    r.date,
+    r.total_time,
+    r.submission_token,
+    r.total_score,
+    r.total_feedback,
+    MAX(CASE WHEN i.item_id = 1 THEN i.answer END) AS q1,
+    MAX(CASE WHEN i.item_id = 2 THEN i.answer END) AS q2,
+    MAX(CASE WHEN i.item_id = 3 THEN i.answer END) AS q3,
+    MAX(CASE WHEN i.item_id = 4 THEN i.answer END) AS q4,
+    MAX(CASE WHEN i.item_id = 5 THEN i.answer END) AS q5,
+    MAX(CASE WHEN i.item_id = 6 THEN i.answer END) AS q6,
+    MAX(CASE WHEN i.item_id = 7 THEN i.answer END) AS q7,
+    MAX(CASE WHEN i.item_id = 8 THEN i.answer END) AS q8,
+    MAX(CASE WHEN i.item_id = 9 THEN i.answer END) AS q9,
+    MAX(CASE WHEN i.item_id = 10 THEN i.answer END) AS q10,
+    MAX(CASE WHEN i.item_id = 11 THEN i.answer END) AS q11,
+    MAX(CASE WHEN i.item_id = 1 THEN ROUND(i.time_ms / 1000, 2) END) AS t1,
+    MAX(CASE WHEN i.item_id = 2 THEN ROUND(i.time_ms / 1000, 2) END) AS t2,
+    MAX(CASE WHEN i.item_id = 3 THEN ROUND(i.time_ms / 1000, 2) END) AS t3,
+    MAX(CASE WHEN i.item_id = 4 THEN ROUND(i.time_ms / 1000, 2) END) AS t4,
+    MAX(CASE WHEN i.item_id = 5 THEN ROUND(i.time_ms / 1000, 2) END) AS t5,
+    MAX(CASE WHEN i.item_id = 6 THEN ROUND(i.time_ms / 1000, 2) END) AS t6,
+    MAX(CASE WHEN i.item_id = 7 THEN ROUND(i.time_ms / 1000, 2) END) AS t7,
+    MAX(CASE WHEN i.item_id = 8 THEN ROUND(i.time_ms / 1000, 2) END) AS t8,
+    MAX(CASE WHEN i.item_id = 9 THEN ROUND(i.time_ms / 1000, 2) END) AS t9,
+    MAX(CASE WHEN i.item_id = 10 THEN ROUND(i.time_ms / 1000, 2) END) AS t10,
+    MAX(CASE WHEN i.item_id = 11 THEN ROUND(i.time_ms / 1000, 2) END) AS t11,
+    MAX(CASE WHEN i.item_id = 1 THEN i.score END) AS correct1,
+    MAX(CASE WHEN i.item_id = 2 THEN i.score END) AS correct2,
+    MAX(CASE WHEN i.item_id = 3 THEN i.score END) AS correct3,
+    MAX(CASE WHEN i.item_id = 4 THEN i.score END) AS correct4,
+    MAX(CASE WHEN i.item_id = 5 THEN i.score END) AS correct5,
+    MAX(CASE WHEN i.item_id = 6 THEN i.score END) AS correct6,
+    MAX(CASE WHEN i.item_id = 7 THEN i.score END) AS correct7,
+    MAX(CASE WHEN i.item_id = 8 THEN i.score END) AS correct8,
+    MAX(CASE WHEN i.item_id = 9 THEN i.score END) AS correct9,
+    MAX(CASE WHEN i.item_id = 10 THEN i.score END) AS correct10,
+    MAX(CASE WHEN i.item_id = 11 THEN i.score END) AS correct11,
+    MAX(CASE WHEN i.item_id = 1 THEN i.feedback END) AS feed1,
+    MAX(CASE WHEN i.item_id = 2 THEN i.feedback END) AS feed2,
+    MAX(CASE WHEN i.item_id = 3 THEN i.feedback END) AS feed3,
+    MAX(CASE WHEN i.item_id = 4 THEN i.feedback END) AS feed4,
+    MAX(CASE WHEN i.item_id = 5 THEN i.feedback END) AS feed5,
+    MAX(CASE WHEN i.item_id = 6 THEN i.feedback END) AS feed6,
+    MAX(CASE WHEN i.item_id = 7 THEN i.feedback END) AS feed7,
+    MAX(CASE WHEN i.item_id = 8 THEN i.feedback END) AS feed8,
+    MAX(CASE WHEN i.item_id = 9 THEN i.feedback END) AS feed9,
+    MAX(CASE WHEN i.item_id = 10 THEN i.feedback END) AS feed10,
+    MAX(CASE WHEN i.item_id = 11 THEN i.feedback END) AS feed11
+FROM thermal_init r
+LEFT JOIN item_responses i ON i.assessment = 'thermal_init' AND i.record_id = r.id
+GROUP BY r.id;
+
+-- 탐구 설계 활동 설문: feedback1~22(1~5점), feedback23~26(서술형)
+CREATE OR REPLACE VIEW inquiry_talk_survey AS
+SELECT
+    r.id,
+    r.name,
+    r.email,
+    r.date,
+    MAX(CASE WHEN i.item_id = 1 THEN i.answer END) AS feedback1,
+    MAX(CASE WHEN i.item_id = 2 THEN i.answer END) AS feedback2,
+    MAX(CASE WHEN i.item_id = 3 THEN i.answer END) AS feedback3,
+    MAX(CASE WHEN i.item_id = 4 THEN i.answer END) AS feedback4,
+    MAX(CASE WHEN i.item_id = 5 THEN i.answer END) AS feedback5,
+    MAX(CASE WHEN i.item_id = 6 THEN i.answer END) AS feedback6,
+    MAX(CASE WHEN i.item_id = 7 THEN i.answer END) AS feedback7,
+    MAX(CASE WHEN i.item_id = 8 THEN i.answer END) AS feedback8,
+    MAX(CASE WHEN i.item_id = 9 THEN i.answer END) AS feedback9,
+    MAX(CASE WHEN i.item_id = 10 THEN i.answer END) AS feedback10,
+    MAX(CASE WHEN i.item_id = 11 THEN i.answer END) AS feedback11,
+    MAX(CASE WHEN i.item_id = 12 THEN i.answer END) AS feedback12,
+    MAX(CASE WHEN i.item_id = 13 THEN i.answer END) AS feedback13,
+    MAX(CASE WHEN i.item_id = 14 THEN i.answer END) AS feedback14,
+    MAX(CASE WHEN i.item_id = 15 THEN i.answer END) AS feedback15,
+    MAX(CASE WHEN i.item_id = 16 THEN i.answer END) AS feedback16,
+    MAX(CASE WHEN i.item_id = 17 THEN i.answer END) AS feedback17,
+    MAX(CASE WHEN i.item_id = 18 THEN i.answer END) AS feedback18,
+    MAX(CASE WHEN i.item_id = 19 THEN i.answer END) AS feedback19,
+    MAX(CASE WHEN i.item_id = 20 THEN i.answer END) AS feedback20,
+    MAX(CASE WHEN i.item_id = 21 THEN i.answer END) AS feedback21,
+    MAX(CASE WHEN i.item_id = 22 THEN i.answer END) AS feedback22,
+    MAX(CASE WHEN i.item_id = 23 THEN i.answer END) AS feedback23,
+    MAX(CASE WHEN i.item_id = 24 THEN i.answer END) AS feedback24,
+    MAX(CASE WHEN i.item_id = 25 THEN i.answer END) AS feedback25,
+    MAX(CASE WHEN i.item_id = 26 THEN i.answer END) AS feedback26
+FROM inquiry_talk r
+LEFT JOIN item_responses i ON i.assessment = 'inquiry_talk' AND i.record_id = r.id
+GROUP BY r.id;
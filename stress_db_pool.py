@@ -0,0 +1,141 @@
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import db_pool
+from db_pool import ConnectionPool, connect, db_cursor
+from message_store import TIMESTAMP_FORMAT, append_messages, load_messages, new_session_id
+from write_behind import flush_writes, queued_cursor
+
+# thermo.py의 save_conversation_to_db와 같은 경로로 여러 학생(스레드)이 동시에 대화를 저장하는 스트레스 테스트
+# 매 턴 write_behind 큐에 새 메시지(append_messages -> conversation_messages)와 paced_learning의 시간/완료 UPDATE를 넣고,
+# Streamlit 세션 대신 학생마다 만든 session_id로 작업을 구분해서 마지막에 flush_writes(session=...)로 반영을 기다림
+# 중간에 쉬고 있는 연결을 서버에서 강제로 끊어 wait_timeout이 지난 상황도 재현
+# 끝나면 conversation_messages에서 각 학생의 메시지가 빠짐없이, 중복 없이, 순서대로 저장되었는지 확인
+# .env의 MySQL에 conversation_messages(sql/create_conversation_messages.sql)와 paced_learning 테이블이 있어야 함
+# 실제 학생 기록과 겹치지 않도록 음수 record_id를 사용하고 (paced_learning UPDATE는 바뀌는 행이 없음), 끝나면 테스트 메시지를 삭제
+RECORD_TABLE = "paced_learning"
+DOMAINS = 6
+
+def save_conversation_to_db(session_id, user_id, domain_idx, messages, saved, duration):
+    """thermo.py와 같은 쿼리와 저장 방식 (Streamlit 세션 대신 session_id, user_id를 인자로 받음). 저장된 메시지 수 반환"""
+    with queued_cursor(session=session_id) as cursor:
+        saved = append_messages(session_id, RECORD_TABLE, user_id, domain_idx, messages, saved, cursor=cursor)
+
+    update_query = f"""
+    UPDATE paced_learning
+    SET domain_{domain_idx}_time=%s, domain_{domain_idx}_done=1
+    WHERE id=%s
+    """
+    with queued_cursor(session=session_id) as cursor:
+        cursor.execute(update_query, (duration, user_id))
+    return saved
+
+def message(user_id, domain_idx, turn, role):
+    return {
+        "role": role,
+        "content": f"student {user_id} domain {domain_idx} turn {turn} {role}",
+        "timestamp": datetime.now().strftime(TIMESTAMP_FORMAT),
+    }
+
+def run_student(user_id, turns, errors):
+    """한 학생이 모든 도메인에서 turns번씩 대화하고 저장. 학생의 session_id 반환"""
+    session_id = new_session_id()
+    for domain_idx in range(1, DOMAINS + 1):
+        messages, saved = [], 0
+        for turn in range(turns):
+            messages.append(message(user_id, domain_idx, turn, "user"))
+            messages.append(message(user_id, domain_idx, turn, "assistant"))
+            try:
+                saved = save_conversation_to_db(session_id, user_id, domain_idx, messages, saved, turn)
+            except Exception as e:
+                errors.append(f"student {user_id} domain {domain_idx}: {e!r}")
+    return session_id
+
+def kill_idle_connections(stop, interval, killed):
+    """interval초마다 이 DB에서 쉬고 있는 연결을 모두 끊음 (서버의 wait_timeout 재현)"""
+    admin = connect()
+    cursor = admin.cursor()
+    while not stop.wait(interval):
+        cursor.execute("SELECT ID FROM information_schema.PROCESSLIST "
+                       "WHERE USER = CURRENT_USER() AND COMMAND = 'Sleep' AND ID <> CONNECTION_ID()")
+        for (connection_id,) in cursor.fetchall():
+            try:
+                cursor.execute(f"KILL {int(connection_id)}")
+                killed.append(connection_id)
+            except Exception:
+                pass  # 그 사이에 다시 사용 중이거나 이미 닫힌 연결
+    cursor.close()
+    admin.close()
+
+def verify(students, turns):
+    """각 학생의 도메인별 메시지가 conversation_messages에 넣은 순서대로 정확히 한 번씩 저장되었는지 확인"""
+    mismatches = []
+    for user_id in range(-1, -students - 1, -1):
+        for domain_idx in range(1, DOMAINS + 1):
+            expected = [(role, message(user_id, domain_idx, turn, role)["content"])
+                        for turn in range(turns) for role in ("user", "assistant")]
+            stored = [(msg["role"], msg["content"]) for msg in load_messages(RECORD_TABLE, user_id, domain_idx)]
+            if stored != expected:
+                mismatches.append((user_id, domain_idx, len(stored), len(expected)))
+    return mismatches
+
+def teardown(session_ids):
+    with db_cursor() as cursor:
+        cursor.executemany("DELETE FROM conversation_messages WHERE session_id = %s AND record_id < 0",
+                           [(session_id,) for session_id in session_ids])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="save_conversation_to_db 동시 저장 스트레스 테스트")
+    parser.add_argument("--students", type=int, default=50, help="동시에 저장하는 학생(스레드) 수")
+    parser.add_argument("--turns", type=int, default=20, help="도메인별 대화 턴 수")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--kill-every", type=float, default=0.5, help="쉬고 있는 연결을 끊는 간격(초, 0이면 끊지 않음)")
+    parser.add_argument("--flush-timeout", type=float, default=120, help="학생별로 쓰기 반영을 기다리는 최대 시간(초)")
+    args = parser.parse_args()
+
+    db_pool._pool = ConnectionPool(size=args.pool_size)
+    errors, killed, session_ids = [], [], []
+    stop = threading.Event()
+    killer = None
+    if args.kill_every > 0:
+        killer = threading.Thread(target=kill_idle_connections, args=(stop, args.kill_every, killed), daemon=True)
+        killer.start()
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.students) as executor:
+            futures = [executor.submit(run_student, -i, args.turns, errors) for i in range(1, args.students + 1)]
+            session_ids = [future.result() for future in futures]
+        queued = time.perf_counter() - start
+
+        unflushed, failed = 0, []
+        for session_id in session_ids:
+            flushed, session_failed = flush_writes(args.flush_timeout, session=session_id)
+            unflushed += not flushed
+            failed.extend(session_failed)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        if killer:
+            killer.join()
+
+        saves = args.students * DOMAINS * args.turns
+        mismatches = verify(args.students, args.turns)
+        print(f"{saves} saves from {args.students} threads: queued in {queued:.1f}s ({saves / queued:.0f} saves/s), "
+              f"committed in {elapsed:.1f}s ({saves / elapsed:.0f} saves/s)")
+        print(f"idle connections killed: {len(killed)}")
+        print(f"errors: {len(errors)}, unflushed sessions: {unflushed}, failed jobs: {len(failed)}, "
+              f"mismatched transcripts: {len(mismatches)}")
+        for error in errors[:10]:
+            print(f"  {error}")
+        for job_id, error in failed[:10]:
+            print(f"  failed job {job_id}: {error}")
+        for mismatch in mismatches[:10]:
+            print(f"  mismatch (record_id, domain, stored, expected): {mismatch}")
+    finally:
+        if session_ids:
+            teardown(session_ids)
+        db_pool._pool.close()
@@ -0,0 +1,126 @@
+import json
+from llm_client import create_chat_completion
+from item_responses import save_scores
+
+# 열물리학 진단 평가(thermal_init) 채점 로직
+# thermal_init.py 화면과 grade_thermal_init.py 일괄 채점에서 함께 사용
+
+tools = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_feedback",
+            "description": "Get feedbacks about the diagnostic test for thermal physics",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+            },
+        }
+    }
+]
+
+for i in range(1, 12):
+    tools[0]["function"]["parameters"]["properties"][f"score{i}"] = {
+        "type": "integer",
+        "enum": [0, 1, 2, 3],
+        "description": f"Score for question {i}"
+    }
+
+tools[0]["function"]["parameters"]["properties"]["all_score"] = {
+    "type": "integer", 
+    "enum": [i for i in range(34)],
+    "description": "Score for overall test"
+}
+
+# feed1 ~ feed11까지 반복적으로 추가
+for i in range(1, 12):
+    tools[0]["function"]["parameters"]["properties"][f"feed{i}"] = {
+        "type": "string", 
+        "description": f"Feedback for question {i}"
+    }
+
+# overall 피드백 추가
+tools[0]["function"]["parameters"]["properties"]["overall"] = {
+    "type": "string", 
+    "description": "Feedback for overall test"
+}
+
+# 필수 필드로 추가
+tools[0]["function"]["parameters"]["required"] = [f"score{i}" for i in range(1, 12)] + ["all_score"] + [f"feed{i}" for i in range(1, 12)] + ["overall"]
+
+evaluation_prompt = (
+    "다음은 열물리학 과목 수강생을 위한 진단 평가에 대한 문항과 사용자의 응답결과를 나타낸 정보야."
+    "이 데이터는 Domain을 기준으로 수학적 이해와 물리적 이해의 2가지로 나눠져 있고, 각각의 문항은 미흡, 보통, 양호, 우수의 4단계로 평가 기준을 가지고 있어."
+    "그리고 각 문항에 대한 사용자의 응답시간과 응답내용, 평가기준을 고려해서 각각의 문항에 대해 미흡(0), 보통(1), 양호(2), 우수(3) 중 어디에 해당하는지와 함께 문제 풀이를 위한 학습자의 응답 수준에 맞는 풀이 및 피드백을 제공해 줘."
+    "또한 전체적인 관점에서의 총평과 피드백도 제공해 줘."
+    "만약 입력한 텍스트가 없다면 0점 처리하고, 피드백은 문제를 풀기 위한 단계나 푸는 과정을 보여주도록 해."
+    "그러니까 11개의 문항에 대한 점수(0~3) 및 종합 점수, 각 문항에 대한 피드백 및 종합 피드백을 제공해 줘야 해."
+    "각각의 문항에 대해 최소한 200자 이상의 피드백을 제공하도록 해."
+)
+
+# 문항과 평가기준 목록 (학생과 무관한 고정 텍스트)
+def build_question_block(questions):
+    block = ''
+    for i in range(len(questions)):
+        block += f"문항 {i+1}: {questions.loc[i, 'Problem']}\n"
+        block += f"평가기준: {questions.loc[i, 'Standard']}\n"
+    return block
+
+# 엑셀 파일을 불러와 답안과 비교하여 평가
+def evaluate_student_data(student_data, questions):
+    # 평가 결과 저장
+    correct = []
+    feed = []
+    
+    # 모든 학생에게 동일한 문항과 평가기준을 앞에 두고 학생별 응답은 뒤에 배치 (프롬프트 캐시 적용)
+    query = evaluation_prompt + '\n' + build_question_block(questions) + '\n' + "학습자 응답:\n"
+    for i in range(len(questions)):
+        timed = student_data[f't{i+1}']
+        solution = student_data[f'q{i+1}']
+        query += f'문항 {i+1} 응답 시간: {timed}초\n'
+        query += f'문항 {i+1} 응답 내용: {solution}\n'
+
+    messages = [] 
+    messages.append({"role": "system", "content": "You are the expert of physics. Don't make assumptions about what values to plug into functions."})
+    messages.append({"role": "user", "content": query})
+    resp = create_chat_completion(
+        app="thermal_init",
+        model="gpt-4o",
+        messages=messages,
+        tools=tools
+    )
+    
+    all_feedback = {}
+    
+    if hasattr(resp.choices[0].message, 'tool_calls'):
+        for tool_call in resp.choices[0].message.tool_calls:
+            if tool_call.function.name == 'get_feedback':
+                feedback = json.loads(tool_call.function.arguments)
+                all_feedback.update(feedback)
+    else:
+        all_feedback = json.loads(resp.choices[0].message.tool_calls[0].function.arguments)
+    
+    print(all_feedback)
+    
+    # 문항별로 평가
+    for i in range(1, 12):
+        feed.append(all_feedback[f'feed{i}'])
+        correct.append(all_feedback[f'score{i}'])
+    
+    total_score = float(f"{all_feedback['all_score']/11:.2f}")
+    total_feedback = all_feedback['overall']
+            
+    return total_score, total_feedback, correct, feed
+
+# 종합 점수와 피드백은 thermal_init에, 문항별 점수와 피드백은 item_responses에 기록
+update_results_query = """
+UPDATE thermal_init
+SET total_score = %s,
+    total_feedback = %s
+WHERE id = %s
+"""
+
+def save_results(cursor, student_id, total_score, total_feedback, correct, feed):
+    """호출한 쪽의 커서(트랜잭션)로 채점 결과 저장"""
+    cursor.execute(update_results_query, (total_score, total_feedback, student_id))
+    save_scores(cursor, "thermal_init", student_id, correct, feed)
@@ -1,16 +1,20 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import mysql.connector
 import time
-import json
 import re
+import uuid
 import os
 import markdown
 import smtplib
 from datetime import datetime
 from io import BytesIO
 from dotenv import load_dotenv
-from openai import OpenAI
+from db_pool import db_cursor
+from item_responses import save_responses
+from latex_text import render_text
+from thermal_grading import evaluate_student_data, save_results
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
@@ -21,12 +25,6 @@ st.set_page_config(page_title="열물리학 역량 평가", page_icon=":thermome
 # Load environment variables
 load_dotenv()
 
-# Database connection parameters
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_DATABASE = os.getenv("DB_DATABASE")
-
 # CSS to adjust button styles
 st.markdown("""
 <style>
@@ -48,246 +46,62 @@ def load_questions():
 
 questions = load_questions()
 
-tools = [
-    {
-        "type": "function",
-        "function": {
-            "name": "get_feedback",
-            "description": "Get feedbacks about the diagnostic test for thermal physics",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-            },
-        }
-    }
-]
-
-for i in range(1, 12):
-    tools[0]["function"]["parameters"]["properties"][f"score{i}"] = {
-        "type": "integer",
-        "enum": [0, 1, 2, 3],
-        "description": f"Score for question {i}"
-    }
-
-tools[0]["function"]["parameters"]["properties"]["all_score"] = {
-    "type": "integer", 
-    "enum": [i for i in range(34)],
-    "description": "Score for overall test"
-}
-
-# feed1 ~ feed11까지 반복적으로 추가
-for i in range(1, 12):
-    tools[0]["function"]["parameters"]["properties"][f"feed{i}"] = {
-        "type": "string", 
-        "description": f"Feedback for question {i}"
-    }
-
-# overall 피드백 추가
-tools[0]["function"]["parameters"]["properties"]["overall"] = {
-    "type": "string", 
-    "description": "Feedback for overall test"
-}
-
-# 필수 필드로 추가
-tools[0]["function"]["parameters"]["required"] = [f"score{i}" for i in range(1, 12)] + ["all_score"] + [f"feed{i}" for i in range(1, 12)] + ["overall"]
-
 # Function to validate email
 def is_valid_email(email):
     pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
     return re.match(pattern, email) is not None
 
 # MySQL에 데이터를 저장하고, 생성된 id를 반환하는 함수
-def save_to_database(data):
+def save_to_database(data, answers, times):
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_DATABASE
-        )
-        cursor = connection.cursor()
-
         # INSERT 쿼리
         query = """
         INSERT INTO thermal_init 
-        (name, email, date, total_time, q1, q2, q3, q4, q5, q6, q7, q8, q9, q10, q11,
-        t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        (name, email, date, total_time, submission_token)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
         """
         
-        # 데이터를 튜플 형태로 전달
-        cursor.execute(query, tuple(data.values()))
-        
-        # 변경 사항 커밋
-        connection.commit()
-        
-        # 생성된 id 반환
-        student_id = cursor.lastrowid
+        # 풀에서 빌린 연결로 저장하고 블록이 끝나면 커밋
+        with db_cursor() as cursor:
+            # 같은 submission_token으로 이미 저장된 경우 새로 추가하지 않고 기존 id를 반환
+            cursor.execute(query, tuple(data.values()))
+            
+            # 생성된 id
+            student_id = cursor.lastrowid
+
+            # 문항별 응답과 시간은 같은 트랜잭션에서 item_responses에 저장
+            save_responses(cursor, "thermal_init", student_id, answers, times)
         
         return student_id
     except mysql.connector.Error as error:
         st.error(f"Failed to save results to database: {error}")
         return None
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
             
-# Function to display text and LaTeX
-def display_text_and_latex(text):
-    # 수식 구분을 위한 패턴 정의 (원시 문자열 사용)
-    pattern = r'(\\\[.*?\\\]|\\\(.*?\\\))'
-    
-    # 패턴을 기준으로 문자열을 분리
-    parts = re.split(pattern, text, flags=re.DOTALL)
-    
-    print(parts)  # 디버깅용 출력
-    
-    for part in parts:
-        # 수식 부분이 LaTeX 구분 기호로 둘러싸여 있는지 확인 (re.fullmatch 사용)
-        if re.fullmatch(pattern, part, flags=re.DOTALL):  # LaTeX 수식인 경우
-            #print("LaTeX 수식 부분:", part)
-            
-            # 수식의 양쪽 기호만 제거하고 내부는 그대로 유지
-            if part.startswith('$$') and part.endswith('$$'):
-                cleaned_latex = part[2:-2]  # $$ ... $$ 제거
-            elif part.startswith('$') and part.endswith('$'):
-                cleaned_latex = part[1:-1]  # $ ... $ 제거
-            elif part.startswith('\\[') and part.endswith('\\]'):
-                cleaned_latex = part[2:-2]  # \[ ... \] 제거
-            elif part.startswith('\\(') and part.endswith('\\)'):
-                cleaned_latex = part[2:-2]  # \( ... \) 제거
-            else:
-                cleaned_latex = part  # 포맷에 맞지 않으면 그대로 출력
-            
-            #print(cleaned_latex)
-            
-            st.latex(cleaned_latex.strip())  # LaTeX 수식 렌더링
-        else:
-            # 일반 텍스트인 경우
-            st.markdown(part)
-           
 # MySQL에서 학습자 데이터를 id로 불러오는 함수
 def fetch_student_data_by_id(student_id):
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_DATABASE
-        )
-        cursor = connection.cursor(dictionary=True)
-        
-        # 학습자 id를 이용해 데이터를 조회
-        query = "SELECT * FROM thermal_init WHERE id = %s"
-        cursor.execute(query, (student_id,))
-        result = cursor.fetchone()
+        with db_cursor(dictionary=True) as cursor:
+            # 학습자 id를 이용해 데이터를 조회
+            query = "SELECT * FROM thermal_init_wide WHERE id = %s"
+            cursor.execute(query, (student_id,))
+            result = cursor.fetchone()
         
         return result
     except mysql.connector.Error as error:
         st.error(f"Failed to fetch student data: {error}")
         return None
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
-
-evaluation_prompt = (
-    "다음은 열물리학 과목 수강생을 위한 진단 평가에 대한 문항과 사용자의 응답결과를 나타낸 정보야."
-    "이 데이터는 Domain을 기준으로 수학적 이해와 물리적 이해의 2가지로 나눠져 있고, 각각의 문항은 미흡, 보통, 양호, 우수의 4단계로 평가 기준을 가지고 있어."
-    "그리고 각 문항에 대한 사용자의 응답시간과 응답내용, 평가기준을 고려해서 각각의 문항에 대해 미흡(0), 보통(1), 양호(2), 우수(3) 중 어디에 해당하는지와 함께 문제 풀이를 위한 학습자의 응답 수준에 맞는 풀이 및 피드백을 제공해 줘."
-    "또한 전체적인 관점에서의 총평과 피드백도 제공해 줘."
-    "만약 입력한 텍스트가 없다면 0점 처리하고, 피드백은 문제를 풀기 위한 단계나 푸는 과정을 보여주도록 해."
-    "그러니까 11개의 문항에 대한 점수(0~3) 및 종합 점수, 각 문항에 대한 피드백 및 종합 피드백을 제공해 줘야 해."
-    "각각의 문항에 대해 최소한 200자 이상의 피드백을 제공하도록 해."
-)
-
-# 엑셀 파일을 불러와 답안과 비교하여 평가
-def evaluate_student_data(student_data):    
-    # 평가 결과 저장
-    correct = []
-    feed = []
-    
-    query = ''
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    for i in range(len(questions)):
-        timed = student_data[f't{i+1}']
-        solution = student_data[f'q{i+1}']
-        query += f"문항 {i+1}: {questions.loc[i, 'Problem']}\n"
-        query += f"평가기준: {questions.loc[i, 'Standard']}\n"
-        query += f'응답 시간: {timed}초\n'
-        query += f'응답 내용: {solution}\n'
-    
-    query = evaluation_prompt + '\n' + query
-    messages = [] 
-    messages.append({"role": "system", "content": "You are the expert of physics. Don't make assumptions about what values to plug into functions."})
-    messages.append({"role": "user", "content": query})
-    resp = client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        tools=tools
-    )
-    
-    all_feedback = {}
-    
-    if hasattr(resp.choices[0].message, 'tool_calls'):
-        for tool_call in resp.choices[0].message.tool_calls:
-            if tool_call.function.name == 'get_feedback':
-                feedback = json.loads(tool_call.function.arguments)
-                all_feedback.update(feedback)
-    else:
-        all_feedback = json.loads(resp.choices[0].message.tool_calls[0].function.arguments)
-    
-    print(all_feedback)
-    
-    # 문항별로 평가
-    for i in range(1, 12):
-        feed.append(all_feedback[f'feed{i}'])
-        correct.append(all_feedback[f'score{i}'])
-    
-    total_score = float(f"{all_feedback['all_score']/11:.2f}")
-    total_feedback = all_feedback['overall']
-            
-    return total_score, total_feedback, correct, feed
 
 # 평가 결과를 MySQL에 id로 업데이트하는 함수
 def update_student_results_by_id(student_id, total_score, total_feedback, correct, feed):
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_DATABASE
-        )
-        cursor = connection.cursor()
-        
-        # MySQL에 업데이트할 쿼리
-        query = """
-        UPDATE thermal_init
-        SET total_score = %s,
-            total_feedback = %s,
-            correct1 = %s, correct2 = %s, correct3 = %s, correct4 = %s, correct5 = %s, 
-            correct6 = %s, correct7 = %s, correct8 = %s, correct9 = %s, correct10 = %s, correct11 = %s,
-            feed1 = %s, feed2 = %s, feed3 = %s, feed4 = %s, feed5 = %s,
-            feed6 = %s, feed7 = %s, feed8 = %s, feed9 = %s, feed10 = %s, feed11 = %s
-        WHERE id = %s
-        """
-        
         # 데이터 업데이트
-        cursor.execute(query, (
-            total_score, total_feedback, 
-            *correct, *feed, student_id
-        ))
-        connection.commit()
+        with db_cursor() as cursor:
+            save_results(cursor, student_id, total_score, total_feedback, correct, feed)
         
         st.success("결과가 성공적으로 업데이트되었습니다.")
     except mysql.connector.Error as error:
         st.error(f"Failed to update student results: {error}")
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
 
 # 이메일로 평가 결과 전송 함수
 def send_email(recipient_email, name, subject, markdown_body, chart_buffer=None):
@@ -326,6 +140,57 @@ def send_email(recipient_email, name, subject, markdown_body, chart_buffer=None)
         st.error(f"이메일을 보내는 동안 오류가 발생했습니다: {str(e)}")
         return False
 
+# 제한 시간 (초)
+TEST_DURATION = 60 * 60
+
+# 브라우저가 열려 있는 동안 제한 시간이 지났는지 확인하는 주기 (초)
+DEADLINE_CHECK_INTERVAL = 5
+
+# 남은 시간과 진행 막대를 브라우저에서 1초마다 갱신 (서버에서 스크립트를 다시 실행하지 않음)
+# 시간이 지났는지는 서버에서 다시 실행될 때 end_time으로 확인 (watch_deadline이 주기적으로 확인)
+def show_countdown(remaining_time, duration=TEST_DURATION):
+    components.html(f"""
+    <div style="display: flex; align-items: center; gap: 24px; font-family: 'Source Sans Pro', sans-serif;">
+        <h3 id="remaining" style="flex: 3; margin: 0; color: rgb(49, 51, 63);"></h3>
+        <progress id="progress" max="{duration}" style="flex: 1; width: 100%;"></progress>
+    </div>
+    <script>
+        // 브라우저와 서버의 시계가 다를 수 있으므로 남은 시간(초)을 받아서 브라우저 시계 기준으로 계산
+        const end = Date.now() + {remaining_time * 1000:.0f};
+        function tick() {{
+            const left = Math.max(0, Math.floor((end - Date.now()) / 1000));
+            const minutes = String(Math.floor(left / 60)).padStart(2, "0");
+            const seconds = String(left % 60).padStart(2, "0");
+            document.getElementById("remaining").textContent = left > 0
+                ? `남은 시간: ${{minutes}}분 ${{seconds}}초`
+                : "시간이 종료되었습니다. 답변을 저장하고 있습니다.";
+            document.getElementById("progress").value = {duration} - left;
+        }}
+        tick();
+        setInterval(tick, 1000);
+    </script>
+    """, height=50)
+
+# 제한 시간 확인만 주기적으로 다시 실행 (화면 전체는 다시 실행하지 않음)
+# 시간이 지나면 앱 전체를 다시 실행해서 학습자가 아무것도 누르지 않아도 평가를 종료하고 결과를 저장
+@st.fragment(run_every=DEADLINE_CHECK_INTERVAL)
+def watch_deadline():
+    if time.time() > st.session_state.end_time:
+        st.rerun(scope="app")
+
+# 제한 시간이 지났을 때 현재 문항의 입력 중인 답변과 풀이 시간(종료 시각까지)을 저장
+def close_current_question():
+    current_question_number = st.session_state.question_number + 1
+    if current_question_number > len(questions):
+        return
+    key = f"q{current_question_number}"
+    if key in st.session_state:
+        st.session_state.answers[key] = st.session_state[key]
+    start_time = st.session_state.question_start_times.get(f"start_time_q{current_question_number}")
+    if start_time is not None:
+        question_time = max(0, st.session_state.end_time - start_time)
+        st.session_state.times[f"t{current_question_number}"] = st.session_state.times.get(f"t{current_question_number}", 0) + question_time
+
 # 학습자의 답변과 평가 결과를 테이블로 보여주고, 피드백을 문자열로 저장하는 함수
 def display_evaluation_results(student_data, correct_data, feed_data, total_score, total_feedback):
     markdown_content = f"""
@@ -420,7 +285,7 @@ elif st.session_state.state == 'disclaimer':
         if st.button("확인 및 평가 시작"):
             st.session_state.state = 'test'
             st.session_state.start_time = time.time()
-            st.session_state.end_time = st.session_state.start_time + 60 * 60  # 60 minutes
+            st.session_state.end_time = st.session_state.start_time + TEST_DURATION  # 60 minutes
             st.session_state.question_number = 0
             st.rerun()
 
@@ -449,29 +314,25 @@ elif st.session_state.state == 'test':
             """
         )
 
-    # Time and progress display
+    # 다시 실행될 때마다 제한 시간 확인 (watch_deadline이 시간이 지나면 앱 전체를 다시 실행)
+    # 시간이 지나면 현재 문항에 입력한 답변까지 저장하고 종료
     current_time = time.time()
     if current_time > st.session_state.end_time:
+        close_current_question()
         st.session_state.state = 'finished'
         st.rerun()
     
-    remaining_time = st.session_state.end_time - current_time
-    minutes, seconds = divmod(int(remaining_time), 60)
-    progress = 1 - (remaining_time / (60 * 60))
-
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        st.markdown(f"### 남은 시간: {minutes:02d}분 {seconds:02d}초")
-    with col2:
-        st.progress(progress)
+    # Time and progress display
+    show_countdown(st.session_state.end_time - current_time)
+    watch_deadline()
 
     if st.session_state.question_number < len(questions):
         question = questions.iloc[st.session_state.question_number]
         current_question_number = st.session_state.question_number + 1
         st.write(f"문항 {current_question_number}/11")
         
-        # Use display_text_and_latex function for LaTeX support
-        display_text_and_latex(question['Problem'])
+        # LaTeX 수식이 섞인 문항 출력 (latex_text 공통 토크나이저)
+        render_text(question['Problem'])
         
         # Record start time for the current question
         if f"start_time_q{current_question_number}" not in st.session_state.question_start_times:
@@ -516,26 +377,30 @@ elif st.session_state.state == 'test':
 # Streamlit의 결과 확인 및 전송 부분
 if st.session_state.state == 'finished':
     st.write("수고하셨습니다. 모든 문제를 완료하셨습니다.")
-    total_time = time.time() - st.session_state.start_time
+    # 버튼을 누를 때마다 다시 실행되므로 종료 시각과 제출 토큰은 처음 한 번만 정함
+    if 'total_time' not in st.session_state:
+        # 제한 시간이 지난 뒤에 종료된 경우에도 소요 시간은 제한 시간까지만 기록
+        st.session_state.total_time = min(time.time(), st.session_state.end_time) - st.session_state.start_time
+        st.session_state.submission_token = uuid.uuid4().hex
+    total_time = st.session_state.total_time
     st.write(f"총 소요 시간: {int(total_time // 60)}분 {int(total_time % 60)}초")
     
-    # Prepare data for database
-    data = {
-        'name': st.session_state.name,
-        'email': st.session_state.email,
-        'date': datetime.now(),
-        'total_time': round(total_time, 2)
-    }
-    
-    for i in range(1, 12):
-        data[f'q{i}'] = st.session_state.answers.get(f'q{i}', '')
-        
-    for i in range(1, 12):
-        data[f't{i}'] = round(st.session_state.times.get(f't{i}', 0), 2)
+    # 아직 저장하지 않은 경우에만 저장하고, 이후에는 저장된 id를 사용
+    if not st.session_state.get('student_id'):
+        # Prepare data for database
+        data = {
+            'name': st.session_state.name,
+            'email': st.session_state.email,
+            'date': datetime.now(),
+            'total_time': round(total_time, 2),
+            'submission_token': st.session_state.submission_token
+        }
+        answers = [st.session_state.answers.get(f'q{i}', '') for i in range(1, 12)]
+        times = [round(st.session_state.times.get(f't{i}', 0), 2) for i in range(1, 12)]
+        st.session_state.student_id = save_to_database(data, answers, times)
     
-    student_id = save_to_database(data)
+    student_id = st.session_state.student_id
     if student_id:
-        st.session_state.student_id = student_id
         st.success(f"결과가 성공적으로 저장되었습니다!")
         
         if 'results_checked' not in st.session_state:
@@ -545,7 +410,7 @@ if st.session_state.state == 'finished':
             student_data = fetch_student_data_by_id(student_id)
             
             if student_data:
-                total_score, total_feedback, correct, feed = evaluate_student_data(student_data)
+                total_score, total_feedback, correct, feed = evaluate_student_data(student_data, questions)
                 update_student_results_by_id(student_id, total_score, total_feedback, correct, feed)
                 
                 # Markdown 형식의 결과를 생성하고 저장
@@ -588,9 +453,3 @@ if st.session_state.state == 'finished':
                     st.info("이미 이메일이 전송되었습니다.")
             
             #st.write(f"최종 이메일 전송 상태: {st.session_state.email_sent}")  # 디버깅용 출력
-
-
-# Rerun the app every second to update the timer
-if st.session_state.state == 'test':
-    time.sleep(1)
-    st.rerun()
\ No newline at end of file
@@ -1,85 +1,98 @@
 import streamlit as st
 import pandas as pd
-import mysql.connector
 from dotenv import load_dotenv
-import os
 from datetime import datetime
 import time
 from dotenv import load_dotenv
-from openai import OpenAI
+from llm_client import create_chat_completion
+from db_pool import db_cursor
+from message_store import new_session_id, append_messages, format_transcript, load_transcript
+from write_behind import queued_cursor, flush_writes
+from chat_render import render_history, latex_segments
+from context_window import build_context, new_context_state
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
-import re
 
 # .env 파일 불러오기
 load_dotenv()
 
-# MySQL 환경 변수 불러오기
-DB_HOST = os.getenv('DB_HOST')
-DB_USER = os.getenv('DB_USER')
-DB_PASSWORD = os.getenv('DB_PASSWORD')
-DB_NAME = os.getenv('DB_DATABASE')
-
-# MySQL 연결 설정
-db_connection = mysql.connector.connect(
-    host=DB_HOST,
-    user=DB_USER,
-    password=DB_PASSWORD,
-    database=DB_NAME
-)
-cursor = db_connection.cursor()
-
 # 문제 풀이 단계
 def load_information(i):
     """엑셀 파일에서 특정 도메인의 문제 로드"""
     return df.loc[i, 'domain'], df.loc[i, 'content'], df.loc[i, 'performance']
 
-# MySQL에 데이터 저장 예시
-def save_conversation_to_db(domain_idx, conversation, duration):
-    domain_content_column = f"domain_{domain_idx}_content"
+# MySQL에 데이터 저장
+# 매 턴마다 전체 대화를 다시 쓰지 않고 새 메시지만 conversation_messages에 추가
+def save_conversation_to_db(domain_idx, messages, duration):
+    if 'message_session' not in st.session_state:
+        st.session_state.message_session = new_session_id()
+
+    key = f"saved_messages {domain_idx}"
+    try:
+        with queued_cursor() as cursor:
+            saved = append_messages(
+                st.session_state.message_session, "mid_term", st.session_state.user_id,
+                domain_idx, messages, st.session_state.get(key, 0), cursor=cursor
+            )
+        st.session_state[key] = saved
+    except Exception as err:
+        # 저장하지 못한 메시지는 다음 턴에 함께 저장
+        st.error(f"대화 저장 중 오류가 발생했습니다: {err}")
+
     domain_time_column = f"domain_{domain_idx}_time"
     domain_done_column = f"domain_{domain_idx}_done"
     
-    # 대화 내용 및 시간을 저장하는 쿼리 (id 기준으로 업데이트)
+    # 시간과 진행 여부만 업데이트 (id 기준)
     update_query = f"""
     UPDATE mid_term 
-    SET {domain_content_column}=%s, {domain_time_column}=%s, {domain_done_column}=1 
+    SET {domain_time_column}=%s, {domain_done_column}=1 
     WHERE id=%s
     """
     print(f"Saved ID: {st.session_state.user_id}")
     
-    save_to_db(update_query, (conversation, duration, st.session_state.user_id))
-
+    save_to_db(update_query, (duration, st.session_state.user_id))
+
+# 도메인을 마칠 때 기존 domain_N_content 열에 전체 대화를 한 번만 저장
+def save_transcript_to_db(domain_idx, messages):
+    update_query = f"UPDATE mid_term SET domain_{domain_idx}_content=%s WHERE id=%s"
+    save_to_db(update_query, (format_transcript(messages), st.session_state.user_id))
+
+# '다음'을 누르지 않고 중단한 도메인은 domain_N_content가 비어 있으므로 이어서 학습할 때 메시지 테이블에서 다시 만들어 저장
+def restore_transcripts(user_id, done_flags):
+    for domain_idx, done in enumerate(done_flags, start=1):
+        if not done:
+            continue
+        transcript = load_transcript("mid_term", user_id, domain_idx)
+        if transcript:
+            update_query = f"UPDATE mid_term SET domain_{domain_idx}_content=%s WHERE id=%s AND domain_{domain_idx}_content IS NULL"
+            save_to_db(update_query, (transcript, user_id))
+
+# 쓰기는 쓰기 큐(write_behind)에 넣고 바로 반환, 커밋은 작업 스레드에서 순서대로 진행
 def save_to_db(query, values):
+    """쿼리를 쓰기 큐에 넣음 (outbox에 기록하지 못하면 False 반환)"""
     try:
+        with queued_cursor() as cursor:
+            cursor.execute(query, values)
+        return True
+    except Exception as err:
+        st.error(f"저장 중 오류가 발생했습니다: {err}")
+        return False
+
+def insert_row(query, values):
+    """INSERT 후 생성된 id 반환"""
+    with db_cursor() as cursor:
         cursor.execute(query, values)
-        db_connection.commit()
-    except mysql.connector.Error as err:
-        st.error(f"MySQL 오류가 발생했습니다: {err}")
-        db_connection.rollback()
-
-# LaTeX 수식과 일반 텍스트를 구분하여 처리하는 함수
-def process_text(text):
-    # 여러 종류의 LaTeX 수식 패턴을 감지하는 정규 표현식
-    pattern = r'(\$\$.*?\$\$|\$.*?\$|\\\[.*?\\\]|\\\(.*?\\\))'
-    
-    # 입력된 텍스트에서 LaTeX 부분과 일반 텍스트를 분리
-    parts = re.split(pattern, text)
-
-    # 분리된 각 부분을 순서대로 처리
-    for part in parts:
-        part = part.strip()  # 앞뒤 공백 제거
-        if re.match(r'^\$\$.*\$\$$', part):  # $$ ... $$ 형식 감지
-            st.latex(part.strip('$$'))
-        elif re.match(r'^\$.*\$$', part):  # $ ... $ 형식 감지
-            st.latex(part.strip('$'))
-        elif re.match(r'^\\\[.*\\\]$', part):  # \[ ... \] 형식 감지
-            st.latex(part.strip('\\[').strip('\\]'))
-        elif re.match(r'^\\\(.*\\\)$', part):  # \( ... \) 형식 감지
-            st.latex(part.strip('\\(').strip('\\)'))
-        else:
-            st.markdown(part)  # 나머지는 일반 텍스트로 출력
+        return cursor.lastrowid
+
+def fetch_one(query, values):
+    # 이 세션이 큐에 넣은 쓰기를 먼저 반영해서 방금 저장한 내용을 읽을 수 있도록 함 (넣은 쓰기가 없으면 기다리지 않음)
+    flushed, _ = flush_writes()
+    if not flushed:
+        print("Write queue not flushed yet; reading before pending writes are committed")
+    with db_cursor() as cursor:
+        cursor.execute(query, values)
+        return cursor.fetchone()
 
 initial_prompt = (
     "이것은 일반물리학 열역학 분야 학습용 챗봇이야."
@@ -103,10 +116,15 @@ def get_chatgpt_response(i, prompt):
     else:
         st.session_state[f"messages {i}"].append({"role": "user", "content": prompt, "timestamp": timestamp})
     
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    response = client.chat.completions.create(
+    # 토큰 예산을 넘으면 오래된 대화는 요약해서 전송 (전체 대화는 그대로 DB에 저장)
+    if f"context {i}" not in st.session_state:
+        st.session_state[f"context {i}"] = new_context_state()
+    context = build_context(st.session_state[f"messages {i}"], st.session_state[f"context {i}"])
+
+    response = create_chat_completion(
+        app="thermo_up",
         model="gpt-4o",
-        messages=st.session_state[f"messages {i}"],
+        messages=context,
     )
     
     answer = response.choices[0].message.content
@@ -177,12 +195,12 @@ elif st.session_state.state == "disclaimer":
         ORDER BY date DESC
         LIMIT 1
         """
-        cursor.execute(select_query, (st.session_state.email,))
-        result = cursor.fetchone()
+        result = fetch_one(select_query, (st.session_state.email,))
 
         if result:
             print("Found record")
             st.session_state.user_id = result[0]
+            restore_transcripts(result[0], result[1:])
             st.session_state.completed_domains = sum(result[1:])  # 완료된 도메인 수 계산
             st.session_state.domain = result[1:].index(0) if 0 in result[1:] else total_domains
             
@@ -206,9 +224,7 @@ elif st.session_state.state == "disclaimer":
                     insert_query = """
                     INSERT INTO mid_term (name, email, date) VALUES (%s, %s, NOW())
                     """
-                    cursor.execute(insert_query, (st.session_state.name, st.session_state.email))
-                    db_connection.commit()
-                    st.session_state.user_id = cursor.lastrowid
+                    st.session_state.user_id = insert_row(insert_query, (st.session_state.name, st.session_state.email))
 
                     st.session_state.state = "quiz"
                     st.session_state.progress = st.progress(0)
@@ -219,9 +235,7 @@ elif st.session_state.state == "disclaimer":
             insert_query = """
             INSERT INTO mid_term (name, email, date) VALUES (%s, %s, NOW())
             """
-            cursor.execute(insert_query, (st.session_state.name, st.session_state.email))
-            db_connection.commit()
-            st.session_state.user_id = cursor.lastrowid
+            st.session_state.user_id = insert_row(insert_query, (st.session_state.name, st.session_state.email))
 
             st.session_state.state = "quiz"
             st.session_state.progress = st.progress(0)
@@ -246,24 +260,15 @@ elif st.session_state.state == "quiz":
 
     if not f"messages {index}" in st.session_state:
         domain_name, content, perform = load_information(index)
-        prompt = content + '\n' + perform + '\n' + initial_prompt
+        # 모든 영역에 공통인 지침을 앞에 두어 프롬프트 캐시가 적용되도록 함
+        prompt = initial_prompt + '\n' + content + '\n' + perform
         st.header(domain_name)
         st.session_state[f"messages {index}"] = [{"role": "system", "content": prompt}]
         answer = get_chatgpt_response(st.session_state.domain, "")
 
-    # 대화 기록 출력 (Markdown 적용 + LaTeX 처리)
+    # 대화 기록 출력 (Markdown 적용 + LaTeX 처리, 이전 메시지의 변환 결과는 캐시에서 재사용)
     if f"messages {index}" in st.session_state:
-        for message in st.session_state[f"messages {index}"]:
-            role = message["role"]
-            content = message["content"]
-            timestamp = message.get("timestamp", "")
-
-            if role == "user":
-                st.markdown(f"**You** ({timestamp}):")
-                process_text(content)  # LaTeX과 텍스트 처리
-            elif role == "assistant":
-                st.markdown(f"**AI** ({timestamp}):")
-                process_text(content)  # LaTeX과 텍스트 처리
+        render_history(st.session_state[f"messages {index}"], latex_segments)
 
     with st.form(key='quiz_form', clear_on_submit=True):
         user_input = st.text_area("You: ", key="user_input")
@@ -276,11 +281,8 @@ elif st.session_state.state == "quiz":
             end_time = datetime.now()
             duration = (end_time - st.session_state.start_time).total_seconds() / 60.0  # 분 단위로 변환
 
-            # 대화 내용 저장
-            conversation = "\n".join([f"{msg['role']} ({msg.get('timestamp', 'N/A')}): {msg['content']}" for msg in st.session_state[f"messages {index}"]])
-            
-            # MySQL에 대화 내용과 시간을 업데이트 (id 기준으로)
-            save_conversation_to_db(index + 1, conversation, duration)
+            # 새 메시지와 시간을 MySQL에 저장 (id 기준으로)
+            save_conversation_to_db(index + 1, st.session_state[f"messages {index}"], duration)
 
             # 리렌더링
             st.rerun()  # 상태 업데이트 후 즉시 리렌더링
@@ -294,6 +296,7 @@ elif st.session_state.state == "quiz":
         
         # '다음' 버튼을 렌더링하여 다음 도메인으로 진행
         if st.button(label='다음'):
+            save_transcript_to_db(index + 1, st.session_state[f"messages {index}"])
             st.session_state.completed_domains += 1  # 완료된 도메인 개수 업데이트
             print(f"Current: {st.session_state.completed_domains} out of {total_domains}")
             
@@ -328,9 +331,15 @@ elif st.session_state.state == "feedback":
                 feedback_6=%s, feedback_7=%s, feedback_8=%s, feedback_9=%s, feedback_10=%s, complete=1
             WHERE id=%s
             """
-            cursor.execute(insert_feedback_query, (feedback_q1, feedback_q2, feedback_q3, feedback_q4, feedback_q5,
-                                                   feedback_q6, feedback_q7, feedback_q8, feedback_q9, feedback_q10, user_id))
-            db_connection.commit()
-            st.success("피드백이 제출되었습니다. 감사합니다!")
+            if save_to_db(insert_feedback_query, (feedback_q1, feedback_q2, feedback_q3, feedback_q4, feedback_q5,
+                                                  feedback_q6, feedback_q7, feedback_q8, feedback_q9, feedback_q10, user_id)):
+                # 마지막 제출이므로 세션의 쓰기가 모두 반영될 때까지 기다림
+                flushed, failed = flush_writes()
+                if failed:
+                    st.error(f"MySQL 오류가 발생했습니다: {failed[-1][1]}")
+                else:
+                    if not flushed:
+                        print("Write queue not flushed yet; pending writes stay in the outbox")
+                    st.success("피드백이 제출되었습니다. 감사합니다!")
         else:
             st.error("유저 ID를 찾을 수 없습니다. 처음부터 다시 시도해 주세요.")
@@ -0,0 +1,28 @@
+import argparse
+import pandas as pd
+from llm_client import LLM_USAGE_LOG
+
+# LLM_USAGE_LOG에 기록된 요청별 사용량으로 앱별 프롬프트 캐시 적중률과 지연 시간 요약
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="앱별 프롬프트 캐시 적중률 보고서")
+    parser.add_argument("log", nargs="?", default=LLM_USAGE_LOG or "llm_usage.csv", help="사용량 CSV 파일 경로")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.log)
+    df["cached"] = df["cached_tokens"] > 0
+
+    summary = df.groupby("app").agg(
+        calls=("app", "size"),
+        prompt_tokens=("prompt_tokens", "sum"),
+        cached_tokens=("cached_tokens", "sum"),
+        cached_calls=("cached", "sum"),
+    )
+    summary["hit_rate"] = (summary["cached_tokens"] / summary["prompt_tokens"]).round(3)
+
+    # 캐시 적중 여부에 따른 평균 지연 시간 비교
+    latency = df.pivot_table(index="app", columns="cached", values="latency", aggfunc="mean")
+    summary["cached_latency"] = latency.get(True)
+    summary["uncached_latency"] = latency.get(False)
+    summary["latency_saving"] = summary["uncached_latency"] - summary["cached_latency"]
+
+    print(summary.to_string())
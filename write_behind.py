@@ -0,0 +1,320 @@
+import atexit
+import fcntl
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import mysql.connector
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from db_pool import db_cursor
+
+# 학생 화면의 DB 쓰기를 요청 경로에서 분리하는 write-behind 큐
+# 쓰기는 먼저 디스크의 outbox(SQLite 파일)에 기록하고 바로 반환하며, 작업 스레드가 순서대로 모아서 MySQL에 커밋
+# 프로세스가 중간에 종료되어도 outbox에 남은 쓰기는 다음에 시작한 프로세스가 이어서 반영
+load_dotenv()
+
+WRITE_OUTBOX_DIR = os.getenv("WRITE_OUTBOX_DIR", "outbox")
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "50"))  # 한 트랜잭션으로 커밋할 최대 작업 수
+WRITE_RETRY_BACKOFF = float(os.getenv("WRITE_RETRY_BACKOFF", "0.5"))  # 일시적 오류 재시도 대기(초), 실패할 때마다 두 배
+WRITE_RETRY_MAX_BACKOFF = float(os.getenv("WRITE_RETRY_MAX_BACKOFF", "30"))
+WRITE_FLUSH_TIMEOUT = float(os.getenv("WRITE_FLUSH_TIMEOUT", "10"))  # flush에서 기다리는 최대 시간(초)
+
+# 다시 시도하면 성공할 수 있는 오류 (연결 끊김, 풀 부족, 잠금 대기 시간 초과, 교착 상태)
+TRANSIENT_ERRORS = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError,
+                    mysql.connector.errors.PoolError)
+TRANSIENT_ERRNOS = {1205, 1213}
+
+def is_transient(error):
+    return isinstance(error, TRANSIENT_ERRORS) or getattr(error, "errno", None) in TRANSIENT_ERRNOS
+
+class QueuedCursor:
+    """execute/executemany 호출을 모아서 하나의 작업(같은 트랜잭션에서 실행할 쿼리 목록)으로 만드는 커서"""
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params, False))
+
+    def executemany(self, query, seq_params):
+        self.statements.append((query, list(seq_params), True))
+
+class WriteBehindQueue:
+    def __init__(self, name, directory=None, batch_size=None):
+        self.batch_size = batch_size or WRITE_BATCH_SIZE
+        self.path = self._claim_outbox(directory or WRITE_OUTBOX_DIR, name)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job BLOB NOT NULL,
+                failed INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                session TEXT
+            )
+        """)
+        # session 열이 없던 이전 outbox 파일
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(outbox)")]
+        if "session" not in columns:
+            self._db.execute("ALTER TABLE outbox ADD COLUMN session TEXT")
+        self._last_jobs = {}  # 세션별 마지막으로 넣은 작업 id (반영되면 지움)
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, name=f"write-behind-{name}", daemon=True)
+        self._worker.start()
+
+    def _claim_outbox(self, directory, name):
+        """
+        다른 프로세스가 사용 중이지 않은 outbox 파일을 잠그고 사용 (name.0.sqlite3, name.1.sqlite3 ...).
+        종료된 프로세스의 잠금은 풀리므로, 그 outbox에 남은 쓰기는 새 프로세스가 이어받음.
+        """
+        os.makedirs(directory, exist_ok=True)
+        index = 0
+        while True:
+            path = os.path.join(directory, f"{name}.{index}.sqlite3")
+            lock = open(path + ".lock", "w")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                index += 1
+                continue
+            self._lock_file = lock  # 프로세스가 끝날 때까지 열어 둠
+            return path
+
+    def enqueue(self, statements, session=None):
+        """작업을 outbox에 기록하고 id를 반환 (MySQL 커밋을 기다리지 않음). session: 작업을 넣은 세션 id"""
+        if not statements:
+            return None
+        with self._cond:
+            cursor = self._db.execute("INSERT INTO outbox (job, session) VALUES (?, ?)",
+                                      (pickle.dumps(statements), session))
+            if session is not None:
+                self._last_jobs[session] = cursor.lastrowid
+            self._cond.notify_all()
+            return cursor.lastrowid
+
+    def pending(self, up_to=None):
+        """아직 반영되지 않은 작업 수 (실패로 분류된 작업은 제외)"""
+        with self._cond:
+            query = "SELECT COUNT(*) FROM outbox WHERE failed = 0"
+            if up_to is not None:
+                return self._db.execute(query + " AND id <= ?", (up_to,)).fetchone()[0]
+            return self._db.execute(query).fetchone()[0]
+
+    def flush(self, timeout=None, up_to=None):
+        """
+        up_to 이하의 작업이 모두 처리될 때까지 기다림 (None이면 지금까지 넣은 모든 작업).
+        작업은 넣은 순서대로 처리되므로 한 세션의 마지막 작업 id까지만 기다리면 그 세션의 쓰기는 모두 처리됨.
+        시간 안에 끝나면 True
+        """
+        timeout = WRITE_FLUSH_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if up_to is None:
+                up_to = self._db.execute("SELECT MAX(id) FROM outbox").fetchone()[0]
+                if up_to is None:
+                    return True
+            while self.pending(up_to):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def flush_session(self, session, timeout=None):
+        """
+        세션이 넣은 작업만 기다림. 반환값: (시간 안에 끝났는지, 세션의 실패한 작업 [(id, 오류), ...])
+        이 세션이 넣은 작업이 모두 처리되었으면 기다리지 않음
+        """
+        with self._cond:
+            last_id = self._last_jobs.get(session)
+        if last_id is None:
+            return True, self.failed(session)
+        flushed = self.flush(timeout, up_to=last_id)
+        failed = self.failed(session)
+        if flushed:
+            with self._cond:
+                # 그 사이에 새 작업을 넣지 않았으면 다음 flush는 기다리지 않음
+                if self._last_jobs.get(session) == last_id:
+                    del self._last_jobs[session]
+        return flushed, failed
+
+    def failed(self, session=None):
+        """실패로 분류된 작업 [(id, 오류), ...] (session을 주면 그 세션의 작업만)"""
+        with self._cond:
+            query = "SELECT id, error FROM outbox WHERE failed = 1"
+            if session is not None:
+                return self._db.execute(query + " AND session = ? ORDER BY id", (session,)).fetchall()
+            return self._db.execute(query + " ORDER BY id").fetchall()
+
+    def retry_failed(self, job_ids=None):
+        """실패로 분류된 작업을 다시 처리 대상으로 돌림 (job_ids가 없으면 모두). 돌린 작업 수 반환"""
+        with self._cond:
+            if job_ids is None:
+                cursor = self._db.execute("UPDATE outbox SET failed = 0, error = NULL WHERE failed = 1")
+            else:
+                cursor = self._db.executemany("UPDATE outbox SET failed = 0, error = NULL WHERE id = ? AND failed = 1",
+                                              [(job_id,) for job_id in job_ids])
+            self._cond.notify_all()
+            return cursor.rowcount
+
+    def close(self, timeout=None):
+        self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._worker.join(timeout=1)
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._stopped:
+                rows = self._db.execute(
+                    "SELECT id, job FROM outbox WHERE failed = 0 ORDER BY id LIMIT ?", (self.batch_size,)
+                ).fetchall()
+                if rows:
+                    return [(job_id, pickle.loads(job)) for job_id, job in rows]
+                self._cond.wait()
+            return None
+
+    def _done(self, job_ids):
+        with self._cond:
+            self._db.executemany("DELETE FROM outbox WHERE id = ?", [(job_id,) for job_id in job_ids])
+            # 세션의 마지막 작업까지 반영되면 더 기다릴 작업이 없으므로 지움 (flush하지 않고 끝난 세션이 남지 않도록)
+            done = set(job_ids)
+            for session in [session for session, job_id in self._last_jobs.items() if job_id in done]:
+                del self._last_jobs[session]
+            self._cond.notify_all()
+
+    def _fail(self, job_id, error):
+        # 다시 시도해도 성공할 수 없는 작업은 지우지 않고 표시만 해 두고 다음 작업을 진행
+        print(f"Write-behind job {job_id} failed permanently: {error!r}")
+        with self._cond:
+            self._db.execute("UPDATE outbox SET failed = 1, error = ? WHERE id = ?", (repr(error), job_id))
+            self._cond.notify_all()
+
+    @staticmethod
+    def _apply(jobs):
+        """여러 작업을 한 트랜잭션으로 실행하고 커밋"""
+        with db_cursor() as cursor:
+            for _, statements in jobs:
+                for query, params, many in statements:
+                    if many:
+                        cursor.executemany(query, params)
+                    else:
+                        cursor.execute(query, params)
+
+    def _run(self):
+        backoff = WRITE_RETRY_BACKOFF
+        while True:
+            jobs = self._next_batch()
+            if jobs is None:
+                return
+            try:
+                self._apply(jobs)
+                self._done([job_id for job_id, _ in jobs])
+                backoff = WRITE_RETRY_BACKOFF
+            except Exception as e:
+                if is_transient(e):
+                    # outbox에 그대로 남아 있으므로 잠시 기다렸다가 같은 배치를 다시 시도
+                    print(f"Write-behind batch failed, retrying in {backoff:.1f}s: {e!r}")
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, WRITE_RETRY_MAX_BACKOFF)
+                elif len(jobs) > 1:
+                    # 어느 작업이 문제인지 찾기 위해 하나씩 실행
+                    self._apply_one_by_one(jobs)
+                else:
+                    self._fail(jobs[0][0], e)
+
+    def _apply_one_by_one(self, jobs):
+        for job in jobs:
+            try:
+                self._apply([job])
+                self._done([job[0]])
+            except Exception as e:
+                if is_transient(e):
+                    return  # 남은 작업은 다음 배치에서 다시 시도
+                self._fail(job[0], e)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_queue():
+    """프로세스에서 공유하는 큐 (outbox 파일 이름은 실행한 앱 스크립트 이름으로 정함)"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "app"
+                _queue = WriteBehindQueue(name)
+                atexit.register(_queue.close)
+    return _queue
+
+def start():
+    """
+    큐와 작업 스레드를 바로 시작. 이전 프로세스가 남긴 outbox의 작업을 이 프로세스의 첫 쓰기를 기다리지 않고 반영
+    (get_queue는 처음 호출될 때 만들어지므로, 앱이 시작될 때 불러서 재시작 직후부터 남은 쓰기를 처리)
+    """
+    return get_queue()
+
+def current_session():
+    """현재 실행 중인 Streamlit 세션 id (스크립트 실행 밖에서는 None)"""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+@contextmanager
+def queued_cursor(session=None):
+    """
+    with queued_cursor() as cursor: 블록에서 실행한 쓰기를 하나의 작업으로 큐에 넣음.
+    db_cursor처럼 한 트랜잭션으로 커밋되지만 호출한 쪽은 커밋을 기다리지 않음 (lastrowid, fetch는 사용할 수 없음).
+    작업에는 세션 id(없으면 현재 Streamlit 세션)를 함께 기록해서 flush_writes가 그 세션의 쓰기만 기다릴 수 있도록 함
+    """
+    cursor = QueuedCursor()
+    yield cursor
+    get_queue().enqueue(cursor.statements, session=session or current_session())
+
+def flush_writes(timeout=None, session=None):
+    """
+    세션이 끝나거나 방금 쓴 내용을 다시 읽기 전에 세션(없으면 현재 Streamlit 세션)이 큐에 넣은 쓰기를 반영.
+    반환값: (시간 안에 반영되었는지, 세션의 실패한 작업 [(id, 오류), ...])
+    세션이 넣은 작업이 없으면 바로 반환 (다른 세션의 쓰기는 기다리지 않음)
+    """
+    if _queue is None:
+        return True, []
+    session = session or current_session()
+    if session is None:
+        return _queue.flush(timeout), _queue.failed()
+    return _queue.flush_session(session, timeout)
+
+# Streamlit 앱에서 불러오면 바로 시작 (명령줄 도구나 스크립트에서 불러올 때는 필요할 때 시작)
+if current_session() is not None:
+    start()
+
+def open_outboxes(directory):
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".sqlite3"):
+            yield name, sqlite3.connect(os.path.join(directory, name), isolation_level=None)
+
+if __name__ == "__main__":
+    import argparse
+
+    # 실패로 분류된 outbox 작업 확인 및 재시도
+    # 재시도로 돌린 작업은 그 outbox를 사용하는 프로세스가 다음 작업을 처리할 때 (또는 다음에 시작한 프로세스가) 반영
+    parser = argparse.ArgumentParser(description="write-behind outbox의 실패한 작업 확인 및 재시도")
+    parser.add_argument("--dir", default=WRITE_OUTBOX_DIR)
+    parser.add_argument("--retry", action="store_true", help="실패한 작업을 다시 처리 대상으로 돌림")
+    args = parser.parse_args()
+
+    for name, db in open_outboxes(args.dir):
+        rows = db.execute("SELECT id, session, error FROM outbox WHERE failed = 1 ORDER BY id").fetchall()
+        for job_id, session, error in rows:
+            print(f"{name} #{job_id} session={session}: {error}")
+        if args.retry and rows:
+            db.execute("UPDATE outbox SET failed = 0, error = NULL WHERE failed = 1")
+            print(f"{name}: {len(rows)} job(s) queued for retry")
+        db.close()